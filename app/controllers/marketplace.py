@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from app.models.marketplace_product import MarketplaceProduct
 from app.models.marketplace_order import MarketplaceOrder
 from app.models.resident_model import Resident
+from app.models.verification_result import VerificationResult
 from datetime import datetime
 
 
@@ -163,3 +164,10 @@ class MarketplaceController:
         db.commit()
         db.refresh(order)
         return order
+
+    @staticmethod
+    def get_verification_by_key(db: Session, request_key: str):
+        """Get hasil verifikasi berdasarkan key dari /verify-vegetable"""
+        return db.query(VerificationResult).filter(
+            VerificationResult.request_key == request_key
+        ).first()
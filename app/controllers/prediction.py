@@ -1,58 +1,138 @@
 """
 Controller untuk klasifikasi prediksi sayur.
+
+Stack ML (numpy, cv2, TensorFlow) di-import secara lazy saat prediksi
+pertama, sehingga worker yang hanya melayani CRUD tidak ikut memuatnya.
 """
 
-import os
-import tempfile
-import shutil
+import asyncio
+import io
+import zipfile
+import zlib
+from collections.abc import AsyncIterator
+from pathlib import Path
 from typing import Any
-from fastapi import HTTPException
-from services.vegetable_classifier import get_classifier
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from config.inference import (
+    EXECUTOR_RETRY_AFTER,
+    INFERENCE_ENABLED,
+    MAX_BATCH_SIZE,
+    MAX_UPLOAD_BYTES,
+    MICRO_BATCH_ENABLED,
+    PREDICTION_CACHE_ENABLED,
+    VERIFY_BATCH_MAX_BYTES,
+    VERIFY_BATCH_MAX_FILES,
+)
+from services.inference_executor import ExecutorSaturated, get_executor
+from services.prediction_cache import get_prediction_cache
+from services.profiler import get_profiler
+from services.timing import stage
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+ZIP_MAGIC = b"PK\x03\x04"
+# Magic bytes format gambar yang didukung decoder
+IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": "image/jpeg",
+    b"\x89PNG\r\n\x1a\n": "image/png",
+    b"BM": "image/bmp",
+}
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class PredictionController:
     """Controller untuk handle business logic prediksi sayur."""
 
     @staticmethod
-    def validate_file(content_type: str) -> None:
+    def detect_image_type(header: bytes | bytearray | memoryview) -> str | None:
         """
-        Validasi tipe file yang diizinkan.
+        Tentukan tipe gambar dari magic bytes (bukan dari content_type).
 
-        Args:
-            content_type: MIME type dari file
-
-        Raises:
-            HTTPException: Jika tipe file tidak valid
+        Returns:
+            MIME type (image/jpeg, image/png, image/bmp) atau None
         """
-        allowed_types = {"image/jpeg", "image/png", "image/bmp"}
-        if content_type not in allowed_types:
-            raise HTTPException(
-                status_code=400,
-                detail="Tipe file tidak valid. Harap unggah .jpg, .png, atau .bmp"
-            )
+        header = bytes(header[:8])
+        for signature, mime_type in IMAGE_SIGNATURES.items():
+            if header.startswith(signature):
+                return mime_type
+        return None
 
     @staticmethod
-    def validate_file_size(file_size: int, max_size: int = 10 * 1024 * 1024) -> None:
+    async def read_upload(
+        file: UploadFile,
+        max_size: int = MAX_UPLOAD_BYTES,
+        validate_type: bool = True,
+    ) -> bytearray:
         """
-        Validasi ukuran file.
+        Baca file upload per chunk ke satu buffer bersambung.
+
+        Batas ukuran dicek sebelum membaca (dari ukuran yang diketahui
+        Starlette) dan setiap chunk tiba, sehingga upload raksasa tidak pernah
+        dibaca utuh ke memori. Magic bytes dicek pada chunk pertama.
 
         Args:
-            file_size: Ukuran file dalam bytes
-            max_size: Ukuran maksimal (default 10MB)
+            file: File upload
+            max_size: Ukuran maksimal dalam bytes
+            validate_type: Cek magic bytes gambar (False untuk verifikasi
+                batch: zip diterima dan gambar rusak dilaporkan per baris)
+
+        Returns:
+            Isi file (bytearray, langsung bisa di-decode tanpa disalin)
 
         Raises:
-            HTTPException: Jika ukuran file terlalu besar
+            HTTPException: 413 jika terlalu besar, 400 jika bukan gambar
         """
-        if file_size > max_size:
-            raise HTTPException(
+        def too_large() -> HTTPException:
+            return HTTPException(
                 status_code=413,
-                detail="Ukuran file terlalu besar. Maksimal 10MB."
+                detail=f"Ukuran file terlalu besar. Maksimal {max_size // (1024 * 1024)}MB.",
             )
 
+        # termasuk menunggu chunk dari client yang lambat
+        with stage("upload_read"):
+            if file.size is not None and file.size > max_size:
+                raise too_large()
+
+            # chunk pertama dicek dulu sebelum buffer penuh dialokasikan
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                raise HTTPException(status_code=400, detail="File kosong")
+            if validate_type and PredictionController.detect_image_type(chunk) is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Tipe file tidak valid. Harap unggah .jpg, .png, atau .bmp",
+                )
+
+            # ukuran diketahui: alokasi sekali; jika tidak, buffer tumbuh per chunk
+            buffer = bytearray(max(file.size or 0, len(chunk)))
+            view = memoryview(buffer)
+            length = 0
+            while chunk:
+                end = length + len(chunk)
+                if end > max_size:
+                    view.release()
+                    raise too_large()
+                if end <= len(buffer):
+                    view[length:end] = chunk
+                else:
+                    view.release()
+                    buffer[length:] = chunk
+                    view = memoryview(buffer)
+                length = end
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+
+            view.release()
+            del buffer[length:]
+            return buffer
+
     @staticmethod
     def predict(file_contents: bytes, filename: str) -> dict[str, Any]:
         """
         Jalankan prediksi pada file gambar.
 
+        Gambar di-decode langsung dari memori, tanpa ditulis ke file sementara.
+        Gambar yang isinya sama persis dilayani dari cache prediksi.
+
         Args:
             file_contents: Binary contents dari file gambar
             filename: Nama file asli
@@ -63,29 +143,245 @@ class PredictionController:
         Raises:
             HTTPException: Jika terjadi error saat prediksi
         """
-        # Simpan file sementara
-        temp_dir = tempfile.mkdtemp()
-        temp_file_path = os.path.join(temp_dir, filename)
+        from services.batching import get_batcher
+        from services.vegetable_classifier import get_classifier
+
+        # sebagian kecil request di-profile (lihat services/profiler.py)
+        with get_profiler().maybe_profile():
+            try:
+                classifier = get_classifier()
+                cache = get_prediction_cache() if PREDICTION_CACHE_ENABLED else None
+                cache_key = None
+                result = None
+
+                if cache is not None:
+                    with stage("cache_lookup"):
+                        cache_key = cache.make_key(file_contents, classifier.model_version)
+                        result = cache.get(cache_key)
+
+                if result is None:
+                    # Jalankan prediksi (lewat micro-batcher jika diaktifkan)
+                    predictor = get_batcher(classifier) if MICRO_BATCH_ENABLED else classifier
+                    result = predictor.predict_bytes(file_contents)
+                    if cache is not None:
+                        cache.set(cache_key, result)
+
+                return {
+                    "message": "Analisis gambar berhasil",
+                    "data": result
+                }
+
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+    @staticmethod
+    async def predict_async(file_contents: bytes, filename: str) -> dict[str, Any]:
+        """
+        Jalankan prediksi di executor inferensi agar event loop tidak terblokir.
+
+        Args:
+            file_contents: Binary contents dari file gambar
+            filename: Nama file asli
+
+        Returns:
+            Dictionary berisi hasil prediksi
+
+        Raises:
+            HTTPException: 503 dengan header Retry-After jika antrean penuh
+                atau jika inferensi dinonaktifkan di worker ini
+        """
+        PredictionController.ensure_inference_enabled()
 
         try:
-            # Tulis file ke temp directory
-            with open(temp_file_path, "wb") as f:
-                f.write(file_contents)
+            return await get_executor().run(
+                PredictionController.predict, file_contents, filename
+            )
+        except ExecutorSaturated:
+            raise HTTPException(
+                status_code=503,
+                detail="Server sedang sibuk memproses gambar lain. Coba lagi nanti.",
+                headers={"Retry-After": str(EXECUTOR_RETRY_AFTER)},
+            )
 
-            # Jalankan prediksi
-            classifier = get_classifier()
-            result = classifier.predict(temp_file_path)
+    @staticmethod
+    def ensure_inference_enabled() -> None:
+        """
+        Raises:
+            HTTPException: 503 jika inferensi dinonaktifkan di worker ini
+        """
+        if not INFERENCE_ENABLED:
+            raise HTTPException(
+                status_code=503,
+                detail="Layanan analisis gambar tidak aktif di server ini.",
+            )
 
-            return {
-                "message": "Analisis gambar berhasil",
-                "data": result
-            }
+    @staticmethod
+    async def ensure_classifier_loaded() -> None:
+        """
+        Muat model (di thread) sebelum response streaming dimulai, agar
+        kegagalan memuat model menjadi 503, bukan body yang terpotong.
 
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+        Raises:
+            HTTPException: 503 jika model tidak bisa dimuat
+        """
+        from services.vegetable_classifier import get_classifier
+
+        try:
+            await run_in_threadpool(get_classifier)
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
-        finally:
-            # Cleanup temp directory
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+            raise HTTPException(status_code=503, detail=f"Model tidak bisa dimuat: {e}")
+
+    @staticmethod
+    def expand_uploads(
+        uploads: list[tuple[str, bytes]],
+        max_files: int = VERIFY_BATCH_MAX_FILES,
+        max_bytes: int = VERIFY_BATCH_MAX_BYTES,
+    ) -> list[tuple[str, bytes | str]]:
+        """
+        Ubah daftar upload (gambar dan/atau zip berisi gambar) menjadi daftar
+        gambar. Batas jumlah file dan total bytes juga berlaku untuk isi zip
+        (setelah di-extract), dicek sebelum member zip dibaca.
+
+        Member zip yang tidak bisa dibaca (CRC salah, terenkripsi, metode
+        kompresi tidak didukung, data deflate rusak) tidak menggagalkan
+        seluruh batch: isinya diganti pesan error dan dilaporkan per gambar
+        oleh predict_batch, sama seperti gambar yang gagal di-decode.
+
+        Args:
+            uploads: List (nama file, isi file)
+            max_files: Jumlah gambar maksimal
+            max_bytes: Total ukuran gambar maksimal
+
+        Returns:
+            List (nama file, isi file atau pesan error) untuk setiap gambar
+
+        Raises:
+            HTTPException: 413 jika batas terlampaui, 400 jika zip rusak atau
+                tidak ada gambar sama sekali
+        """
+        images: list[tuple[str, bytes | str]] = []
+        total_bytes = 0
+
+        def check_limits(size: int) -> None:
+            if len(images) >= max_files:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Terlalu banyak gambar. Maksimal {max_files} gambar per request.",
+                )
+            if total_bytes + size > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Total ukuran gambar terlalu besar. Maksimal {max_bytes // (1024 * 1024)}MB.",
+                )
+
+        for filename, contents in uploads:
+            if not contents.startswith(ZIP_MAGIC):
+                check_limits(len(contents))
+                images.append((filename, contents))
+                total_bytes += len(contents)
+                continue
+
+            try:
+                archive = zipfile.ZipFile(io.BytesIO(contents))
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"File zip tidak valid: {filename}")
+
+            with archive:
+                for info in archive.infolist():
+                    name = info.filename
+                    if (
+                        info.is_dir()
+                        or name.startswith("__MACOSX/")
+                        or Path(name).suffix.lower() not in IMAGE_EXTENSIONS
+                    ):
+                        continue
+                    # file_size dari header zip; dicek lagi setelah dibaca
+                    check_limits(info.file_size)
+                    try:
+                        data = archive.read(info)
+                    except (zipfile.BadZipFile, RuntimeError, NotImplementedError, zlib.error, EOFError) as e:
+                        images.append((name, f"File di dalam zip rusak atau tidak bisa dibaca: {e}"))
+                        continue
+                    check_limits(len(data))
+                    images.append((name, data))
+                    total_bytes += len(data)
+
+        if not images:
+            raise HTTPException(status_code=400, detail="Tidak ada gambar yang bisa diverifikasi")
+        return images
+
+    @staticmethod
+    def predict_batch(images: list[tuple[str, bytes | str]]) -> list[dict[str, Any]]:
+        """
+        Prediksi beberapa gambar dengan satu forward pass (per chunk
+        INFERENCE_MAX_BATCH_SIZE). Gambar yang ada di cache tidak ikut
+        di-inferensi; gambar yang gagal di-decode tidak menggagalkan yang lain.
+
+        Args:
+            images: List (nama file, isi file); isi berupa str adalah pesan
+                error dari expand_uploads dan langsung dilaporkan
+
+        Returns:
+            List hasil per gambar (urutan sama), masing-masing dengan status
+            "success" atau "error"
+        """
+        from services.vegetable_classifier import get_classifier
+
+        classifier = get_classifier()
+        cache = get_prediction_cache() if PREDICTION_CACHE_ENABLED else None
+        results: list[dict[str, Any] | None] = [None] * len(images)
+        cache_keys: list[str | None] = [None] * len(images)
+        misses = []
+
+        with stage("cache_lookup"):
+            for index, (_, contents) in enumerate(images):
+                if isinstance(contents, str):
+                    results[index] = {"status": "error", "message": contents}
+                    continue
+                if cache is not None:
+                    cache_keys[index] = cache.make_key(contents, classifier.model_version)
+                    cached = cache.get(cache_keys[index])
+                    if cached is not None:
+                        results[index] = {"status": "success", **cached}
+                        continue
+                misses.append(index)
+
+        if misses:
+            with get_profiler().maybe_profile():
+                predictions = classifier.predict_batch_bytes([images[i][1] for i in misses])
+            for index, prediction in zip(misses, predictions, strict=True):
+                results[index] = prediction
+                if cache is not None and prediction["status"] == "success":
+                    cached = {k: v for k, v in prediction.items() if k != "status"}
+                    cache.set(cache_keys[index], cached)
+
+        return results
+
+    @staticmethod
+    async def predict_batch_stream(
+        images: list[tuple[str, bytes | str]], chunk_size: int = MAX_BATCH_SIZE
+    ) -> AsyncIterator[tuple[int, list[dict[str, Any]]]]:
+        """
+        Jalankan predict_batch per chunk di executor inferensi dan kirim hasil
+        setiap chunk begitu selesai.
+
+        Jika executor penuh, chunk menunggu lalu dicoba lagi: response batch
+        sudah mulai di-stream sehingga 503 tidak bisa dikirim lagi.
+
+        Yields:
+            (index gambar pertama di chunk, list hasil chunk)
+        """
+        chunk_size = max(1, chunk_size)
+        for start in range(0, len(images), chunk_size):
+            chunk = images[start : start + chunk_size]
+            delay = 0.05
+            while True:
+                try:
+                    results = await get_executor().run(PredictionController.predict_batch, chunk)
+                    break
+                except ExecutorSaturated:
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, EXECUTOR_RETRY_AFTER)
+            yield start, results
@@ -7,11 +7,15 @@ class VerificationResult(Base):
     __tablename__ = "verification_results"
     
     id = Column(Integer, primary_key=True, index=True)
+    # key yang dikembalikan /marketplace/verify-vegetable (write-behind)
+    request_key = Column(String(32), nullable=True, unique=True, index=True)
     resident_id = Column(Integer, ForeignKey("residents.id"), nullable=False)
     vegetable_name = Column(String(100), nullable=True)
     image = Column(String(100), nullable=True)
     result = Column(String(255), nullable=True)
     is_valid_for_marketplace = Column(Boolean, nullable=True, default=False)
+    # versi model yang menghasilkan result (A/B, hot swap)
+    model_version = Column(String(64), nullable=True)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     
     # Relationships
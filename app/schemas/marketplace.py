@@ -15,6 +15,7 @@ class MarketplaceProductCreate(MarketplaceProductBase):
     stock: Optional[int] = None  # Flutter sends 'stock', not 'quantity'
     image: Optional[str] = None  # Flutter sends 'image', not 'image_path'
     verification_id: Optional[int] = None
+    verification_key: Optional[str] = None  # dari /marketplace/verify-vegetable
 
 
 class MarketplaceProductUpdate(BaseModel):
@@ -67,4 +68,5 @@ class VerificationResponse(BaseModel):
     is_valid: bool
     confidence: float
     vegetable_type: str
-    model_version: str = "mobilenetv2"
+    model_version: Optional[str] = None
+    verification_key: Optional[str] = None
@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+from typing import Literal
+
+
+class ModelLoadRequest(BaseModel):
+    model_path: str
+    role: Literal["primary", "candidate"] = "primary"
+    backend: str | None = None  # default INFERENCE_BACKEND
+    model_version: str | None = None  # default <nama file>-<backend>-<hash>
+    weight: float = Field(0.1, ge=0.0, le=1.0)  # fraksi traffic untuk candidate
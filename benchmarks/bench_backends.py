@@ -0,0 +1,86 @@
+"""
+Laporan paritas akurasi dan latency antar backend inferensi.
+
+Semua backend dijalankan pada gambar contoh di uploads/ dan dibandingkan
+terhadap backend pertama (acuan, default keras): kesesuaian label dan
+selisih probabilitas maksimum. Setelah itu latency p50/p99 per forward pass
+diukur untuk setiap ukuran batch.
+
+Usage:
+    python -m scripts.export_tflite
+    python -m scripts.export_onnx
+    python -m benchmarks.bench_backends --backends keras,tflite-fp16,tflite-int8,onnx --batch-sizes 1,8,32
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.common import ensure_model, sample_images, summarize_ms
+from config.inference import MODEL_PATH
+from services.inference_backends import create_backend
+from services.preprocessing import preprocess_image
+
+
+def load_inputs() -> np.ndarray:
+    return np.stack([preprocess_image(cv2.imread(p)) for p in sample_images()])
+
+
+def make_batch(inputs: np.ndarray, batch_size: int) -> np.ndarray:
+    """Ulangi gambar contoh sampai mencapai ukuran batch."""
+    indices = np.arange(batch_size) % len(inputs)
+    return np.ascontiguousarray(inputs[indices])
+
+
+def measure_latency(backend, batch: np.ndarray, repeat: int) -> list[float]:
+    backend.predict(batch)  # warm-up (resize tensor / tracing)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        backend.predict(batch)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--backends", default="keras,tflite-fp16,tflite-int8,onnx")
+    parser.add_argument("--batch-sizes", default="1,8,32")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    model_path = ensure_model(args.model)
+    inputs = load_inputs()
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",")]
+
+    backends = {}
+    for name in args.backends.split(","):
+        try:
+            backends[name] = create_backend(name, model_path)
+        except (FileNotFoundError, ImportError) as e:
+            print(f"{name:<12} dilewati: {e}")
+
+    print(f"\nParitas (n={len(inputs)} gambar, acuan: backend pertama)")
+    print(f"{'backend':<12} {'agree':>7} {'max|Δp|':>8}")
+    reference = None
+    for name, backend in backends.items():
+        outputs = np.concatenate([backend.predict(inputs[i : i + 1]) for i in range(len(inputs))])
+        if reference is None:
+            reference = outputs
+        agree = np.mean(outputs.argmax(axis=1) == reference.argmax(axis=1))
+        max_diff = np.abs(outputs - reference).max()
+        print(f"{name:<12} {agree:>6.1%} {max_diff:>8.4f}")
+
+    print("\nLatency per forward pass")
+    print(f"{'backend':<12} {'batch':>5}  latency{'':>40} {'img/s':>8}")
+    for name, backend in backends.items():
+        for batch_size in batch_sizes:
+            samples = measure_latency(backend, make_batch(inputs, batch_size), args.repeat)
+            throughput = batch_size * len(samples) / sum(samples)
+            print(f"{name:<12} {batch_size:>5}  {summarize_ms(samples)} {throughput:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
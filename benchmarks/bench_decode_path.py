@@ -0,0 +1,74 @@
+"""
+Benchmark latency per request: decode via file sementara vs langsung di memori.
+
+Usage:
+    python -m benchmarks.bench_decode_path --iterations 200
+    python -m benchmarks.bench_decode_path --with-model
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from benchmarks.common import ensure_model, sample_images, summarize_ms
+from config.inference import MODEL_PATH
+from services.preprocessing import preprocess_image
+
+
+def via_temp_file(contents: bytes, filename: str) -> np.ndarray:
+    """Jalur lama: mkdtemp → write → cv2.imread → rmtree."""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        temp_file_path = os.path.join(temp_dir, filename)
+        with open(temp_file_path, "wb") as f:
+            f.write(contents)
+        return cv2.imread(temp_file_path)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def via_memory(contents: bytes, filename: str) -> np.ndarray:
+    """Jalur baru: cv2.imdecode atas np.frombuffer (tanpa salinan)."""
+    return cv2.imdecode(np.frombuffer(contents, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def measure(fn, payloads: list[tuple[bytes, str]], iterations: int, infer) -> list[float]:
+    samples = []
+    for i in range(iterations):
+        contents, filename = payloads[i % len(payloads)]
+        start = time.perf_counter()
+        infer(fn(contents, filename))
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--with-model", action="store_true", help="Sertakan preprocess + model")
+    parser.add_argument("--model", default=MODEL_PATH)
+    args = parser.parse_args()
+
+    payloads = [(Path(p).read_bytes(), Path(p).name) for p in sample_images()]
+
+    if args.with_model:
+        from services.vegetable_classifier import VegetableClassifier
+
+        classifier = VegetableClassifier(model_path=ensure_model(args.model))
+        infer = classifier.predict_image
+        infer(via_memory(*payloads[0]))  # warm-up
+    else:
+        infer = preprocess_image
+
+    for name, fn in (("temp-file", via_temp_file), ("in-memory", via_memory)):
+        samples = measure(fn, payloads, args.iterations, infer)
+        print(f"{name:<10} {summarize_ms(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark waktu startup (python -X importtime) untuk `import main`.
+
+Membandingkan worker biasa, worker CRUD-only (INFERENCE_ENABLED=false), dan
+worker yang memuat stack ML secara eager (classifier + TensorFlow), lalu
+menampilkan modul top-level termahal.
+
+Usage:
+    python -m benchmarks.bench_importtime
+    python -m benchmarks.bench_importtime --top 15 --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.common import ROOT_DIRECTORY
+
+HEAVY_MODULES = ("tensorflow", "keras", "cv2", "numpy", "skimage", "onnxruntime")
+
+SCENARIOS = {
+    "default": ({}, "import main"),
+    "crud-only": ({"INFERENCE_ENABLED": "false"}, "import main"),
+    "eager-ml": (
+        {},
+        "import main; import services.vegetable_classifier; import tensorflow",
+    ),
+}
+
+
+def run_importtime(env_overrides: dict, code: str) -> tuple[dict[str, int], list[str], int]:
+    """
+    Jalankan interpreter baru dengan -X importtime.
+
+    Returns:
+        (waktu kumulatif per modul level 0-1 dalam mikrodetik, modul berat yang
+        termuat, total waktu import dalam mikrodetik)
+    """
+    env = dict(os.environ, CI="true", **env_overrides)
+    probe = (
+        f"{code}; import sys; "
+        f"print('HEAVY:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT_DIRECTORY,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative: dict[str, int] = {}
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue  # baris header
+        name = parts[2]
+        # kedalaman import: 1 spasi = top-level, tiap level tambah 2 spasi
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            total_us += cumulative_us
+        if depth <= 1:
+            cumulative[name.strip()] = cumulative_us
+
+    marker = next(
+        line for line in completed.stdout.splitlines() if line.startswith("HEAVY:")
+    )
+    heavy = [m for m in marker[len("HEAVY:"):].split(",") if m]
+    return cumulative, heavy, total_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for name, (env_overrides, code) in SCENARIOS.items():
+        totals = []
+        cumulative: dict[str, int] = {}
+        heavy: list[str] = []
+        for _ in range(args.runs):
+            cumulative, heavy, total_us = run_importtime(env_overrides, code)
+            totals.append(total_us / 1e6)
+
+        print(f"\n== {name}: {statistics.median(totals):.3f}s (median {args.runs} run)")
+        print(f"   modul berat termuat: {', '.join(heavy) or '-'}")
+        for module, micros in sorted(cumulative.items(), key=lambda kv: -kv[1])[: args.top]:
+            print(f"   {micros / 1000:9.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
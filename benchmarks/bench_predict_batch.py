@@ -0,0 +1,47 @@
+"""
+Benchmark throughput VegetableClassifier.predict_batch terhadap ukuran batch.
+
+Usage:
+    python -m benchmarks.bench_predict_batch --batch-sizes 1,4,8,16,32
+"""
+import argparse
+import itertools
+import time
+
+from config.inference import MODEL_PATH
+from benchmarks.common import ensure_model, sample_images
+from services.vegetable_classifier import VegetableClassifier
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=MODEL_PATH, help="Path model .keras")
+    parser.add_argument("--batch-sizes", default="1,2,4,8,16,32")
+    parser.add_argument("--images", type=int, default=64, help="Jumlah gambar per run")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    classifier = VegetableClassifier(model_path=ensure_model(args.model))
+    paths = list(itertools.islice(itertools.cycle(sample_images()), args.images))
+
+    # warm-up agar graph tracing tidak ikut terukur
+    classifier.predict_batch(paths[:2])
+
+    print(f"{'mode':<12} {'batch':>5} {'img/s':>10} {'total':>10}")
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for path in paths:
+            classifier.predict(path)
+    elapsed = (time.perf_counter() - start) / args.repeat
+    print(f"{'sequential':<12} {1:>5} {len(paths) / elapsed:>10.1f} {elapsed:>9.2f}s")
+
+    for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            classifier.predict_batch(paths, max_batch_size=batch_size)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f"{'batched':<12} {batch_size:>5} {len(paths) / elapsed:>10.1f} {elapsed:>9.2f}s")
+
+
+if __name__ == "__main__":
+    main()
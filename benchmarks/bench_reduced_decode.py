@@ -0,0 +1,76 @@
+"""
+Decode penuh vs. decode JPEG dengan downscaling untuk foto kamera 4000 × 3000.
+
+Foto sintetis dibuat dari gambar contoh di uploads/ (di-upscale lalu
+di-encode JPEG kualitas 90, seperti foto ponsel). Yang diukur per gambar:
+latency decode + preprocess, ukuran array hasil decode, peak memori yang
+dialokasikan lewat NumPy (tracemalloc), dan selisih tensor hasil preprocess.
+
+Usage:
+    python -m benchmarks.bench_reduced_decode --width 4000 --height 3000 --iterations 50
+"""
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from benchmarks.common import sample_images, summarize_ms
+from services.image_decode import decode_image
+from services.preprocessing import preprocess_image
+
+
+def make_photos(width: int, height: int, quality: int) -> list[bytes]:
+    photos = []
+    for path in sample_images():
+        image = cv2.resize(cv2.imread(path), (width, height), interpolation=cv2.INTER_CUBIC)
+        ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        photos.append(encoded.tobytes())
+    return photos
+
+
+def measure(photos: list[bytes], reduced: bool, iterations: int) -> tuple[list[float], int, int]:
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        preprocess_image(decode_image(photos[i % len(photos)], reduced=reduced))
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    decoded = decode_image(photos[0], reduced=reduced)
+    preprocess_image(decoded)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return samples, decoded.nbytes, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--quality", type=int, default=90)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    photos = make_photos(args.width, args.height, args.quality)
+    print(f"{len(photos)} foto {args.width}x{args.height}, rata-rata "
+          f"{np.mean([len(p) for p in photos]) / 1024:.0f} KB")
+
+    for label, reduced in (("full decode", False), ("reduced decode", True)):
+        samples, decoded_bytes, peak = measure(photos, reduced, args.iterations)
+        print(f"{label:<15} {summarize_ms(samples)}  decoded={decoded_bytes / 2**20:6.2f}MB "
+              f"peak={peak / 2**20:6.2f}MB")
+
+    diffs = [
+        np.abs(
+            preprocess_image(decode_image(p, reduced=False)) - preprocess_image(decode_image(p))
+        )
+        for p in photos
+    ]
+    print(f"selisih tensor: mean={np.mean([d.mean() for d in diffs]):.4f} "
+          f"p99={np.percentile(np.concatenate([d.ravel() for d in diffs]), 99):.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Latency model.predict vs. fungsi serving tf.function (KerasBackend) dengan
+dan tanpa XLA, untuk beberapa ukuran batch (termasuk yang tidak pas dengan
+bucket, misalnya 3 → di-pad ke 4).
+
+Usage:
+    python -m benchmarks.bench_serving_signature --batch-sizes 1,3,8,32 --repeat 30
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import ensure_model, summarize_ms
+from config.inference import BATCH_BUCKETS, MODEL_PATH
+from services.inference_backends import KerasBackend
+
+
+def measure(predict, batch: np.ndarray, repeat: int) -> list[float]:
+    predict(batch)  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predict(batch)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--batch-sizes", default="1,3,8,32")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--no-xla", action="store_true", help="lewati varian XLA")
+    args = parser.parse_args()
+
+    model_path = ensure_model(args.model)
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",")]
+    rng = np.random.default_rng(0)
+
+    serving = KerasBackend(model_path, xla=False)
+    variants = {
+        "model.predict": lambda batch: serving.model.predict(batch, batch_size=len(batch), verbose=0),
+        "tf.function": serving.predict,
+    }
+    if not args.no_xla:
+        xla = KerasBackend(model_path, xla=True)
+        start = time.perf_counter()
+        xla.warmup()
+        print(f"Kompilasi XLA {len(xla.buckets)} bucket: {time.perf_counter() - start:.1f}s")
+        variants["tf.function+xla"] = xla.predict
+
+    print(f"Bucket: {BATCH_BUCKETS}")
+    print(f"{'variant':<16} {'batch':>5}  latency{'':>40} {'img/s':>8}")
+    for batch_size in batch_sizes:
+        batch = rng.random((batch_size, 224, 224, 3), dtype=np.float32)
+        for name, predict in variants.items():
+            samples = measure(predict, batch, args.repeat)
+            throughput = batch_size * len(samples) / sum(samples)
+            print(f"{name:<16} {batch_size:>5}  {summarize_ms(samples)} {throughput:>8.1f}")
+    print(f"\nTrace fungsi serving: {serving._serve.experimental_get_tracing_count()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Bytes yang ditransfer per sesi untuk halaman views dan gambar produk:
+StaticFiles/FileResponse bawaan vs. CachedStaticFiles.
+
+Satu sesi = buka halaman / dan /vq beserta CSS/JS/favicon, lalu list produk
+dengan ``--images`` gambar. Client meniru cache HTTP browser: respons yang
+masih fresh menurut Cache-Control tidak diminta lagi, sisanya direvalidasi
+dengan If-None-Match / If-Modified-Since (freshness heuristik diabaikan).
+Sesi pertama dengan cache kosong, sesi berikutnya ``--gap-hours`` kemudian.
+
+Usage:
+    python -m benchmarks.bench_static_session --sessions 10 --images 12
+"""
+import argparse
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+
+from benchmarks.common import ROOT_DIRECTORY, sample_images
+from scripts.precompress_static import compress
+from services.static_files import CachedStaticFiles, PRECOMPRESSIBLE_SUFFIXES, static_file_response
+from services.upload_store import UploadStore
+
+PAGE_RESOURCES = [
+    "/",
+    "/assets/css/index.css",
+    "/assets/assets/favicon.ico",
+    "/vq",
+    "/assets/css/vegetable-quality.css",
+    "/assets/js/vegetable-quality.js",
+]
+
+
+def build_app(views: Path, uploads: Path, cached: bool) -> FastAPI:
+    app = FastAPI()
+    if cached:
+        app.mount("/assets", CachedStaticFiles(directory=views, html=True), name="views")
+        app.mount("/uploads", CachedStaticFiles(directory=uploads, immutable_prefixes=("cas/",)), name="uploads")
+
+        @app.get("/")
+        async def root(request: Request):
+            return await static_file_response(request, str(views / "html/index.html"))
+
+        @app.get("/vq")
+        async def vegetable_quality(request: Request):
+            return await static_file_response(request, str(views / "html/vegetable-quality.html"))
+    else:
+        app.mount("/assets", StaticFiles(directory=views, html=True), name="views")
+        app.mount("/uploads", StaticFiles(directory=uploads), name="uploads")
+
+        @app.get("/")
+        async def root():
+            return FileResponse(views / "html/index.html")
+
+        @app.get("/vq")
+        async def vegetable_quality():
+            return FileResponse(views / "html/vegetable-quality.html")
+    return app
+
+
+def max_age(cache_control: str) -> float:
+    for directive in cache_control.split(","):
+        name, _, value = directive.strip().partition("=")
+        if name == "max-age":
+            return float(value)
+    return 0.0
+
+
+def wire_bytes(response) -> int:
+    # status line + header + body terkompresi (yang benar-benar lewat jaringan)
+    headers = sum(len(name) + len(value) + 4 for name, value in response.headers.items())
+    return 17 + headers + int(response.headers.get("content-length", len(response.content)))
+
+
+def run_session(client: TestClient, urls: list[str], cache: dict, now: float) -> tuple[int, int]:
+    requests = transferred = 0
+    for url in urls:
+        entry = cache.get(url)
+        if entry and now - entry["stored_at"] < entry["max_age"]:
+            continue  # fresh: tidak ada request
+
+        headers = {"Accept-Encoding": "gzip, br"}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        elif entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = client.get(url, headers=headers)
+        requests += 1
+        transferred += wire_bytes(response)
+        if response.status_code in (200, 304):
+            cache[url] = {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "max_age": max_age(response.headers.get("cache-control", "")),
+                "stored_at": now,
+            }
+    return requests, transferred
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--images", type=int, default=12)
+    parser.add_argument("--gap-hours", type=float, default=6.0)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_static_"))
+    views = workdir / "views"
+    shutil.copytree(ROOT_DIRECTORY / "views", views, ignore=shutil.ignore_patterns("*.gz", "*.br"))
+    for path in views.rglob("*"):
+        if path.suffix.lower() in PRECOMPRESSIBLE_SUFFIXES:
+            compress(path)
+
+    images = sample_images(args.images)
+    legacy_uploads, store_uploads = workdir / "legacy", workdir / "store"
+    legacy_uploads.mkdir()
+    legacy_urls, store_urls = [], []
+    store = UploadStore(store_uploads)
+    for path in images:
+        legacy_name = f"{uuid.uuid4()}{Path(path).suffix}"
+        shutil.copy(path, legacy_uploads / legacy_name)
+        legacy_urls.append(f"/uploads/{legacy_name}")
+        store_urls.append(f"/uploads/{store.save_bytes(Path(path).read_bytes(), Path(path).suffix)[0]}")
+
+    print(f"{args.sessions} sesi, {len(images)} gambar, jeda {args.gap_hours} jam")
+    for label, uploads, image_urls, cached in (
+        ("StaticFiles", legacy_uploads, legacy_urls, False),
+        ("CachedStaticFiles", store_uploads, store_urls, True),
+    ):
+        client = TestClient(build_app(views, uploads, cached))
+        cache: dict = {}
+        sessions = [
+            run_session(client, PAGE_RESOURCES + image_urls, cache, i * args.gap_hours * 3600)
+            for i in range(args.sessions)
+        ]
+        first_requests, first_bytes = sessions[0]
+        repeat_requests = sum(r for r, _ in sessions[1:]) / max(1, len(sessions) - 1)
+        repeat_bytes = sum(b for _, b in sessions[1:]) / max(1, len(sessions) - 1)
+        total = sum(b for _, b in sessions)
+        print(f"{label:<18} sesi pertama {first_requests:3d} req {first_bytes / 1024:8.1f}KB | "
+              f"sesi berikutnya {repeat_requests:5.1f} req {repeat_bytes / 1024:7.1f}KB | "
+              f"total {total / 1024:8.1f}KB ({total / len(sessions) / 1024:.1f}KB/sesi)")
+
+    shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
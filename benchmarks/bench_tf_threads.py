@@ -0,0 +1,150 @@
+"""
+Sweep throughput konfigurasi runtime TensorFlow (services/tf_runtime.py).
+
+Untuk setiap kombinasi jumlah worker × thread intra-op × inter-op × oneDNN,
+sejumlah proses (meniru worker uvicorn) dijalankan bersamaan; setiap proses
+menerapkan konfigurasinya sebelum import TensorFlow, memuat model, lalu
+menjalankan forward pass dari beberapa thread (meniru executor inferensi)
+selama --duration detik. Hasil: total gambar/detik dan latency p50/p99 per
+forward pass, diurutkan dari throughput tertinggi.
+
+Usage:
+    python -m benchmarks.bench_tf_threads --workers 1,2,4 --intra 1,2,4,0 --inter 1,2 --onednn default,false
+    python -m benchmarks.bench_tf_threads --workers 4 --intra auto --affinity
+
+``--intra 0`` = default TensorFlow (satu thread per core, tanpa konfigurasi),
+``--intra auto`` = core dibagi rata ke jumlah worker.
+"""
+import argparse
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+
+from benchmarks.common import ensure_model, percentile
+from config.inference import MODEL_PATH
+
+
+def run_worker(config: dict, model_path: str, barrier, results) -> None:
+    """Satu proses: terapkan konfigurasi, muat model, ukur throughput."""
+    if config["intra"]:
+        from services.tf_runtime import configure_runtime
+
+        configure_runtime(
+            intra_op_threads=config["intra"],
+            inter_op_threads=config["inter"],
+            onednn=config["onednn"],
+            cpu_affinity="auto" if config["affinity"] else "",
+        )
+    elif config["onednn"] is not None:
+        os.environ["TF_ENABLE_ONEDNN_OPTS"] = "1" if config["onednn"] == "true" else "0"
+
+    import numpy as np
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(model_path)
+    batch = np.random.default_rng(0).random((config["batch_size"], 224, 224, 3), dtype=np.float32)
+    model.predict(batch, verbose=0)  # warm-up
+
+    latencies: list[float] = []
+    deadline = [0.0]
+
+    def loop():
+        while time.perf_counter() < deadline[0]:
+            start = time.perf_counter()
+            model.predict(batch, batch_size=len(batch), verbose=0)
+            latencies.append(time.perf_counter() - start)
+
+    barrier.wait()
+    deadline[0] = time.perf_counter() + config["duration"]
+    threads = [threading.Thread(target=loop) for _ in range(config["concurrency"])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put((len(latencies) * len(batch), latencies))
+
+
+def run_config(config: dict, model_path: str) -> dict:
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(config["workers"])
+    results = context.Queue()
+    processes = [
+        context.Process(target=run_worker, args=(config, model_path, barrier, results))
+        for _ in range(config["workers"])
+    ]
+    for process in processes:
+        process.start()
+    images, latencies = 0, []
+    for _ in processes:
+        count, samples = results.get()
+        images += count
+        latencies.extend(samples)
+    for process in processes:
+        process.join()
+    return {
+        "throughput": images / config["duration"],
+        "p50": percentile(latencies, 50) if latencies else float("nan"),
+        "p99": percentile(latencies, 99) if latencies else float("nan"),
+    }
+
+
+def parse_intra(value: str, workers: int) -> int:
+    if value == "auto":
+        return max(1, (os.cpu_count() or 1) // workers)
+    return int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--workers", default="1,2", help="jumlah proses (worker uvicorn)")
+    parser.add_argument("--intra", default="0,auto,1", help="thread intra-op; 0 = default TF")
+    parser.add_argument("--inter", default="1,2")
+    parser.add_argument("--onednn", default="default", help="default, true, false")
+    parser.add_argument("--affinity", action="store_true", help="pin setiap worker ke blok core sendiri")
+    parser.add_argument("--concurrency", type=int, default=2, help="thread inferensi per worker")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    model_path = ensure_model(args.model)
+    print(f"{os.cpu_count()} core, batch {args.batch_size}, {args.concurrency} thread/worker, {args.duration:.0f}s")
+
+    rows = []
+    grid = itertools.product(
+        [int(w) for w in args.workers.split(",")],
+        args.intra.split(","),
+        [int(i) for i in args.inter.split(",")],
+        args.onednn.split(","),
+    )
+    for workers, intra, inter, onednn in grid:
+        config = {
+            "workers": workers,
+            "intra": parse_intra(intra, workers),
+            "inter": inter,
+            "onednn": None if onednn == "default" else onednn,
+            "affinity": args.affinity,
+            "concurrency": args.concurrency,
+            "batch_size": args.batch_size,
+            "duration": args.duration,
+        }
+        if not config["intra"] and inter != int(args.inter.split(",")[0]):
+            continue  # default TF: inter-op juga default, cukup sekali
+        result = run_config(config, model_path)
+        label = f"w={workers} intra={config['intra'] or 'tf'} inter={inter if config['intra'] else 'tf'} onednn={onednn}"
+        rows.append((result["throughput"], label, result))
+        print(
+            f"{label:<40} {result['throughput']:8.1f} img/s  "
+            f"p50={result['p50'] * 1000:8.2f}ms p99={result['p99'] * 1000:8.2f}ms",
+            flush=True,
+        )
+
+    print("\nTerbaik:")
+    for throughput, label, result in sorted(rows, key=lambda row: row[0], reverse=True)[:3]:
+        print(f"  {label:<40} {throughput:8.1f} img/s  p99={result['p99'] * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Lag event loop saat banyak upload paralel: tulis file langsung di event loop
+(kode lama) vs. UploadStore yang menyalin di threadpool.
+
+Sebuah task memantau loop dengan ``asyncio.sleep(interval)`` dan mencatat
+keterlambatannya; write yang blocking terlihat sebagai lonjakan lag. Latency
+storage jaringan disimulasikan dengan ``--write-delay-ms`` (sleep di dalam
+penulisan file); arahkan ``--dir`` ke volume upload yang sebenarnya untuk
+mengukur disk aslinya.
+
+Usage:
+    python -m benchmarks.bench_upload_loop_lag --uploads 64 --concurrency 16 --write-delay-ms 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI, File, UploadFile
+
+from benchmarks.common import percentile
+from services.upload_store import UploadStore
+
+
+def build_app(directory: Path, fsync: str, write_delay: float) -> FastAPI:
+    import routes.marketplace as marketplace_router
+    from app.controllers.dependencies import get_current_user
+
+    class SlowStore(UploadStore):
+        def save_stream(self, source, suffix):
+            time.sleep(write_delay)
+            return super().save_stream(source, suffix)
+
+    marketplace_router.UPLOAD_DIR = directory
+    marketplace_router.UploadStore = lambda root: SlowStore(root, fsync=fsync)
+    # thumbnail di background tidak ikut diukur
+    marketplace_router.generate_derivatives = lambda *args: None
+
+    app = FastAPI()
+    app.include_router(marketplace_router.router)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(resident_id=1, role="warga")
+
+    @app.post("/legacy-upload")
+    async def legacy_upload(file: UploadFile = File(...)):
+        # kode lama: baca seluruh file lalu tulis langsung di event loop
+        contents = await file.read()
+        time.sleep(write_delay)
+        with open(directory / f"{os.urandom(16).hex()}.jpg", "wb") as f:
+            f.write(contents)
+            if fsync != "none":
+                f.flush()
+                os.fsync(f.fileno())
+        return {"image_url": f.name}
+
+    return app
+
+
+async def monitor_lag(stop: asyncio.Event, interval: float, samples: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+async def measure(app: FastAPI, path: str, payloads: list[bytes], concurrency: int) -> tuple[float, list[float]]:
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    lag: list[float] = []
+    stop = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def upload(data: bytes):
+            async with semaphore:
+                response = await client.post(path, files={"file": ("foto.jpg", data, "image/jpeg")})
+                response.raise_for_status()
+
+        monitor = asyncio.create_task(monitor_lag(stop, 0.005, lag))
+        start = time.perf_counter()
+        await asyncio.gather(*[upload(data) for data in payloads])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await monitor
+    return elapsed, lag
+
+
+async def run(args):
+    directory = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix="bench_uploads_"))
+    app = build_app(directory, args.fsync, args.write_delay_ms / 1000)
+    # isi acak agar setiap upload benar-benar ditulis (tidak kena dedup)
+    payloads = [os.urandom(args.size_kb * 1024) for _ in range(args.uploads)]
+
+    print(f"{args.uploads} upload x {args.size_kb}KB, concurrency={args.concurrency}, "
+          f"fsync={args.fsync}, write delay={args.write_delay_ms}ms, dir={directory}")
+    for label, path in (("blocking write", "/legacy-upload"), ("threadpool", "/marketplace/upload-image")):
+        elapsed, lag = await measure(app, path, payloads, args.concurrency)
+        print(f"{label:<15} {args.uploads / elapsed:7.1f} upload/s  loop lag "
+              f"p50={percentile(lag, 50) * 1000:6.2f}ms p99={percentile(lag, 99) * 1000:7.2f}ms "
+              f"max={max(lag) * 1000:7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--uploads", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--size-kb", type=int, default=2048)
+    parser.add_argument("--write-delay-ms", type=float, default=20.0)
+    parser.add_argument("--fsync", choices=("none", "file", "full"), default="file")
+    parser.add_argument("--dir", help="Folder tujuan (default: folder sementara)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
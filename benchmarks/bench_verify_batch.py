@@ -0,0 +1,102 @@
+"""
+Throughput verifikasi: N gambar lewat /marketplace/verify-vegetable (satu
+request per gambar, paralel) vs. satu request /verify-vegetable/batch.
+
+Aplikasi dijalankan in-process lewat httpx ASGITransport dengan user palsu
+(bukan warga, jadi hasil tidak disimpan) dan cache prediksi dimatikan agar
+setiap gambar benar-benar di-inferensi.
+
+Usage:
+    python -m benchmarks.bench_verify_batch --images 48 --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.common import ensure_model, sample_images
+from config.inference import MODEL_PATH
+
+
+def build_app(model_path: str) -> FastAPI:
+    import app.controllers.prediction as prediction_controller
+    import routes.marketplace as marketplace_router
+    import services.vegetable_classifier as vegetable_classifier
+    from app.controllers.dependencies import get_current_user
+
+    vegetable_classifier._classifier = vegetable_classifier.VegetableClassifier(model_path=model_path)
+    vegetable_classifier._classifier.warmup()
+    prediction_controller.PREDICTION_CACHE_ENABLED = False
+
+    app = FastAPI()
+    app.include_router(marketplace_router.router)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(resident_id=None, role="warga")
+    return app
+
+
+async def per_image(client: httpx.AsyncClient, images: list[tuple[str, bytes]], concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def verify(name: str, data: bytes):
+        async with semaphore:
+            while True:
+                response = await client.post(
+                    "/marketplace/verify-vegetable", files={"file": (name, data, "image/png")}
+                )
+                if response.status_code != 503:
+                    break
+                await asyncio.sleep(0.05)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[verify(name, data) for name, data in images])
+    return time.perf_counter() - start
+
+
+async def batch(client: httpx.AsyncClient, images: list[tuple[str, bytes]]) -> float:
+    # catatan: ASGITransport mengumpulkan seluruh body, jadi yang diukur di
+    # sini throughput total, bukan waktu sampai baris NDJSON pertama
+    files = [("files", (name, data, "image/png")) for name, data in images]
+    start = time.perf_counter()
+    response = await client.post("/marketplace/verify-vegetable/batch", files=files)
+    response.raise_for_status()
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert len(lines) == len(images)
+    return time.perf_counter() - start
+
+
+async def run(args):
+    app = build_app(ensure_model(args.model))
+    paths = sample_images()
+    images = [
+        (f"{i}{Path(paths[i % len(paths)]).suffix}", Path(paths[i % len(paths)]).read_bytes())
+        for i in range(args.images)
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        await batch(client, images[:4])  # warm-up
+
+        single_seconds = await per_image(client, images, args.concurrency)
+        batch_seconds = await batch(client, images)
+
+    n = len(images)
+    print(f"per-image (concurrency {args.concurrency}): {single_seconds:7.2f}s  {n / single_seconds:7.1f} img/s")
+    print(f"batch NDJSON:                 {batch_seconds:7.2f}s  {n / batch_seconds:7.1f} img/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--images", type=int, default=48)
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Total memori (RSS dan PSS) saat jumlah API worker bertambah: model dimuat
+di setiap worker vs. satu worker inferensi terpisah + handoff shared memory.
+
+PSS membagi halaman bersama (misalnya buffer shared memory) secara adil
+antar proses, jadi lebih mendekati pemakaian memori mesin sebenarnya;
+RSS menghitung halaman bersama berkali-kali.
+
+Usage:
+    python -m benchmarks.bench_worker_memory --workers 1,2,4
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks.common import ensure_model
+from config.inference import MODEL_PATH
+
+AUTHKEY = "bench-worker-memory"
+
+
+def read_memory_kb(pid: int) -> tuple[int, int]:
+    """(RSS, PSS) dalam kB dari /proc (Linux)."""
+    rss = pss = 0
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1])
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    pss = int(line.split()[1])
+    except FileNotFoundError:
+        pss = rss
+    return rss, pss
+
+
+def local_api_worker(model_path: str, ready, stop) -> None:
+    from services.vegetable_classifier import VegetableClassifier
+
+    VegetableClassifier(model_path=model_path).warmup()
+    ready.set()
+    stop.wait()
+
+
+def remote_api_worker(address: str, ready, stop) -> None:
+    from services.vegetable_classifier import RemoteClassifier
+
+    RemoteClassifier(addresses=[address], authkey=AUTHKEY).warmup()
+    ready.set()
+    stop.wait()
+
+
+def inference_worker(model_path: str, address: str, ready, stop) -> None:
+    import threading
+
+    from services.inference_worker import InferenceWorker
+    from services.vegetable_classifier import VegetableClassifier
+
+    classifier = VegetableClassifier(model_path=model_path)
+    classifier.warmup()
+    worker = InferenceWorker(address, authkey=AUTHKEY, classifier=classifier, micro_batch=False)
+    threading.Thread(target=worker.serve_forever, daemon=True).start()
+    ready.set()
+    stop.wait()
+    worker.close()
+
+
+def run_scenario(context, targets: list[tuple]) -> tuple[int, int]:
+    """Jalankan proses secara berurutan (tunggu siap), ukur total memori."""
+    stop = context.Event()
+    processes = []
+    try:
+        for target, args in targets:
+            ready = context.Event()
+            process = context.Process(target=target, args=(*args, ready, stop))
+            process.start()
+            processes.append(process)
+            if not ready.wait(300):
+                raise RuntimeError(f"{target.__name__} tidak siap")
+        time.sleep(0.5)
+        totals = [read_memory_kb(p.pid) for p in processes]
+        return sum(t[0] for t in totals), sum(t[1] for t in totals)
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(10)
+            if process.is_alive():
+                process.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--workers", default="1,2,4")
+    args = parser.parse_args()
+
+    model_path = ensure_model(args.model)
+    context = multiprocessing.get_context("spawn")
+    address = os.path.join(tempfile.mkdtemp(), "inference.sock")
+
+    print(f"{'workers':>7} {'mode':<18} {'RSS total':>12} {'PSS total':>12}")
+    for count in [int(w) for w in args.workers.split(",")]:
+        local = run_scenario(context, [(local_api_worker, (model_path,))] * count)
+        remote = run_scenario(
+            context,
+            [(inference_worker, (model_path, address))]
+            + [(remote_api_worker, (address,))] * count,
+        )
+        for mode, (rss, pss) in (("model per worker", local), ("shared worker", remote)):
+            print(f"{count:>7} {mode:<18} {rss / 1024:>10.0f}MB {pss / 1024:>10.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Helper bersama untuk skrip benchmark.
+
+Jalankan benchmark dari root repo, misalnya:
+    python -m benchmarks.bench_predict_batch
+"""
+import os
+import statistics
+import tempfile
+from pathlib import Path
+
+from config.inference import MODEL_PATH
+
+ROOT_DIRECTORY = Path(__file__).parent.parent
+UPLOADS_DIRECTORY = ROOT_DIRECTORY / "uploads"
+
+
+def ensure_model(model_path: str = MODEL_PATH) -> str:
+    """
+    Kembalikan path model yang bisa dipakai benchmark.
+
+    Artefak .keras tidak disimpan di repo; jika tidak ada, dibuat MobileNetV2
+    dengan bobot acak dan head 2 kelas (biaya komputasi sama dengan model asli).
+    """
+    if os.path.exists(model_path):
+        return model_path
+
+    import tensorflow as tf
+
+    base = tf.keras.applications.MobileNetV2(
+        input_shape=(224, 224, 3), include_top=False, weights=None
+    )
+    model = tf.keras.Sequential([
+        base,
+        tf.keras.layers.GlobalAveragePooling2D(),
+        tf.keras.layers.Dense(2, activation="softmax"),
+    ])
+    fallback_path = os.path.join(tempfile.gettempdir(), "bench_mobilenetv2.keras")
+    model.save(fallback_path)
+    print(f"[INFO] {model_path} tidak ditemukan, memakai model acak {fallback_path}")
+    return fallback_path
+
+
+def sample_images(limit: int | None = None) -> list[str]:
+    """Daftar gambar contoh dari folder uploads/."""
+    paths = sorted(
+        str(p) for p in UPLOADS_DIRECTORY.iterdir()
+        if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".bmp"}
+    )
+    return paths[:limit] if limit else paths
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Persentil sederhana (nearest-rank) dari list sampel."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize_ms(samples: list[float]) -> str:
+    """Ringkasan latency (detik) dalam milidetik: p50/p99/mean."""
+    return (
+        f"p50={percentile(samples, 50) * 1000:8.2f}ms "
+        f"p99={percentile(samples, 99) * 1000:8.2f}ms "
+        f"mean={statistics.fmean(samples) * 1000:8.2f}ms"
+    )
@@ -0,0 +1,76 @@
+"""
+Load test: latency /auth/me selama prediksi sedang berjalan.
+
+Jalankan server terlebih dahulu (uvicorn main:app), lalu:
+    python -m benchmarks.load_event_loop --base-url http://localhost:8000
+
+Skrip mengukur /auth/me saat idle, lalu mengirim prediksi secara paralel dan
+mengukur /auth/me lagi. Jika event loop tidak terblokir, kedua angka harus
+hampir sama.
+"""
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import sample_images, summarize_ms
+
+
+async def probe_me(client: httpx.AsyncClient, stop: asyncio.Event, interval: float) -> list[float]:
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/auth/me")
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def predict_loop(client: httpx.AsyncClient, image: bytes, count: int, statuses: list[int]):
+    for _ in range(count):
+        response = await client.post(
+            "/predict/", files={"file": ("sayur.png", image, "image/png")}
+        )
+        statuses.append(response.status_code)
+
+
+async def run(args):
+    image = Path(sample_images(1)[0]).read_bytes()
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        stop = asyncio.Event()
+        idle = asyncio.ensure_future(probe_me(client, stop, args.interval))
+        await asyncio.sleep(args.idle_seconds)
+        stop.set()
+        idle_samples = await idle
+
+        stop = asyncio.Event()
+        statuses: list[int] = []
+        loaded = asyncio.ensure_future(probe_me(client, stop, args.interval))
+        await asyncio.gather(
+            *[predict_loop(client, image, args.requests, statuses) for _ in range(args.concurrency)]
+        )
+        stop.set()
+        loaded_samples = await loaded
+
+    print(f"/auth/me idle        n={len(idle_samples):4d} {summarize_ms(idle_samples)}")
+    print(f"/auth/me under load  n={len(loaded_samples):4d} {summarize_ms(loaded_samples)}")
+    print(
+        f"/predict/ statuses: 200={statuses.count(200)} "
+        f"503={statuses.count(503)} other={len(statuses) - statuses.count(200) - statuses.count(503)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=10, help="Prediksi per klien")
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--idle-seconds", type=float, default=3.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
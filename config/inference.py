@@ -0,0 +1,144 @@
+"""
+Konfigurasi layanan inferensi (klasifikasi keutuhan sayur).
+"""
+from dotenv import load_dotenv
+import os
+
+# Load environment variables from .env file
+load_dotenv()
+
+# false = worker khusus CRUD: route /predict tidak dipasang dan stack ML
+# (numpy, cv2, TensorFlow) tidak pernah di-import
+INFERENCE_ENABLED = os.getenv("INFERENCE_ENABLED", "true").lower() == "true"
+
+# Path ke artefak model
+MODEL_PATH = os.getenv("MODEL_PATH", "models/model_mobilenetv2_classifier.keras")
+# Label versi model; kosong = <nama file>-<backend>-<8 hex sha256 artefak>
+MODEL_VERSION = os.getenv("MODEL_VERSION") or None
+
+# Model registry: artefak baru hanya boleh dimuat dari folder ini (lewat
+# POST /predict/models/load), default folder MODEL_PATH
+MODEL_DIRECTORY = os.getenv("MODEL_DIRECTORY") or os.path.dirname(MODEL_PATH) or "."
+# A/B: model kandidat yang dimuat di background saat startup dan fraksi
+# traffic (0-1) yang diarahkan ke kandidat
+MODEL_CANDIDATE_PATH = os.getenv("MODEL_CANDIDATE_PATH") or None
+MODEL_CANDIDATE_WEIGHT = float(os.getenv("MODEL_CANDIDATE_WEIGHT", "0.1"))
+
+# Backend inferensi: keras, tflite-fp16, tflite-int8, onnx
+BACKEND = os.getenv("INFERENCE_BACKEND", "keras")
+
+# Backend keras: batch di-pad ke bucket terkecil yang muat agar fungsi
+# serving (tf.function) hanya melihat sedikit bentuk input; batch yang lebih
+# besar dari bucket terbesar dipecah per bucket terbesar
+BATCH_BUCKETS = sorted({
+    int(size) for size in os.getenv("INFERENCE_BATCH_BUCKETS", "1,2,4,8,16,32").split(",") if size.strip()
+})
+# Kompilasi fungsi serving dengan XLA (satu kompilasi per bucket, dilakukan
+# saat warm-up)
+XLA_ENABLED = os.getenv("INFERENCE_XLA", "false").lower() == "true"
+
+# Thread ONNX Runtime. Default: core dibagi rata ke jumlah worker uvicorn
+# (WEB_CONCURRENCY) agar beberapa worker tidak oversubscribe CPU.
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+ONNX_INTRA_OP_THREADS = int(
+    os.getenv("INFERENCE_ONNX_INTRA_OP_THREADS")
+    or max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)
+)
+ONNX_INTER_OP_THREADS = int(os.getenv("INFERENCE_ONNX_INTER_OP_THREADS", "1"))
+
+# Runtime TensorFlow (keras / tflite via tf.lite), diterapkan sebelum
+# TensorFlow di-import (lihat services/tf_runtime.py). Default thread sama
+# dengan ONNX: core dibagi rata ke worker uvicorn.
+TF_INTRA_OP_THREADS = int(
+    os.getenv("INFERENCE_TF_INTRA_OP_THREADS")
+    or max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)
+)
+TF_INTER_OP_THREADS = int(os.getenv("INFERENCE_TF_INTER_OP_THREADS", "1"))
+# oneDNN (MKL-DNN) untuk op CPU: true, false, atau kosong = default TensorFlow
+TF_ONEDNN = os.getenv("INFERENCE_TF_ONEDNN", "").lower() or None
+# Allocator memori: system (glibc malloc), tcmalloc, atau jemalloc.
+# tcmalloc/jemalloc harus di-LD_PRELOAD saat proses dijalankan; di sini
+# hanya diverifikasi. Untuk system, MALLOC_ARENA_MAX membatasi jumlah arena
+# glibc (banyak thread inferensi = banyak arena = RSS membengkak); 0 = default
+TF_ALLOCATOR = os.getenv("INFERENCE_ALLOCATOR", "system").lower()
+MALLOC_ARENA_MAX = int(os.getenv("INFERENCE_MALLOC_ARENA_MAX", "0"))
+# Pinning CPU per worker: kosong = mati, "auto" = setiap worker mengklaim
+# blok TF_INTRA_OP_THREADS core yang belum dipakai worker lain, atau daftar
+# core eksplisit, misalnya "0-3,8"
+CPU_AFFINITY = os.getenv("INFERENCE_CPU_AFFINITY", "").strip().lower()
+
+# JPEG besar di-decode langsung pada skala 1/2, 1/4, atau 1/8 (sisi terpendek
+# tetap >= 224 px) alih-alih decode penuh lalu resize
+REDUCED_DECODE_ENABLED = os.getenv("INFERENCE_REDUCED_DECODE", "true").lower() == "true"
+
+# Jumlah gambar maksimal dalam satu forward pass model
+MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "32"))
+
+# Micro-batching: gabungkan request /predict yang datang bersamaan
+MICRO_BATCH_ENABLED = os.getenv("INFERENCE_MICRO_BATCH", "false").lower() == "true"
+MICRO_BATCH_MAX_SIZE = int(os.getenv("INFERENCE_MICRO_BATCH_SIZE", "8"))
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("INFERENCE_MICRO_BATCH_WAIT_MS", "5"))
+
+# Executor inferensi: job yang berjalan bersamaan + yang boleh mengantre.
+# Jika micro-batching aktif, workers sebaiknya >= INFERENCE_MICRO_BATCH_SIZE
+# agar request bisa digabung dalam satu batch.
+EXECUTOR_MAX_WORKERS = int(os.getenv("INFERENCE_WORKERS", "2"))
+EXECUTOR_MAX_QUEUE = int(os.getenv("INFERENCE_QUEUE_SIZE", "16"))
+# Nilai header Retry-After (detik) saat antrean penuh
+EXECUTOR_RETRY_AFTER = int(os.getenv("INFERENCE_RETRY_AFTER", "1"))
+
+# Cache hasil prediksi (key: hash isi gambar + versi model)
+PREDICTION_CACHE_ENABLED = os.getenv("PREDICTION_CACHE", "true").lower() == "true"
+PREDICTION_CACHE_MAX_ENTRIES = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "1024"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+# Tier persisten SQLite (opsional), misalnya: cache/predictions.sqlite3
+PREDICTION_CACHE_SQLITE_PATH = os.getenv("PREDICTION_CACHE_SQLITE_PATH") or None
+
+# Cache hasil preprocessing (tensor 224 × 224 × 3 float16, file .npy per
+# hash isi gambar) untuk re-scoring dengan model baru; kosong = mati. Isi
+# awal: python -m scripts.warm_preprocess_cache
+PREPROCESS_CACHE_DIR = os.getenv("PREPROCESS_CACHE_DIR") or None
+# Batas ukuran total; file yang paling lama tidak dipakai dihapus lebih dulu
+PREPROCESS_CACHE_MAX_BYTES = int(os.getenv("PREPROCESS_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+# Muat model + forward pass dummy saat startup (bukan pada request pertama)
+WARMUP_ENABLED = os.getenv("INFERENCE_WARMUP", "false").lower() == "true"
+
+# Worker inferensi terpisah (python -m scripts.run_inference_worker). Jika
+# diisi, API worker tidak memuat model sendiri: tensor hasil preprocessing
+# dikirim lewat shared memory ke worker yang memegang model.
+# Format: host:port atau path unix socket; beberapa alamat dipisah koma
+INFERENCE_SERVER_ADDRESS = [
+    address.strip()
+    for address in os.getenv("INFERENCE_SERVER_ADDRESS", "").split(",")
+    if address.strip()
+]
+# Wajib diisi jika INFERENCE_SERVER_ADDRESS dipakai (autentikasi koneksi)
+INFERENCE_SERVER_AUTHKEY = os.getenv("INFERENCE_SERVER_AUTHKEY", "")
+# Jumlah tensor 224 × 224 × 3 per buffer shared memory (per koneksi)
+INFERENCE_SERVER_SLOTS = int(os.getenv("INFERENCE_SERVER_SLOTS", "8"))
+
+# Write-behind hasil /marketplace/verify-vegetable ke verification_results:
+# disimpan per batch setiap interval atau setiap N baris
+VERIFICATION_FLUSH_INTERVAL_MS = float(os.getenv("VERIFICATION_FLUSH_INTERVAL_MS", "250"))
+VERIFICATION_FLUSH_MAX_ROWS = int(os.getenv("VERIFICATION_FLUSH_MAX_ROWS", "100"))
+# Dengan beberapa worker uvicorn, key bisa masih di antrean worker lain:
+# lookup yang tidak menemukan key diulang selama waktu ini sebelum gagal
+VERIFICATION_LOOKUP_WAIT_MS = float(
+    os.getenv("VERIFICATION_LOOKUP_WAIT_MS") or 2 * VERIFICATION_FLUSH_INTERVAL_MS + 250
+)
+
+# Batas per request /marketplace/verify-vegetable/batch (file atau isi zip)
+VERIFY_BATCH_MAX_FILES = int(os.getenv("VERIFY_BATCH_MAX_FILES", "50"))
+VERIFY_BATCH_MAX_BYTES = int(os.getenv("VERIFY_BATCH_MAX_BYTES", str(100 * 1024 * 1024)))
+
+# Ukuran maksimal satu gambar upload (/predict/, /marketplace/verify-vegetable)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+# Header Server-Timing (durasi per tahap: upload_read, decode, preprocess,
+# inference) pada response; histogram Prometheus tetap dicatat jika false
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING", "true").lower() == "true"
+
+# Fraksi request inferensi yang di-profile dengan cProfile (0 = mati). Bisa
+# diubah saat runtime lewat PUT /predict/profile
+PROFILE_SAMPLE_RATE = float(os.getenv("INFERENCE_PROFILE_SAMPLE_RATE", "0"))
@@ -0,0 +1,18 @@
+"""
+Konfigurasi penyajian file statis (/uploads, /assets, halaman views).
+"""
+from dotenv import load_dotenv
+import os
+
+# Load environment variables from .env file
+load_dotenv()
+
+# max-age untuk file content-addressed (uploads/cas/): isinya tidak pernah
+# berubah, jadi boleh di-cache selamanya (Cache-Control: immutable)
+STATIC_IMMUTABLE_MAX_AGE = int(os.getenv("STATIC_IMMUTABLE_MAX_AGE", str(365 * 24 * 3600)))
+
+# max-age untuk file lain; 0 = "no-cache" (selalu revalidasi lewat ETag → 304)
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "0"))
+
+# Sajikan varian .br/.gz hasil scripts/precompress_static.py jika ada
+STATIC_PRECOMPRESSED = os.getenv("STATIC_PRECOMPRESSED", "true").lower() == "true"
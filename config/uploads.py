@@ -0,0 +1,34 @@
+"""
+Konfigurasi penyimpanan dan penyajian file upload (gambar produk).
+"""
+from dotenv import load_dotenv
+from pathlib import Path
+import os
+
+# Load environment variables from .env file
+load_dotenv()
+
+BASE_DIRECTORY = Path(__file__).resolve().parent.parent
+
+# Folder upload yang di-mount di /uploads
+UPLOADS_DIRECTORY = Path(os.getenv("UPLOADS_DIR") or BASE_DIRECTORY / "uploads")
+
+# Thumbnail produk: lebar (px) dan kualitas encode. Turunan disimpan di
+# uploads/derivatives/<nama gambar>/ dan dibuat di background setelah upload.
+THUMBNAIL_WIDTHS = [
+    int(width) for width in os.getenv("THUMBNAIL_WIDTHS", "320,640").split(",") if width.strip()
+]
+THUMBNAIL_WEBP_QUALITY = int(os.getenv("THUMBNAIL_WEBP_QUALITY", "80"))
+THUMBNAIL_JPEG_QUALITY = int(os.getenv("THUMBNAIL_JPEG_QUALITY", "82"))
+
+# Gambar di store content-addressed (uploads/cas/) yang tidak dipakai produk
+# mana pun dihapus oleh scripts/gc_uploads.py setelah masa tenggang ini
+UPLOAD_GC_GRACE_HOURS = float(os.getenv("UPLOAD_GC_GRACE_HOURS", "24"))
+
+# fsync saat menyimpan upload: "none" (andalkan page cache), "file" (fsync
+# isi file sebelum rename), "full" (juga fsync folder tujuan setelah rename)
+UPLOAD_FSYNC_POLICIES = ("none", "file", "full")
+UPLOAD_FSYNC = os.getenv("UPLOAD_FSYNC", "file").lower()
+# divalidasi saat startup, bukan menjadi 500 di setiap upload
+if UPLOAD_FSYNC not in UPLOAD_FSYNC_POLICIES:
+    raise ValueError(f"UPLOAD_FSYNC harus salah satu dari {UPLOAD_FSYNC_POLICIES}, bukan {UPLOAD_FSYNC!r}")
@@ -0,0 +1,27 @@
+"""Add request_key to verification_results
+
+Revision ID: c9e1f2a3b4d5
+Revises: e6f7a8b9c0d1
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from collections.abc import Sequence
+
+revision: str = 'c9e1f2a3b4d5'
+down_revision: str | Sequence[str] | None = 'e6f7a8b9c0d1'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column('verification_results', sa.Column('request_key', sa.String(32), nullable=True))
+    op.create_index(
+        'ix_verification_results_request_key', 'verification_results', ['request_key'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_verification_results_request_key', table_name='verification_results')
+    op.drop_column('verification_results', 'request_key')
@@ -0,0 +1,23 @@
+"""Add model_version to verification_results
+
+Revision ID: d4e5f6a7b8c9
+Revises: c9e1f2a3b4d5
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from collections.abc import Sequence
+
+revision: str = 'd4e5f6a7b8c9'
+down_revision: str | Sequence[str] | None = 'c9e1f2a3b4d5'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column('verification_results', sa.Column('model_version', sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('verification_results', 'model_version')
@@ -1,20 +1,58 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
 from routes import residents, auth, resident_approval, family, income, house, users, marketplace
 import routes.prediction as prediction_router
 import routes.family_mutations as family_mutations_router
+import routes.health as health_router
+import routes.metrics as metrics_router
+from config.inference import (
+    INFERENCE_ENABLED,
+    MAX_UPLOAD_BYTES,
+    MODEL_CANDIDATE_PATH,
+    MODEL_CANDIDATE_WEIGHT,
+    VERIFY_BATCH_MAX_BYTES,
+    WARMUP_ENABLED,
+)
+from services.model_registry import get_model_registry
+from services.static_files import CachedStaticFiles, static_file_response
+from services.timing import ServerTimingMiddleware
+from services.upload_limit import UploadLimitMiddleware
+import config.uploads as uploads_config
+from services.verification_writer import shutdown_verification_writer
+from services.warmup import start_warmup
 import os
 
 BASE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
 VIEWS_DIRECTORY = os.path.join(BASE_DIRECTORY, "views")
-UPLOADS_DIRECTORY = os.path.join(BASE_DIRECTORY, "uploads")
+UPLOADS_DIRECTORY = str(uploads_config.UPLOADS_DIRECTORY)
 
 # Create uploads directory if it doesn't exist
 os.makedirs(UPLOADS_DIRECTORY, exist_ok=True)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup/shutdown hook aplikasi.
+    """
+    if INFERENCE_ENABLED and WARMUP_ENABLED:
+        # Model dimuat di background; /health/ready = 503 sampai selesai
+        start_warmup()
+    if INFERENCE_ENABLED and MODEL_CANDIDATE_PATH:
+        # A/B: kandidat dimuat + warm-up di background, lalu menerima
+        # MODEL_CANDIDATE_WEIGHT dari traffic
+        try:
+            get_model_registry().load(MODEL_CANDIDATE_PATH, role="candidate", weight=MODEL_CANDIDATE_WEIGHT)
+        except (ValueError, RuntimeError, FileNotFoundError) as e:
+            print(f"[WARN] Model kandidat tidak dimuat: {e}")
+    yield
+    # Simpan sisa antrean hasil verifikasi sebelum proses berhenti
+    shutdown_verification_writer()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Pengujian Deteksi Keutuhan Sayur",
     version="1.0.0",
     description="API untuk klasifikasi keutuhan sayur (Utuh/Tidak Utuh) menggunakan MobileNetV2",
@@ -22,26 +60,40 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Tolak upload gambar yang terlalu besar berdasarkan Content-Length, sebelum body dibaca
+app.add_middleware(UploadLimitMiddleware, limits={
+    "/predict/": MAX_UPLOAD_BYTES,
+    "/marketplace/verify-vegetable": MAX_UPLOAD_BYTES,
+    "/marketplace/vegetable-verification": MAX_UPLOAD_BYTES,
+    "/marketplace/verify-vegetable/batch": VERIFY_BATCH_MAX_BYTES,
+})
+# Durasi per tahap inferensi di header Server-Timing
+app.add_middleware(ServerTimingMiddleware)
+# CORS ditambahkan terakhir (paling luar) agar respons 413 tetap membawa header CORS
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
-app.mount("/assets", StaticFiles(directory=VIEWS_DIRECTORY, html=True), name="views")
-app.mount("/uploads", StaticFiles(directory=UPLOADS_DIRECTORY), name="uploads")
+# ETag kuat + Cache-Control; gambar content-addressed (uploads/cas/) immutable
+app.mount("/assets", CachedStaticFiles(directory=VIEWS_DIRECTORY, html=True), name="views")
+app.mount("/uploads", CachedStaticFiles(directory=UPLOADS_DIRECTORY, immutable_prefixes=("cas/",)), name="uploads")
 
 @app.get("/", response_class=FileResponse)
-async def root():
+async def root(request: Request):
     """
     Halaman utama untuk melakukan pengujian deteksi keutuhan sayur.
     """
-    return FileResponse(os.path.join(VIEWS_DIRECTORY, "html/index.html"))
+    return await static_file_response(request, os.path.join(VIEWS_DIRECTORY, "html/index.html"))
 
 @app.get("/vq", response_class=FileResponse)
-async def vegetable_quality():
+async def vegetable_quality(request: Request):
     """
     Halaman untuk menampilkan kualitas sayur.
     """
-    return FileResponse(os.path.join(VIEWS_DIRECTORY, "html/vegetable-quality.html"))
+    return await static_file_response(request, os.path.join(VIEWS_DIRECTORY, "html/vegetable-quality.html"))
 
+app.include_router(health_router.router)
+app.include_router(metrics_router.router)
 app.include_router(auth.router)
-app.include_router(prediction_router.router)
+if INFERENCE_ENABLED:
+    app.include_router(prediction_router.router)
 app.include_router(residents.router)
 app.include_router(resident_approval.router)
 app.include_router(family.router)
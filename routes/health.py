@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from services.warmup import readiness
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/live")
+async def liveness():
+    """
+    Liveness probe: proses hidup dan event loop merespons.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness_probe():
+    """
+    Readiness probe: 200 jika model sudah dimuat dan di-warm-up, 503 jika
+    masih loading atau gagal. Load balancer sebaiknya hanya mengirim
+    traffic setelah endpoint ini mengembalikan 200.
+    """
+    state = readiness()
+    status_code = 200 if state["ready"] else 503
+    return JSONResponse(status_code=status_code, content=state)
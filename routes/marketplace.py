@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from app.controllers.marketplace import MarketplaceController
 from app.controllers.dependencies import get_db, get_current_user
@@ -13,20 +15,36 @@ from app.schemas.marketplace import (
 )
 from app.models.user import User
 from app.controllers.prediction import PredictionController
+from config.inference import VERIFICATION_LOOKUP_WAIT_MS, VERIFY_BATCH_MAX_BYTES, VERIFY_BATCH_MAX_FILES
+from config.uploads import UPLOADS_DIRECTORY
+from services.image_derivatives import derivative_urls, generate_derivatives
+from services.upload_store import UploadStore
+from services.verification_writer import get_verification_writer
 from typing import List
+import asyncio
+import json
 import os
+import time
 import uuid
 from pathlib import Path
 
 router = APIRouter(prefix="/marketplace", tags=["Marketplace"])
 
 # Upload directory
-UPLOAD_DIR = Path(__file__).parent.parent / "uploads"
+UPLOAD_DIR = UPLOADS_DIRECTORY
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+# Jeda antar lookup key verifikasi yang belum tersimpan (lihat find_verification)
+VERIFICATION_LOOKUP_POLL_SECONDS = 0.05
+
 
 def format_product(product):
     """Format product response with camelCase field names for Flutter"""
+    # Thumbnail untuk list view; None selama turunan belum selesai dibuat
+    derivatives = derivative_urls(product.image, UPLOAD_DIR)
+    thumbnails = derivatives["thumbnails"] if derivatives else None
+    # thumbnail terkecil; tidak ada jika THUMBNAIL_WIDTHS dikosongkan
+    smallest = min(thumbnails, key=int) if thumbnails else None
     return {
         "id": product.id,
         "name": product.name,
@@ -35,6 +53,9 @@ def format_product(product):
         "quantity": product.stock or 0,
         "unit": "piece",
         "imagePath": product.image or "",
+        "thumbnailPath": thumbnails[smallest]["webp"] if smallest else None,
+        "thumbnails": thumbnails,
+        "modelImagePath": derivatives["model"] if derivatives else None,
         "status": product.status,
         "createdAt": product.created_at.isoformat() if product.created_at else None,
         "sellerName": product.resident.name if product.resident else None,
@@ -48,12 +69,16 @@ def format_product(product):
 
 @router.post("/upload-image", response_model=dict)
 async def upload_product_image(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
 ):
     """
     Upload gambar produk ke server
     
+    Thumbnail WebP/JPEG dan salinan 224 px dibuat di background setelah
+    response dikirim (lihat thumbnailPath / thumbnails di data produk).
+    
     **Returns:**
     - image_url: URL gambar yang sudah diupload
     """
@@ -68,18 +93,18 @@ async def upload_product_image(
                 detail=f"Hanya file gambar (jpg/png) yang diperbolehkan. File Anda: {file_ext}"
             )
         
-        # Generate unique filename
-        unique_filename = f"{uuid.uuid4()}{file_ext.lower()}"
-        file_path = UPLOAD_DIR / unique_filename
+        # Nama file = hash isi (cas/ab/cd/<sha256>.jpg); gambar yang sama
+        # tidak disimpan dua kali
+        suffix = ".jpg" if file_ext.lower() == ".jpeg" else file_ext.lower()
+        image_name, created = await UploadStore(UPLOAD_DIR).save_upload(file, suffix)
         
-        # Save file
-        contents = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        # Thumbnail dibuat setelah response terkirim (sekali per isi file)
+        if created or derivative_urls(image_name, UPLOAD_DIR) is None:
+            background_tasks.add_task(generate_derivatives, image_name, UPLOAD_DIR)
         
         # Return URL
         return {
-            "image_url": unique_filename,
+            "image_url": image_name,
             "message": "Gambar berhasil diupload"
         }
     except Exception as e:
@@ -151,6 +176,12 @@ async def create_product(
                 detail=f"Anda sudah memiliki produk dengan nama '{body.name}'. Gunakan nama lain atau edit produk yang sudah ada."
             )
     
+    # verification_id mentah dari client diabaikan: hasil verifikasi hanya
+    # bisa ditautkan lewat verification_key milik warga ini
+    verification_id = None
+    if body.verification_key:
+        verification_id = await resolve_verification_id(db, body.verification_key, current_user.resident_id)
+
     # Create product
     product = MarketplaceController.create_product(
         db=db,
@@ -161,7 +192,7 @@ async def create_product(
         quantity=body.stock or 0,
         unit=body.unit or "piece",
         image_path=body.image,
-        verification_id=None,
+        verification_id=verification_id,
     )
     
     return {
@@ -328,6 +359,69 @@ async def get_order(
 
 # ============= VERIFICATION ENDPOINTS =============
 
+async def find_verification(db: Session, verification_key: str):
+    """
+    Cari VerificationResult berdasarkan key /verify-vegetable.
+
+    Antrean write-behind hanya terlihat oleh worker yang menerimanya; dengan
+    WEB_CONCURRENCY > 1 key yang valid bisa belum tersimpan oleh worker
+    lain. Jika belum ditemukan, lookup diulang selama
+    VERIFICATION_LOOKUP_WAIT_MS (satu-dua interval flush) sebelum menyerah.
+
+    Returns:
+        VerificationResult, atau None jika tetap tidak ditemukan
+    """
+    deadline = time.monotonic() + VERIFICATION_LOOKUP_WAIT_MS / 1000
+    while True:
+        verification = MarketplaceController.get_verification_by_key(db, verification_key)
+        if verification is not None or time.monotonic() >= deadline:
+            return verification
+        # akhiri transaksi baca agar query berikutnya melihat commit terbaru
+        # (snapshot REPEATABLE READ)
+        db.rollback()
+        await asyncio.sleep(VERIFICATION_LOOKUP_POLL_SECONDS)
+
+
+async def resolve_verification_id(db: Session, verification_key: str, resident_id: int) -> int:
+    """
+    Ambil ID VerificationResult dari key /verify-vegetable.
+
+    Jika hasil verifikasi masih di antrean write-behind, antrean di-flush dulu.
+    """
+    writer = get_verification_writer()
+    if writer.is_pending(verification_key):
+        # flush menulis ke database dan menunggu thread writer: jangan di event loop
+        await run_in_threadpool(writer.flush)
+
+    verification = await find_verification(db, verification_key)
+    if not verification or verification.resident_id != resident_id:
+        raise HTTPException(status_code=400, detail="Hasil verifikasi tidak ditemukan")
+    return verification.id
+
+
+def submit_verification(
+    resident_id: int, filename: str, prediction: str, confidence: float, model_version: str | None = None
+):
+    """
+    Simpan hasil verifikasi tanpa menunggu commit database (write-behind).
+
+    Returns:
+        verification_key, atau None jika user bukan warga (tidak disimpan)
+    """
+    if not resident_id:
+        return None
+
+    verification_key = uuid.uuid4().hex
+    get_verification_writer().submit(verification_key, {
+        "resident_id": resident_id,
+        "image": str(filename)[:100],
+        "result": json.dumps({"prediction": prediction, "confidence": round(float(confidence), 4)}),
+        "is_valid_for_marketplace": prediction == "Utuh",
+        "model_version": model_version,
+    })
+    return verification_key
+
+
 @router.post("/verify-vegetable", response_model=dict)
 async def verify_vegetable(
     file: UploadFile = File(...),
@@ -345,43 +439,175 @@ async def verify_vegetable(
     - confidence: Tingkat kepercayaan (0-1)
     - vegetable_type: Jenis sayur yang terdeteksi
     - model_version: Versi model yang digunakan
+    - verification_key: Key hasil verifikasi (disimpan di background); kirim
+      sebagai verification_key saat membuat produk, atau cek lewat
+      GET /marketplace/verify-vegetable/{verification_key}
     """
     try:
-        # Validasi tipe file
-        PredictionController.validate_file(str(file.content_type))
-        
-        # Baca file contents
-        contents = await file.read()
-        
-        # Validasi ukuran file
-        PredictionController.validate_file_size(len(contents))
+        # Baca per chunk: tolak >10MB lebih awal, validasi tipe dari magic bytes
+        contents = await PredictionController.read_upload(file)
         
         # Jalankan prediksi
-        result = PredictionController.predict(contents, str(file.filename))
+        result = await PredictionController.predict_async(contents, str(file.filename))
         
         # Extract hasil prediksi
         prediction = result.get("data", {}).get("prediction", "Tidak Utuh")
         confidence = result.get("data", {}).get("confidence", 0)
         class_probs = result.get("data", {}).get("class_probabilities", {})
+        model_version = result.get("data", {}).get("model_version")
         
         # Debug logging
         print(f"🔍 Prediction result: {result}")
         print(f"🔍 Prediction: {prediction}, Confidence: {confidence}")
         print(f"🔍 Class probabilities: {class_probs}")
         
+        verification_key = submit_verification(
+            current_user.resident_id, str(file.filename), prediction, confidence, model_version
+        )
+        
         return {
             "is_valid": prediction == "Utuh",
             "confidence": float(confidence),
             "vegetable_type": "Sayur/Buah",  # Generic type since model only checks integrity
-            "model_version": "mobilenetv2",
+            "model_version": model_version,
+            "verification_key": verification_key,
         }
     except Exception as e:
+        if isinstance(e, HTTPException) and e.status_code in (413, 503):
+            # Upload terlalu besar / backpressure: teruskan status apa adanya
+            raise
         import traceback
         print(f"❌ Verification error: {e}")
         traceback.print_exc()
         raise HTTPException(status_code=400, detail=f"Verifikasi gagal: {str(e)}")
 
 
+@router.post("/verify-vegetable/batch")
+async def verify_vegetable_batch(
+    files: List[UploadFile] = File(...),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Verifikasi banyak gambar sayur sekaligus (misalnya satu panen)
+
+    **Request:**
+    - files: Beberapa gambar (.jpg, .png, .bmp) dan/atau file .zip berisi gambar
+
+    **Limit:** VERIFY_BATCH_MAX_FILES gambar dan VERIFY_BATCH_MAX_BYTES total
+    per request (413 jika terlampaui)
+
+    **Response:** application/x-ndjson, satu baris JSON per gambar yang
+    dikirim begitu batch inferensinya selesai:
+    ```
+    {"index": 0, "filename": "a.jpg", "status": "success", "is_valid": true, "confidence": 0.95, "model_version": "...", "verification_key": "..."}
+    {"index": 1, "filename": "b.jpg", "status": "error", "message": "..."}
+    ```
+
+    503 jika model tidak bisa dimuat. Jika inferensi gagal setelah stream
+    dimulai, baris terakhir berisi ``{"error": "..."}``.
+    """
+    PredictionController.ensure_inference_enabled()
+
+    if len(files) > VERIFY_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Terlalu banyak file. Maksimal {VERIFY_BATCH_MAX_FILES} file per request.",
+        )
+
+    uploads = []
+    total_bytes = 0
+    for file in files:
+        # sisa kuota total bytes menjadi batas file berikutnya; yang terlampaui
+        # adalah batas total request, bukan batas per file
+        try:
+            contents = await PredictionController.read_upload(
+                file, max_size=VERIFY_BATCH_MAX_BYTES - total_bytes, validate_type=False
+            )
+        except HTTPException as e:
+            if e.status_code != 413:
+                raise
+            raise HTTPException(
+                status_code=413,
+                detail=f"Total ukuran gambar terlalu besar. Maksimal {VERIFY_BATCH_MAX_BYTES // (1024 * 1024)}MB.",
+            )
+        total_bytes += len(contents)
+        uploads.append((str(file.filename), contents))
+
+    # Extract zip di thread agar event loop tidak terblokir
+    images = await run_in_threadpool(PredictionController.expand_uploads, uploads)
+    # setelah response dimulai status 200 tidak bisa diganti 503 lagi
+    await PredictionController.ensure_classifier_loaded()
+    resident_id = current_user.resident_id
+
+    def format_line(index: int, result: dict) -> dict:
+        filename = images[index][0]
+        if result["status"] != "success":
+            return {"index": index, "filename": filename, "status": "error", "message": result["message"]}
+        return {
+            "index": index,
+            "filename": filename,
+            "status": "success",
+            "is_valid": result["prediction"] == "Utuh",
+            "confidence": float(result["confidence"]),
+            "model_version": result.get("model_version"),
+            "verification_key": submit_verification(
+                resident_id,
+                filename,
+                result["prediction"],
+                result["confidence"],
+                result.get("model_version"),
+            ),
+        }
+
+    async def stream_results():
+        try:
+            async for start, results in PredictionController.predict_batch_stream(images):
+                yield "".join(
+                    json.dumps(format_line(index, result)) + "\n"
+                    for index, result in enumerate(results, start=start)
+                )
+        except Exception as e:
+            # header 200 sudah terkirim: laporkan sebagai baris terakhir lalu tutup
+            print(f"❌ Verifikasi batch gagal di tengah stream: {e}")
+            yield json.dumps({"error": f"Verifikasi gagal: {e}"}) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@router.get("/verify-vegetable/{verification_key}", response_model=dict)
+async def get_verification(
+    verification_key: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Lookup hasil verifikasi yang disimpan di background
+
+    **Response:**
+    - status: pending (202, belum tersimpan) atau saved
+    - verification_id: ID VerificationResult (jika sudah tersimpan)
+    """
+    if get_verification_writer().is_pending(verification_key):
+        return JSONResponse(
+            status_code=202,
+            content={"verification_key": verification_key, "status": "pending", "verification_id": None},
+        )
+
+    verification = await find_verification(db, verification_key)
+    is_admin = current_user.role == "admin" or current_user.role == "admin_sistem"
+    if not verification or (verification.resident_id != current_user.resident_id and not is_admin):
+        raise HTTPException(status_code=404, detail="Hasil verifikasi tidak ditemukan")
+
+    return {
+        "verification_key": verification_key,
+        "status": "saved",
+        "verification_id": verification.id,
+        "is_valid": bool(verification.is_valid_for_marketplace),
+        "model_version": verification.model_version,
+        "createdAt": verification.created_at.isoformat() if verification.created_at else None,
+    }
+
+
 # ============= BACKWARD COMPATIBILITY =============
 
 @router.post("/vegetable-verification", response_model=dict)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from services.metrics import registry
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Semua metrik proses dalam format teks Prometheus, termasuk histogram
+    durasi per tahap inferensi (inference_stage_seconds{stage=...}).
+    """
+    return PlainTextResponse(
+        registry.to_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
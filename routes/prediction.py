@@ -1,7 +1,13 @@
 from typing import Any
+from app.controllers.dependencies import require_role
 from app.controllers.prediction import PredictionController
-from fastapi import APIRouter, UploadFile, File
-from fastapi.responses import JSONResponse
+from app.models.user import User
+from app.schemas.model_registry import ModelLoadRequest
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import JSONResponse, PlainTextResponse
+from services.metrics import registry
+from services.model_registry import get_model_registry
+from services.profiler import get_profiler
 
 router = APIRouter(prefix="/predict", tags=["Prediction"])
 
@@ -17,6 +23,7 @@ async def predict_vegetable(file: UploadFile = File(...)):
     - prediction: "Utuh" atau "Tidak Utuh"
     - confidence: Confidence score (0-1)
     - class_probabilities: Probabilitas untuk setiap kelas
+    - model_version: Versi model yang menghasilkan prediksi
 
     **Example:**
     ```json
@@ -28,20 +35,140 @@ async def predict_vegetable(file: UploadFile = File(...)):
             "class_probabilities": {
                 "utuh": 0.9542,
                 "tidak_utuh": 0.0458
-            }
+            },
+            "model_version": "model_mobilenetv2_classifier-keras-3f2a9c1d"
         }
     }
     ```
     """
-    # Validasi tipe file
-    PredictionController.validate_file(str(file.content_type))
-    
-    # Baca file contents
-    contents = await file.read()
-    
-    # Validasi ukuran file
-    PredictionController.validate_file_size(len(contents))
+    # Baca per chunk: tolak >10MB lebih awal, validasi tipe dari magic bytes
+    contents = await PredictionController.read_upload(file)
     
     # Jalankan prediksi
-    result: dict[str, Any] = PredictionController.predict(contents, str(file.filename))
-    return JSONResponse(status_code=200, content=result)
\ No newline at end of file
+    result: dict[str, Any] = await PredictionController.predict_async(
+        contents, str(file.filename)
+    )
+    return JSONResponse(status_code=200, content=result)
+
+
+@router.get("/metrics")
+async def prediction_metrics():
+    """
+    Metrik layanan inferensi (kedalaman antrean, histogram ukuran batch,
+    waktu tunggu di antrean micro-batch).
+    """
+    return JSONResponse(status_code=200, content=registry.snapshot())
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def prediction_profile(
+    limit: int = Query(30, ge=1, le=500),
+    sort: str = Query("cumulative"),
+    current_user: User = Depends(require_role("admin")),
+):
+    """
+    Hasil gabungan profiler sampling (cProfile) untuk request inferensi.
+
+    **Query Parameters:**
+    - limit: Jumlah fungsi teratas
+    - sort: cumulative, tottime, atau calls
+    """
+    try:
+        return PlainTextResponse(get_profiler().report(limit=limit, sort=sort))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.put("/profile")
+async def update_prediction_profile(
+    rate: float = Query(..., description="Fraksi request yang di-profile (0 = mati)"),
+    reset: bool = Query(False, description="Buang hasil profile sebelumnya"),
+    current_user: User = Depends(require_role("admin")),
+):
+    """
+    Aktifkan/matikan profiler sampling saat runtime (tanpa restart).
+    """
+    profiler = get_profiler()
+    try:
+        profiler.set_rate(rate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if reset:
+        profiler.reset()
+    return {"rate": profiler.rate, "samples": profiler.samples}
+
+
+def _registry_call(action, *args, **kwargs):
+    """Jalankan aksi registry; error validasi → 400/404, konflik → 409."""
+    try:
+        return action(*args, **kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/models")
+async def model_status(current_user: User = Depends(require_role("admin"))):
+    """
+    Model yang aktif (primary/candidate), pembagian traffic, dan status job
+    load terakhir.
+    """
+    return get_model_registry().status()
+
+
+@router.post("/models/load", status_code=202)
+async def load_model(
+    request: ModelLoadRequest,
+    current_user: User = Depends(require_role("admin")),
+):
+    """
+    Muat artefak model baru di background (tanpa restart).
+
+    Model di-warm-up dulu, lalu dipasang secara atomik sebagai primary atau
+    sebagai candidate yang menerima fraksi ``weight`` dari traffic. Cek
+    progres lewat GET /predict/models.
+    """
+    registry_ = get_model_registry()
+    options = request.model_dump(exclude_none=True)
+    return {"job": _registry_call(registry_.load, **options), **registry_.status()}
+
+
+@router.put("/models/split")
+async def update_model_split(
+    weight: float = Query(..., description="Fraksi traffic untuk candidate (0-1)"),
+    current_user: User = Depends(require_role("admin")),
+):
+    """
+    Ubah pembagian traffic antara primary dan candidate.
+    """
+    registry_ = get_model_registry()
+    _registry_call(registry_.set_weight, weight)
+    return registry_.status()
+
+
+@router.post("/models/promote")
+def promote_model(current_user: User = Depends(require_role("admin"))):
+    """
+    Jadikan candidate sebagai primary; primary lama dilepas.
+
+    (def biasa, bukan async: menunggu micro-batcher lama berhenti terjadi di
+    threadpool, bukan di event loop)
+    """
+    registry_ = get_model_registry()
+    _registry_call(registry_.promote)
+    return registry_.status()
+
+
+@router.delete("/models/candidate")
+def drop_candidate_model(current_user: User = Depends(require_role("admin"))):
+    """
+    Lepas candidate; seluruh traffic kembali ke primary.
+
+    (def biasa, bukan async: lihat promote_model)
+    """
+    registry_ = get_model_registry()
+    registry_.drop_candidate()
+    return registry_.status()
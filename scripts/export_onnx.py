@@ -0,0 +1,65 @@
+"""
+Export model .keras ke ONNX untuk backend ONNX Runtime.
+
+Usage:
+    python -m scripts.export_onnx
+    python -m scripts.export_onnx --model models/model_mobilenetv2_classifier.keras --opset 17
+
+Membutuhkan tf2onnx (pip install tf2onnx). Hasil disimpan di sebelah model
+asli, misalnya models/model_mobilenetv2_classifier.onnx.
+"""
+import argparse
+import os
+import sys
+
+from config.inference import MODEL_PATH
+from services.inference_backends import onnx_path
+from services.preprocessing import IMAGE_SIZE
+
+
+def export_onnx(model_path: str, opset: int = 17) -> str:
+    """
+    Konversi model Keras ke ONNX dengan dimensi batch dinamis.
+
+    Args:
+        model_path: Path model .keras
+        opset: Versi opset ONNX
+
+    Returns:
+        Path file .onnx yang dihasilkan
+    """
+    import tensorflow as tf
+    import tf2onnx
+
+    model = tf.keras.models.load_model(model_path)
+    input_signature = (
+        tf.TensorSpec((None, IMAGE_SIZE, IMAGE_SIZE, 3), tf.float32, name="input"),
+    )
+    # tf2onnx.convert.from_keras belum mendukung Keras 3; konversi lewat
+    # tf.function dengan signature yang sama
+    forward = tf.function(lambda x: model(x, training=False))
+
+    output_path = onnx_path(model_path)
+    tf2onnx.convert.from_function(
+        forward, input_signature=input_signature, opset=opset, output_path=output_path
+    )
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        print(f"❌ Model tidak ditemukan di {args.model}")
+        sys.exit(1)
+
+    output_path = export_onnx(args.model, args.opset)
+    size_mb = os.path.getsize(output_path) / (1024 * 1024)
+    print(f"✅ onnx: {output_path} ({size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
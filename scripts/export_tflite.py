@@ -0,0 +1,65 @@
+"""
+Export model .keras ke TFLite (float16 dan int8 dynamic-range).
+
+Usage:
+    python -m scripts.export_tflite
+    python -m scripts.export_tflite --model models/model_mobilenetv2_classifier.keras --variants fp16
+
+Hasil disimpan di sebelah model asli, misalnya:
+    models/model_mobilenetv2_classifier.fp16.tflite
+    models/model_mobilenetv2_classifier.int8.tflite
+"""
+import argparse
+import os
+import sys
+
+from config.inference import MODEL_PATH
+from services.inference_backends import TFLITE_VARIANTS, tflite_path
+
+
+def export_tflite(model_path: str, variant: str) -> str:
+    """
+    Konversi model Keras ke TFLite.
+
+    Args:
+        model_path: Path model .keras
+        variant: fp16 (bobot float16) atau int8 (dynamic-range quantization)
+
+    Returns:
+        Path file .tflite yang dihasilkan
+    """
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(model_path)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if variant == "fp16":
+        converter.target_spec.supported_types = [tf.float16]
+
+    output_path = tflite_path(model_path, variant)
+    with open(output_path, "wb") as f:
+        f.write(converter.convert())
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--variants", default=",".join(TFLITE_VARIANTS))
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        print(f"❌ Model tidak ditemukan di {args.model}")
+        sys.exit(1)
+
+    for variant in args.variants.split(","):
+        if variant not in TFLITE_VARIANTS:
+            print(f"❌ Varian tidak dikenal: {variant}")
+            sys.exit(1)
+        output_path = export_tflite(args.model, variant)
+        size_mb = os.path.getsize(output_path) / (1024 * 1024)
+        print(f"✅ {variant}: {output_path} ({size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Hapus gambar di store content-addressed (uploads/cas/) yang tidak dipakai
+produk marketplace mana pun, beserta thumbnail-nya.
+
+Gambar yang lebih baru dari masa tenggang tidak dihapus: gambar di-upload
+dulu, produknya baru dibuat di request berikutnya.
+
+Usage:
+    python -m scripts.gc_uploads --dry-run
+    python -m scripts.gc_uploads --grace-hours 48
+"""
+import argparse
+
+from config.database import SessionLocal
+from config.uploads import UPLOAD_GC_GRACE_HOURS
+from services.upload_store import UploadStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--grace-hours", type=float, default=UPLOAD_GC_GRACE_HOURS)
+    parser.add_argument("--dry-run", action="store_true", help="Hanya tampilkan file yang akan dihapus")
+    args = parser.parse_args()
+
+    store = UploadStore()
+    total = len(store.stored_files())
+    db = SessionLocal()
+    try:
+        orphans = store.collect_garbage(db, grace_seconds=args.grace_hours * 3600, dry_run=args.dry_run)
+    finally:
+        db.close()
+
+    for name in orphans:
+        print(f"  {name}")
+    action = "akan dihapus" if args.dry_run else "dihapus"
+    print(f"✅ {len(orphans)} dari {total} file {action}")
+
+
+if __name__ == "__main__":
+    main()
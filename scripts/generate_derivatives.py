@@ -0,0 +1,42 @@
+"""
+Buat thumbnail dan salinan 224 px untuk gambar upload yang belum punya turunan.
+
+Usage:
+    python -m scripts.generate_derivatives
+    python -m scripts.generate_derivatives --force
+"""
+import argparse
+
+from config.uploads import UPLOADS_DIRECTORY
+from services.image_derivatives import derivative_urls, generate_derivatives
+from services.upload_store import UploadStore
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--force", action="store_true", help="Buat ulang turunan yang sudah ada")
+    args = parser.parse_args()
+
+    # file lama (nama uuid) di root uploads/ dan file di store content-addressed
+    names = [
+        path.name for path in sorted(UPLOADS_DIRECTORY.iterdir())
+        if path.is_file() and path.suffix.lower() in IMAGE_SUFFIXES
+    ] + UploadStore().stored_files()
+
+    created = skipped = failed = 0
+    for name in names:
+        if not args.force and derivative_urls(name) is not None:
+            skipped += 1
+            continue
+        if generate_derivatives(name) is None:
+            failed += 1
+        else:
+            created += 1
+
+    print(f"✅ dibuat: {created}, dilewati: {skipped}, gagal: {failed}")
+
+
+if __name__ == "__main__":
+    main()
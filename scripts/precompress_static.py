@@ -0,0 +1,62 @@
+"""
+Buat varian .gz (dan .br jika paket ``brotli`` terpasang) untuk CSS/JS/HTML
+di views/, agar disajikan tanpa kompresi per request.
+
+Varian hanya disimpan jika lebih kecil dari aslinya. Jalankan ulang setiap
+kali file di views/ berubah (varian yang lebih tua dari aslinya diabaikan
+server).
+
+Usage:
+    python -m scripts.precompress_static
+    python -m scripts.precompress_static --directory views
+"""
+import argparse
+import gzip
+import os
+from pathlib import Path
+
+from services.static_files import PRECOMPRESSIBLE_SUFFIXES
+
+try:
+    import brotli
+except ImportError:  # opsional
+    brotli = None
+
+VIEWS_DIRECTORY = Path(__file__).resolve().parent.parent / "views"
+
+
+def compress(path: Path) -> list[str]:
+    """Tulis varian terkompresi untuk satu file; kembalikan ekstensi yang ditulis."""
+    data = path.read_bytes()
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=11)
+
+    written = []
+    for suffix, compressed in variants.items():
+        target = path.with_name(path.name + suffix)
+        if len(compressed) >= len(data):
+            target.unlink(missing_ok=True)
+            continue
+        temp = target.with_name(f".{target.name}.tmp")
+        temp.write_bytes(compressed)
+        os.replace(temp, target)
+        written.append(f"{suffix} {len(data)}→{len(compressed)}B")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--directory", default=str(VIEWS_DIRECTORY))
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("[INFO] paket brotli tidak terpasang, hanya membuat .gz")
+
+    for path in sorted(Path(args.directory).rglob("*")):
+        if path.is_file() and path.suffix.lower() in PRECOMPRESSIBLE_SUFFIXES:
+            print(f"{path}: {', '.join(compress(path)) or 'dilewati'}")
+
+
+if __name__ == "__main__":
+    main()
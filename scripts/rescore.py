@@ -0,0 +1,67 @@
+"""
+Score ulang gambar produk (uploads/) dan riwayat verifikasi dengan model baru.
+
+Job bisa dihentikan kapan saja (Ctrl+C) dan dilanjutkan: progres disimpan
+di file checkpoint setelah setiap chunk. Checkpoint milik versi model lain
+diabaikan.
+
+Usage:
+    python -m scripts.rescore --model models/model_v2.keras
+    python -m scripts.rescore --targets products --chunk-size 512 --workers 8
+    python -m scripts.rescore --dry-run
+    python -m scripts.rescore --restart   # abaikan checkpoint
+"""
+import argparse
+import time
+
+from config.inference import BACKEND, MODEL_PATH, MODEL_VERSION
+from services.rescoring import TARGETS, Checkpoint, RescoringJob
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--backend", default=BACKEND)
+    parser.add_argument("--model-version", default=MODEL_VERSION)
+    parser.add_argument("--targets", default=",".join(TARGETS), help="products, verifications")
+    parser.add_argument("--chunk-size", type=int, default=256, help="baris per transaksi/checkpoint")
+    parser.add_argument("--workers", type=int, default=4, help="proses decode + preprocessing")
+    parser.add_argument("--checkpoint", default="rescore-checkpoint.json")
+    parser.add_argument("--restart", action="store_true", help="mulai dari awal")
+    parser.add_argument("--dry-run", action="store_true", help="tanpa menulis ke database")
+    args = parser.parse_args()
+
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    if unknown := set(targets) - set(TARGETS):
+        parser.error(f"target tidak dikenal: {', '.join(sorted(unknown))}")
+
+    from services.vegetable_classifier import VegetableClassifier
+
+    classifier = VegetableClassifier(
+        model_path=args.model, backend=args.backend, model_version=args.model_version
+    )
+    classifier.warmup()
+    print(f"[INFO] Model {classifier.model_version}")
+
+    job = RescoringJob(
+        classifier,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        checkpoint=Checkpoint(None if args.dry_run else args.checkpoint, classifier.model_version, args.restart),
+        dry_run=args.dry_run,
+    )
+    start = time.perf_counter()
+    try:
+        for target in targets:
+            stats = job.run(target)
+            print(
+                f"✅ {target}: di-score {stats['scored']}, gagal {stats['failed']}, "
+                f"tanpa gambar {stats['missing']}, di-flag {stats['flagged']}"
+            )
+    except KeyboardInterrupt:
+        print(f"\n⏸ Dihentikan; lanjutkan dengan perintah yang sama (checkpoint: {args.checkpoint})")
+    print(f"Selesai dalam {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
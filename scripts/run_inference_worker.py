@@ -0,0 +1,71 @@
+"""
+Jalankan pool worker inferensi terpisah (satu proses per alamat).
+
+Usage:
+    INFERENCE_SERVER_AUTHKEY=rahasia python -m scripts.run_inference_worker --address /tmp/inference.sock
+    INFERENCE_SERVER_AUTHKEY=rahasia python -m scripts.run_inference_worker --address 127.0.0.1:7070,127.0.0.1:7071
+
+API worker (uvicorn) dijalankan dengan INFERENCE_SERVER_ADDRESS dan
+INFERENCE_SERVER_AUTHKEY yang sama; setiap API worker memilih satu alamat
+berdasarkan PID-nya.
+"""
+import argparse
+import multiprocessing
+import os
+
+from config.inference import INFERENCE_SERVER_ADDRESS
+
+
+def serve(address: str) -> None:
+    """Muat model, warm-up, lalu layani koneksi di ``address``."""
+    from services.inference_worker import InferenceWorker, parse_address
+
+    if isinstance(parse_address(address), str) and os.path.exists(address):
+        os.unlink(address)  # unix socket sisa proses sebelumnya
+
+    worker = InferenceWorker(address)
+    worker.classifier.warmup()
+    print(f"[INFO] Worker inferensi {worker.classifier.model_version} siap di {address}")
+    try:
+        worker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--address",
+        default=",".join(INFERENCE_SERVER_ADDRESS),
+        help="host:port atau path unix socket, dipisah koma untuk beberapa proses",
+    )
+    args = parser.parse_args()
+
+    addresses = [a.strip() for a in args.address.split(",") if a.strip()]
+    if not addresses:
+        parser.error("--address atau INFERENCE_SERVER_ADDRESS wajib diisi")
+
+    if len(addresses) == 1:
+        serve(addresses[0])
+        return
+
+    # spawn: setiap proses memuat TensorFlow sendiri, bukan hasil fork
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=serve, args=(address,), name=f"inference-worker-{i}")
+        for i, address in enumerate(addresses)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
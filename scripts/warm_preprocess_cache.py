@@ -0,0 +1,87 @@
+"""
+Isi cache preprocessing (PREPROCESS_CACHE_DIR) dari gambar di uploads/,
+agar re-scoring dengan model baru hanya membayar biaya inferensi.
+
+Tidak memuat model: hanya decode + preprocessing, dijalankan paralel di
+thread (cv2 melepas GIL).
+
+Usage:
+    PREPROCESS_CACHE_DIR=cache/preprocess python -m scripts.warm_preprocess_cache
+    python -m scripts.warm_preprocess_cache --cache-dir cache/preprocess --workers 8 --max-gb 4
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from config.inference import PREPROCESS_CACHE_DIR, PREPROCESS_CACHE_MAX_BYTES
+from config.uploads import UPLOADS_DIRECTORY
+from services.image_decode import decode_image
+from services.preprocess_cache import PreprocessCache
+from services.preprocessing import preprocess_image
+from services.upload_store import UploadStore
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+def upload_images(uploads_directory: Path) -> list[Path]:
+    """Gambar upload lama (root uploads/) dan gambar di store content-addressed."""
+    legacy = [
+        path for path in sorted(uploads_directory.iterdir())
+        if path.is_file() and path.suffix.lower() in IMAGE_SUFFIXES
+    ]
+    return legacy + [uploads_directory / name for name in UploadStore(uploads_directory).stored_files()]
+
+
+def compute(data: np.ndarray) -> np.ndarray:
+    image = decode_image(data)
+    if image is None:
+        raise ValueError("bukan gambar yang valid")
+    return preprocess_image(image)
+
+
+def warm(cache: PreprocessCache, path: Path) -> str:
+    """Satu gambar → "cached", "created", atau "failed"."""
+    try:
+        data = np.fromfile(path, dtype=np.uint8)
+        key = cache.make_key(data)
+        if cache.path(key).exists():
+            return "cached"
+        cache.put(key, compute(data))
+        return "created"
+    except Exception as e:
+        print(f"[WARN] {path.name}: {e}")
+        return "failed"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cache-dir", default=PREPROCESS_CACHE_DIR)
+    parser.add_argument("--uploads", default=str(UPLOADS_DIRECTORY))
+    parser.add_argument("--max-gb", type=float, default=PREPROCESS_CACHE_MAX_BYTES / 1024 ** 3)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    if not args.cache_dir:
+        parser.error("--cache-dir atau PREPROCESS_CACHE_DIR wajib diisi")
+
+    cache = PreprocessCache(args.cache_dir, max_bytes=int(args.max_gb * 1024 ** 3))
+    paths = upload_images(Path(args.uploads))
+    counts = {"created": 0, "cached": 0, "failed": 0}
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for done, status in enumerate(pool.map(lambda path: warm(cache, path), paths), start=1):
+            counts[status] += 1
+            if done % 100 == 0 or done == len(paths):
+                print(f"{done}/{len(paths)} gambar ({time.perf_counter() - start:.1f}s)", flush=True)
+
+    print(
+        f"✅ dibuat: {counts['created']}, sudah ada: {counts['cached']}, gagal: {counts['failed']}, "
+        f"ukuran cache: {cache.size_bytes / 1024 ** 2:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
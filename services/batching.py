@@ -0,0 +1,241 @@
+"""
+Micro-batching untuk inferensi: menggabungkan request yang datang bersamaan
+menjadi satu forward pass model.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any
+
+import numpy as np
+
+from config.inference import MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_WAIT_MS
+from services.metrics import registry
+from services.vegetable_classifier import VegetableClassifier, get_classifier
+
+_STOP = object()
+
+QUEUE_DEPTH = registry.gauge(
+    "inference_queue_depth", "Jumlah gambar yang menunggu di antrean micro-batch"
+)
+BATCH_SIZE = registry.histogram(
+    "inference_batch_size",
+    (1, 2, 4, 8, 16, 32, 64),
+    "Ukuran batch per forward pass micro-batcher",
+)
+QUEUE_WAIT = registry.histogram(
+    "inference_queue_wait_seconds",
+    (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    "Waktu tunggu gambar di antrean sebelum forward pass",
+)
+
+
+class _PendingItem:
+    __slots__ = ("tensor", "future", "enqueued_at")
+
+    def __init__(self, tensor: np.ndarray):
+        self.tensor = tensor
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class MicroBatcher:
+    """
+    Request coalescer untuk VegetableClassifier.
+
+    Setiap pemanggil mengirim tensor hasil preprocess dan menerima Future.
+    Thread worker mengumpulkan antrean sampai ``max_batch`` item atau sampai
+    ``max_wait_ms`` sejak item pertama, lalu menjalankan satu forward pass dan
+    mengisi hasil masing-masing Future.
+    """
+
+    def __init__(
+        self,
+        classifier: VegetableClassifier,
+        max_batch: int = MICRO_BATCH_MAX_SIZE,
+        max_wait_ms: float = MICRO_BATCH_MAX_WAIT_MS,
+    ):
+        self.classifier = classifier
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self) -> None:
+        """Jalankan thread worker (idempotent; tidak berlaku setelah stop)."""
+        with self._lock:
+            self._start_locked()
+
+    def _start_locked(self) -> None:
+        if not self._closed and (self._thread is None or not self._thread.is_alive()):
+            self._thread = threading.Thread(
+                target=self._run, name="inference-micro-batcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Hentikan worker setelah antrean yang ada selesai diproses. Batcher
+        yang sudah dihentikan tidak pernah membuat thread baru: submit
+        berikutnya dijalankan langsung tanpa micro-batch.
+        """
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+            self._thread = None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    def submit(self, tensor: np.ndarray) -> Future:
+        """
+        Masukkan satu tensor (224, 224, 3) ke antrean.
+
+        Returns:
+            Future yang berisi array probabilitas (2,)
+        """
+        item = _PendingItem(tensor)
+        with self._lock:
+            # put di dalam lock: item selalu masuk sebelum _STOP dari stop()
+            if not self._closed:
+                self._start_locked()
+                self._queue.put(item)
+                QUEUE_DEPTH.set(self._queue.qsize())
+                return item.future
+
+        # batcher sudah dihentikan (misalnya model di-hot-swap)
+        try:
+            _resolve(item.future, self.classifier.predict_tensor(np.expand_dims(tensor, axis=0))[0])
+        except Exception as e:
+            _resolve(item.future, exception=e)
+        return item.future
+
+    def predict_image(self, image: np.ndarray) -> dict[str, Any]:
+        """Setara ``VegetableClassifier.predict_image`` tetapi lewat micro-batch."""
+        if self._closed:
+            return self.classifier.predict_image(image)
+        tensor = self.classifier.preprocess_image(image)
+        probabilities = self.submit(tensor).result()
+        return self.classifier.format_result(probabilities)
+
+    def predict_bytes(self, data: bytes | bytearray | memoryview) -> dict[str, Any]:
+        """Setara ``VegetableClassifier.predict_bytes`` tetapi lewat micro-batch."""
+        return self.predict_image(self.classifier.decode_image(data))
+
+    def predict(self, image_path: str) -> dict[str, Any]:
+        """Setara ``VegetableClassifier.predict`` tetapi lewat micro-batch."""
+        return self.predict_image(self.classifier.load_image(image_path))
+
+    def _collect(self, first: _PendingItem) -> tuple[list[_PendingItem], bool]:
+        """Kumpulkan item sampai batch penuh atau deadline terlewati."""
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    item = self._queue.get(timeout=timeout)
+                else:
+                    # deadline lewat: ambil yang sudah mengantre tanpa menunggu
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def _flush(self, batch: list[_PendingItem]) -> None:
+        now = time.monotonic()
+        QUEUE_DEPTH.set(self._queue.qsize())
+        BATCH_SIZE.observe(len(batch))
+        for item in batch:
+            QUEUE_WAIT.observe(now - item.enqueued_at)
+
+        try:
+            probabilities = self.classifier.predict_tensor(
+                np.stack([item.tensor for item in batch])
+            )
+            # jumlah hasil harus sama dengan jumlah request: tidak ada future yang tertinggal
+            results = list(zip(batch, probabilities, strict=True))
+        except Exception as e:
+            for item in batch:
+                _resolve(item.future, exception=e)
+            return
+
+        for item, probs in results:
+            _resolve(item.future, result=probs)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stopping = self._collect(first)
+            self._flush(batch)
+
+
+def _resolve(future: Future, result: Any = None, exception: Exception | None = None) -> None:
+    """Isi Future; abaikan jika pemanggil sudah membatalkannya."""
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+# batas tunggu antrean batcher lama saat model diganti (hot swap)
+RETIRE_TIMEOUT_SECONDS = 5.0
+
+# global batcher instance per classifier (lazy loading); model yang berbeda
+# (A/B, hot swap) tidak pernah digabung dalam satu batch
+_batchers: dict[int, MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(classifier: VegetableClassifier | None = None) -> MicroBatcher | VegetableClassifier:
+    """
+    Get atau inisialisasi micro-batcher untuk classifier (default: global).
+
+    Classifier yang sudah diganti (retire_batcher) dikembalikan apa adanya:
+    request yang memilihnya tepat sebelum swap diproses tanpa micro-batch
+    dan tidak membuat thread batcher baru.
+    """
+    classifier = classifier or get_classifier()
+    batcher = _batchers.get(id(classifier))
+    if batcher is not None and batcher.classifier is classifier:
+        return batcher
+
+    with _batchers_lock:
+        if getattr(classifier, "retired", False):
+            return classifier
+        batcher = _batchers.get(id(classifier))
+        if batcher is None or batcher.classifier is not classifier:
+            batcher = MicroBatcher(classifier)
+            _batchers[id(classifier)] = batcher
+    return batcher
+
+
+def retire_batcher(classifier: VegetableClassifier, timeout: float | None = RETIRE_TIMEOUT_SECONDS) -> None:
+    """
+    Hentikan micro-batcher milik classifier yang sudah diganti.
+
+    Args:
+        classifier: Classifier lama
+        timeout: Batas tunggu antrean lama selesai diproses (detik)
+    """
+    with _batchers_lock:
+        classifier.retired = True
+        batcher = _batchers.pop(id(classifier), None)
+    if batcher is not None and batcher.classifier is classifier:
+        batcher.stop(timeout)
@@ -0,0 +1,111 @@
+"""
+Decode gambar dengan downscaling saat decode untuk foto kamera besar.
+
+Foto ponsel 12+ MP di-decode penuh oleh ``cv2.imdecode`` lalu langsung
+di-resize ke 224 × 224, sehingga hampir semua piksel yang di-decode dibuang.
+Untuk JPEG, libjpeg bisa men-decode langsung pada skala 1/2, 1/4, atau 1/8
+(``cv2.IMREAD_REDUCED_COLOR_*``) dengan melewati sebagian besar IDCT. Skala
+dipilih dari dimensi di header SOF sehingga sisi terpendek hasil decode tetap
+>= ``target`` piksel. Format lain (PNG, BMP) tetap di-decode penuh.
+"""
+
+import cv2
+import numpy as np
+
+from config.inference import REDUCED_DECODE_ENABLED
+from services.preprocessing import IMAGE_SIZE
+
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# Marker SOF (baseline, progressive, lossless, arithmetic); bukan DHT/JPG/DAC
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def jpeg_size(data: bytes | bytearray | memoryview) -> tuple[int, int] | None:
+    """
+    Baca (lebar, tinggi) dari header JPEG tanpa men-decode gambar.
+
+    Returns:
+        (width, height), atau None jika bukan JPEG atau header tidak lengkap
+    """
+    data = memoryview(data)
+    if len(data) < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:  # padding
+            offset += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:  # marker tanpa panjang
+            offset += 2
+            continue
+
+        length = (data[offset + 2] << 8) | data[offset + 3]
+        if marker in _SOF_MARKERS:
+            if offset + 9 > len(data):
+                return None
+            height = (data[offset + 5] << 8) | data[offset + 6]
+            width = (data[offset + 7] << 8) | data[offset + 8]
+            return width, height
+        if marker == 0xDA:  # start of scan: SOF seharusnya sudah lewat
+            return None
+        offset += 2 + length
+    return None
+
+
+def reduced_decode_flag(width: int, height: int, target: int = IMAGE_SIZE) -> int:
+    """
+    Flag imdecode dengan skala terkecil yang sisi terpendeknya masih >= target.
+
+    libjpeg membulatkan ke atas (ceil), misalnya 3000 / 8 → 375.
+    """
+    shortest = min(width, height)
+    for factor, flag in _REDUCED_FLAGS:
+        if -(-shortest // factor) >= target:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def decode_image(
+    data: bytes | bytearray | memoryview,
+    target: int = IMAGE_SIZE,
+    reduced: bool = REDUCED_DECODE_ENABLED,
+) -> np.ndarray | None:
+    """
+    Decode gambar dari memori ke BGR; JPEG besar di-decode pada skala kecil.
+
+    Args:
+        data: Isi file gambar (tidak disalin)
+        target: Sisi terpendek minimal hasil decode
+        reduced: Aktifkan downscaling saat decode
+
+    Returns:
+        Gambar BGR, atau None jika data bukan gambar yang valid
+    """
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    if not buffer.size:
+        return None
+
+    flag = cv2.IMREAD_COLOR
+    if reduced:
+        size = jpeg_size(data)
+        if size is not None:
+            flag = reduced_decode_flag(*size, target=target)
+    return cv2.imdecode(buffer, flag)
+
+
+def read_image(path: str, target: int = IMAGE_SIZE, reduced: bool = REDUCED_DECODE_ENABLED) -> np.ndarray | None:
+    """Sama dengan decode_image, untuk file di disk (pengganti cv2.imread)."""
+    try:
+        data = np.fromfile(path, dtype=np.uint8)
+    except OSError:
+        return None
+    return decode_image(data, target=target, reduced=reduced)
@@ -0,0 +1,165 @@
+"""
+Turunan gambar produk: thumbnail WebP/JPEG dan salinan 224 px untuk model.
+
+List produk di aplikasi mobile cukup memakai thumbnail, bukan file asli
+berukuran beberapa MB. Turunan dibuat di background setelah upload dan
+disimpan di ``uploads/derivatives/<nama gambar>/``:
+
+- ``w<lebar>.webp`` dan ``w<lebar>.jpg`` untuk setiap THUMBNAIL_WIDTHS
+- ``model224.png``: 224 × 224 (resize yang sama dengan preprocessing),
+  sehingga preprocessing ulang tidak perlu men-decode file asli
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from config.uploads import (
+    THUMBNAIL_JPEG_QUALITY,
+    THUMBNAIL_WEBP_QUALITY,
+    THUMBNAIL_WIDTHS,
+    UPLOADS_DIRECTORY,
+)
+
+DERIVATIVES_DIRNAME = "derivatives"
+MODEL_COPY_NAME = "model224.png"
+
+# Status "turunan sudah lengkap" per gambar, agar list produk tidak memanggil
+# exists() ke volume upload untuk setiap produk di setiap request. Turunan
+# yang sudah lengkap tidak berubah lagi, jadi hasil positif disimpan sampai
+# dibuang LRU; hasil negatif dicek ulang setelah READY_RECHECK_SECONDS.
+READY_CACHE_MAX_ENTRIES = 10_000
+READY_RECHECK_SECONDS = 30.0
+_ready: OrderedDict[tuple[str, str], float] = OrderedDict()
+_ready_lock = threading.Lock()
+
+
+def derivative_directory(image_name: str, uploads_directory: Path = UPLOADS_DIRECTORY) -> Path:
+    """Folder turunan untuk satu gambar upload."""
+    return Path(uploads_directory) / DERIVATIVES_DIRNAME / image_name
+
+
+def _remember_ready(key: tuple[str, str], ready: bool) -> None:
+    recheck_at = math.inf if ready else time.monotonic() + READY_RECHECK_SECONDS
+    with _ready_lock:
+        _ready[key] = recheck_at
+        _ready.move_to_end(key)
+        while len(_ready) > READY_CACHE_MAX_ENTRIES:
+            _ready.popitem(last=False)
+
+
+def derivatives_ready(image_name: str, uploads_directory: Path = UPLOADS_DIRECTORY) -> bool:
+    """Apakah turunan gambar sudah lengkap (``model224.png`` ada); di-memo."""
+    key = (str(uploads_directory), image_name)
+    with _ready_lock:
+        recheck_at = _ready.get(key)
+        if recheck_at is not None and recheck_at > time.monotonic():
+            _ready.move_to_end(key)
+            return recheck_at == math.inf
+    ready = (derivative_directory(image_name, uploads_directory) / MODEL_COPY_NAME).exists()
+    _remember_ready(key, ready)
+    return ready
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # nama sementara unik per proses/thread: dua background task untuk gambar
+    # yang sama (upload ulang, beberapa worker) tidak saling menimpa
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def generate_derivatives(
+    image_name: str,
+    uploads_directory: Path = UPLOADS_DIRECTORY,
+    widths: list[int] = THUMBNAIL_WIDTHS,
+) -> dict | None:
+    """
+    Buat semua turunan untuk satu gambar upload.
+
+    Thumbnail tidak pernah lebih lebar dari gambar asli. ``model224.png``
+    ditulis terakhir dan menandai bahwa turunan sudah lengkap.
+
+    Args:
+        image_name: Nama file di folder upload (misal "abc.jpg")
+        uploads_directory: Folder upload
+        widths: Lebar thumbnail dalam px
+
+    Returns:
+        URL turunan (lihat derivative_urls), atau None jika gambar tidak
+        bisa dibaca atau di-encode
+    """
+    import cv2
+
+    from services.image_decode import read_image
+    from services.preprocessing import IMAGE_SIZE
+
+    source = Path(uploads_directory) / image_name
+    # decode pada skala terkecil yang masih cukup untuk thumbnail terlebar
+    image = read_image(str(source), target=max(widths + [IMAGE_SIZE]))
+    if image is None:
+        print(f"[WARN] Turunan tidak dibuat, gambar tidak bisa dibaca: {source}")
+        return None
+
+    directory = derivative_directory(image_name, uploads_directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    height, width = image.shape[:2]
+    for target_width in widths:
+        if target_width < width:
+            target_height = max(1, round(height * target_width / width))
+            thumbnail = cv2.resize(image, (target_width, target_height), interpolation=cv2.INTER_AREA)
+        else:
+            thumbnail = image
+        webp_ok, webp = cv2.imencode(".webp", thumbnail, [cv2.IMWRITE_WEBP_QUALITY, THUMBNAIL_WEBP_QUALITY])
+        jpeg_ok, jpeg = cv2.imencode(
+            ".jpg",
+            thumbnail,
+            [cv2.IMWRITE_JPEG_QUALITY, THUMBNAIL_JPEG_QUALITY, cv2.IMWRITE_JPEG_PROGRESSIVE, 1],
+        )
+        if not (webp_ok and jpeg_ok):
+            # model224.png tidak ditulis: turunan tetap dianggap belum ada
+            print(f"[WARN] Thumbnail {target_width}px tidak bisa di-encode: {source}")
+            return None
+        _write_atomic(directory / f"w{target_width}.webp", webp.tobytes())
+        _write_atomic(directory / f"w{target_width}.jpg", jpeg.tobytes())
+
+    ok, model_copy = cv2.imencode(".png", cv2.resize(image, (IMAGE_SIZE, IMAGE_SIZE)))
+    if not ok:
+        print(f"[WARN] Salinan {MODEL_COPY_NAME} tidak bisa di-encode: {source}")
+        return None
+    _write_atomic(directory / MODEL_COPY_NAME, model_copy.tobytes())
+    _remember_ready((str(uploads_directory), image_name), True)
+
+    return derivative_urls(image_name, uploads_directory, widths)
+
+
+def derivative_urls(
+    image_name: str | None,
+    uploads_directory: Path = UPLOADS_DIRECTORY,
+    widths: list[int] = THUMBNAIL_WIDTHS,
+) -> dict | None:
+    """
+    Path turunan relatif terhadap /uploads, atau None jika belum dibuat.
+
+    Returns:
+        {"thumbnails": {"320": {"webp": ..., "jpeg": ...}, ...}, "model": ...}
+    """
+    if not image_name or not derivatives_ready(image_name, uploads_directory):
+        return None
+
+    prefix = f"{DERIVATIVES_DIRNAME}/{image_name}"
+    return {
+        "thumbnails": {
+            str(w): {"webp": f"{prefix}/w{w}.webp", "jpeg": f"{prefix}/w{w}.jpg"} for w in widths
+        },
+        "model": f"{prefix}/{MODEL_COPY_NAME}",
+    }
@@ -0,0 +1,230 @@
+"""
+Backend inferensi untuk VegetableClassifier.
+
+Setiap backend menerima batch float32 (N, 224, 224, 3) hasil preprocessing
+dan mengembalikan probabilitas softmax (N, 2). Backend dipilih lewat
+INFERENCE_BACKEND:
+
+- ``keras``: model .keras asli lewat fungsi serving tf.function (opsional XLA)
+- ``tflite-fp16``: TFLite dengan bobot float16
+- ``tflite-int8``: TFLite dynamic-range quantization (bobot int8)
+- ``onnx``: graph yang sama lewat ONNX Runtime (CPU)
+"""
+
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import numpy as np
+
+from config.inference import BATCH_BUCKETS, ONNX_INTER_OP_THREADS, ONNX_INTRA_OP_THREADS, XLA_ENABLED
+from services.preprocessing import IMAGE_SIZE
+from services.tf_runtime import configure_runtime, configure_tensorflow
+
+TFLITE_VARIANTS = ("fp16", "int8")
+
+
+class InferenceBackend(ABC):
+    """Interface backend inferensi."""
+
+    name = "base"
+
+    @abstractmethod
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Jalankan forward pass.
+
+        Args:
+            batch: Array float32 (N, 224, 224, 3)
+
+        Returns:
+            Array probabilitas (N, 2)
+        """
+
+
+class KerasBackend(InferenceBackend):
+    """
+    Model .keras asli lewat fungsi serving tf.function.
+
+    ``model.predict`` membangun pipeline tf.data dan callback setiap
+    pemanggilan; untuk batch kecil overhead-nya jauh lebih besar dari forward
+    pass itu sendiri. Di sini model dipanggil langsung lewat tf.function
+    dengan input_signature tetap (N, 224, 224, 3), sehingga graph hanya
+    di-trace sekali. Batch di-pad ke bucket (lihat INFERENCE_BATCH_BUCKETS)
+    agar jumlah bentuk input terbatas, terutama saat XLA aktif (XLA
+    mengkompilasi ulang untuk setiap bentuk baru).
+    """
+
+    name = "keras"
+
+    def __init__(self, model_path: str, buckets: list[int] = BATCH_BUCKETS, xla: bool = XLA_ENABLED):
+        # thread/oneDNN/allocator harus diatur sebelum TensorFlow di-import
+        configure_runtime()
+        import tensorflow as tf
+
+        configure_tensorflow(tf)
+        self.model = tf.keras.models.load_model(model_path)
+        self.buckets = sorted(set(buckets)) or [1]
+        self.xla = xla
+        self._serve = tf.function(
+            lambda images: self.model(images, training=False),
+            input_signature=[tf.TensorSpec((None, IMAGE_SIZE, IMAGE_SIZE, 3), tf.float32)],
+            jit_compile=xla,
+        )
+
+    def bucket_size(self, batch_size: int) -> int:
+        """Bucket terkecil yang memuat batch_size (maks. bucket terbesar)."""
+        return next((bucket for bucket in self.buckets if bucket >= batch_size), self.buckets[-1])
+
+    def warmup(self) -> None:
+        """Trace (dan kompilasi XLA) fungsi serving untuk setiap bucket."""
+        for bucket in self.buckets if self.xla else self.buckets[:1]:
+            self.predict(np.zeros((bucket, IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.float32))
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        outputs = []
+        for start in range(0, len(batch), self.buckets[-1]):
+            chunk = batch[start : start + self.buckets[-1]]
+            bucket = self.bucket_size(len(chunk))
+            if bucket != len(chunk):
+                padded = np.zeros((bucket, *chunk.shape[1:]), dtype=np.float32)
+                padded[: len(chunk)] = chunk
+                chunk = padded
+            outputs.append(self._serve(chunk).numpy()[: len(batch) - start])
+        return np.concatenate(outputs) if len(outputs) > 1 else outputs[0]
+
+
+def _load_tflite_interpreter(model_path: str, num_threads: int | None):
+    """Pakai LiteRT (ai_edge_litert) jika ter-install, fallback ke tf.lite."""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        configure_runtime()
+        import tensorflow as tf
+
+        Interpreter = tf.lite.Interpreter
+    return Interpreter(model_path=model_path, num_threads=num_threads)
+
+
+class TFLiteBackend(InferenceBackend):
+    """
+    Model TFLite (float16 atau int8 dynamic-range).
+
+    Interpreter TFLite tidak thread-safe, jadi pemanggilan diserialisasi dengan
+    lock. Tensor input di-resize hanya ketika ukuran batch berubah.
+    """
+
+    def __init__(self, model_path: str, num_threads: int | None = None):
+        self.name = f"tflite-{_tflite_variant(model_path)}"
+        self.interpreter = _load_tflite_interpreter(model_path, num_threads)
+        self._input_index = self.interpreter.get_input_details()[0]["index"]
+        self._output_index = self.interpreter.get_output_details()[0]["index"]
+        self._batch_size = 0
+        self._lock = threading.Lock()
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        with self._lock:
+            if len(batch) != self._batch_size:
+                self.interpreter.resize_tensor_input(
+                    self._input_index, list(batch.shape)
+                )
+                self.interpreter.allocate_tensors()
+                self._batch_size = len(batch)
+            self.interpreter.set_tensor(self._input_index, batch)
+            self.interpreter.invoke()
+            return self.interpreter.get_tensor(self._output_index).copy()
+
+
+class OnnxBackend(InferenceBackend):
+    """
+    Model ONNX lewat ONNX Runtime (CPUExecutionProvider).
+
+    Jumlah thread intra-op/inter-op diatur eksplisit agar beberapa worker
+    uvicorn di satu mesin tidak saling berebut core.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path: str, intra_op_threads: int = 1, inter_op_threads: int = 1):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError(
+                "Backend onnx membutuhkan onnxruntime: pip install onnxruntime"
+            ) from e
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = ort.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        self._input_name = self.session.get_inputs()[0].name
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        return self.session.run(None, {self._input_name: batch})[0]
+
+
+def _tflite_variant(model_path: str) -> str:
+    """Ambil varian dari nama file, misal model.fp16.tflite → fp16."""
+    suffixes = Path(model_path).suffixes
+    return suffixes[-2].lstrip(".") if len(suffixes) >= 2 else "fp32"
+
+
+def tflite_path(model_path: str, variant: str) -> str:
+    """Path artefak TFLite hasil export untuk model .keras tertentu."""
+    path = Path(model_path)
+    return str(path.with_name(f"{path.stem}.{variant}.tflite"))
+
+
+def onnx_path(model_path: str) -> str:
+    """Path artefak ONNX hasil export untuk model .keras tertentu."""
+    return str(Path(model_path).with_suffix(".onnx"))
+
+
+def create_backend(name: str, model_path: str) -> InferenceBackend:
+    """
+    Buat backend berdasarkan nama.
+
+    Args:
+        name: keras, tflite-fp16, tflite-int8, atau onnx
+        model_path: Path model .keras (artefak TFLite/ONNX dicari di
+            sebelahnya) atau langsung path file .tflite / .onnx
+
+    Raises:
+        ValueError: Jika nama backend tidak dikenal
+        FileNotFoundError: Jika artefak backend belum di-export
+    """
+    if name == "keras":
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model tidak ditemukan di {model_path}")
+        return KerasBackend(model_path)
+
+    if name.startswith("tflite-") and name[len("tflite-"):] in TFLITE_VARIANTS:
+        if not model_path.endswith(".tflite"):
+            model_path = tflite_path(model_path, name[len("tflite-"):])
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"Model TFLite tidak ditemukan di {model_path}. "
+                "Jalankan: python -m scripts.export_tflite"
+            )
+        return TFLiteBackend(model_path, configure_runtime()["intra_op_threads"])
+
+    if name == "onnx":
+        if not model_path.endswith(".onnx"):
+            model_path = onnx_path(model_path)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"Model ONNX tidak ditemukan di {model_path}. "
+                "Jalankan: python -m scripts.export_onnx"
+            )
+        return OnnxBackend(model_path, ONNX_INTRA_OP_THREADS, ONNX_INTER_OP_THREADS)
+
+    raise ValueError(f"Backend inferensi tidak dikenal: {name}")
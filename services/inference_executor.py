@@ -0,0 +1,108 @@
+"""
+Executor terbatas untuk menjalankan inferensi di luar event loop.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from config.inference import EXECUTOR_MAX_QUEUE, EXECUTOR_MAX_WORKERS
+from services.metrics import registry
+from services.timing import record
+
+IN_FLIGHT = registry.gauge(
+    "inference_executor_in_flight", "Jumlah job inferensi yang berjalan atau mengantre"
+)
+REJECTED = registry.counter(
+    "inference_executor_rejected_total", "Jumlah job yang ditolak karena antrean penuh"
+)
+
+
+def _timed_job(submitted_at: float, fn: Callable[..., Any], *args: Any) -> Any:
+    record("queue_wait", time.perf_counter() - submitted_at)
+    return fn(*args)
+
+
+class ExecutorSaturated(Exception):
+    """Antrean executor inferensi penuh."""
+
+
+class InferenceExecutor:
+    """
+    Thread pool dengan kapasitas tetap (``max_workers`` berjalan +
+    ``max_queue`` menunggu). Job di luar kapasitas langsung ditolak dengan
+    ExecutorSaturated sehingga route bisa membalas 503 alih-alih menumpuk
+    request di memori.
+
+    Thread (bukan process) dipakai karena TensorFlow dan cv2 melepas GIL
+    selama komputasi berat.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = EXECUTOR_MAX_WORKERS,
+        max_queue: int = EXECUTOR_MAX_QUEUE,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.capacity = self.max_workers + max(0, max_queue)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="inference"
+        )
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            IN_FLIGHT.set(self._in_flight)
+        self._slots.release()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Jalankan ``fn(*args)`` di thread pool dan tunggu hasilnya.
+
+        Raises:
+            ExecutorSaturated: Jika kapasitas executor sudah penuh
+        """
+        if not self._slots.acquire(blocking=False):
+            REJECTED.inc()
+            raise ExecutorSaturated("Antrean inferensi penuh")
+
+        with self._lock:
+            self._in_flight += 1
+            IN_FLIGHT.set(self._in_flight)
+
+        try:
+            # contextvars (timing request) ikut ke thread pool
+            context = contextvars.copy_context()
+            future = self._pool.submit(context.run, _timed_job, time.perf_counter(), fn, *args)
+        except Exception:
+            self._release()
+            raise
+
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+# global executor instance (lazy loading)
+_executor = None
+
+
+def get_executor() -> InferenceExecutor:
+    """Get atau inisialisasi executor inferensi."""
+    global _executor
+    if _executor is None:
+        _executor = InferenceExecutor()
+    return _executor
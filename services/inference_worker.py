@@ -0,0 +1,278 @@
+"""
+Worker inferensi terpisah dengan handoff tensor lewat shared memory.
+
+Tanpa worker ini, setiap worker uvicorn memuat bobot MobileNetV2 dan runtime
+TensorFlow sendiri. Dengan INFERENCE_SERVER_ADDRESS, hanya proses
+``InferenceWorker`` yang memegang model; API worker tetap decode dan
+preprocess gambar, lalu menulis tensor float32 (N, 224, 224, 3) langsung ke
+buffer ``multiprocessing.shared_memory`` miliknya. Lewat socket hanya
+dikirim pesan kecil (jumlah tensor dan probabilitas hasil), bukan array
+yang di-pickle.
+
+Setiap koneksi ("lane") punya buffer sendiri sehingga beberapa thread
+executor di API worker bisa mengirim batch bersamaan tanpa saling menimpa.
+"""
+
+import os
+import queue
+import threading
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Client, Connection, Listener
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from config.inference import (
+    EXECUTOR_MAX_WORKERS,
+    INFERENCE_SERVER_AUTHKEY,
+    INFERENCE_SERVER_SLOTS,
+    MICRO_BATCH_ENABLED,
+)
+from services.inference_backends import InferenceBackend
+from services.preprocessing import IMAGE_SIZE
+
+TENSOR_SHAPE = (IMAGE_SIZE, IMAGE_SIZE, 3)
+TENSOR_BYTES = int(np.prod(TENSOR_SHAPE)) * np.dtype(np.float32).itemsize
+
+
+class RemoteInferenceError(RuntimeError):
+    """Forward pass gagal di worker inferensi."""
+
+
+def parse_address(address: str) -> str | tuple[str, int]:
+    """
+    Ubah alamat konfigurasi menjadi alamat multiprocessing.connection.
+
+    ``host:port`` → tuple (AF_INET), selain itu path unix socket.
+    """
+    host, sep, port = address.rpartition(":")
+    if sep and host and port.isdigit() and "/" not in address:
+        return host, int(port)
+    return address
+
+
+def _require_authkey(authkey: str) -> bytes:
+    # pesan dikirim dengan pickle: koneksi tanpa autentikasi tidak diizinkan
+    if not authkey:
+        raise ValueError(
+            "INFERENCE_SERVER_AUTHKEY wajib diisi untuk worker inferensi terpisah"
+        )
+    return authkey.encode()
+
+
+def _tensor_view(shm: SharedMemory, slots: int) -> np.ndarray:
+    return np.ndarray((slots, *TENSOR_SHAPE), dtype=np.float32, buffer=shm.buf)
+
+
+def _attach_shared_memory(name: str, owner_pid: int) -> SharedMemory:
+    """
+    Buka buffer milik client. Buffer dilepas dari resource tracker proses
+    ini, karena yang bertanggung jawab meng-unlink adalah client.
+    """
+    shm = SharedMemory(name=name)
+    if owner_pid != os.getpid():
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class InferenceWorker:
+    """
+    Proses pemilik model: menerima koneksi dari API worker dan menjalankan
+    forward pass atas tensor yang ada di shared memory client.
+
+    Jika micro-batching aktif, tensor dari semua koneksi digabung dalam satu
+    forward pass (lihat services/batching.py).
+    """
+
+    def __init__(
+        self,
+        address: str,
+        authkey: str = INFERENCE_SERVER_AUTHKEY,
+        classifier=None,
+        micro_batch: bool = MICRO_BATCH_ENABLED,
+    ):
+        """
+        Args:
+            address: host:port atau path unix socket
+            authkey: Kunci autentikasi koneksi (harus sama dengan client)
+            classifier: Classifier yang dipakai (default: VegetableClassifier baru)
+            micro_batch: Gabungkan tensor dari banyak koneksi per forward pass
+        """
+        if classifier is None:
+            from services.vegetable_classifier import VegetableClassifier
+
+            classifier = VegetableClassifier()
+        self.classifier = classifier
+        self.batcher = None
+        if micro_batch:
+            from services.batching import MicroBatcher
+
+            self.batcher = MicroBatcher(classifier)
+
+        self.listener = Listener(parse_address(address), authkey=_require_authkey(authkey))
+        self._closed = threading.Event()
+
+    @property
+    def address(self):
+        return self.listener.address
+
+    def serve_forever(self) -> None:
+        """Terima koneksi sampai ``close()`` dipanggil; satu thread per koneksi."""
+        while not self._closed.is_set():
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                if self._closed.is_set():
+                    break
+                continue
+            except Exception as e:
+                # misalnya AuthenticationError: tolak koneksi, tetap melayani
+                print(f"[WARN] Koneksi worker inferensi ditolak: {e}")
+                continue
+            threading.Thread(
+                target=self._handle, args=(conn,), name="inference-worker-conn", daemon=True
+            ).start()
+
+    def close(self) -> None:
+        """Berhenti menerima koneksi baru."""
+        self._closed.set()
+        self.listener.close()
+        if self.batcher is not None:
+            self.batcher.stop()
+
+    def _predict(self, batch: np.ndarray) -> np.ndarray:
+        if self.batcher is None:
+            return np.asarray(self.classifier.predict_tensor(batch))
+        futures = [self.batcher.submit(tensor) for tensor in batch]
+        return np.stack([future.result() for future in futures])
+
+    def _handle(self, conn: Connection) -> None:
+        shm = None
+        try:
+            _, name, slots, owner_pid = conn.recv()
+            shm = _attach_shared_memory(name, owner_pid)
+            conn.send(("ok", self.classifier.model_version))
+
+            while True:
+                try:
+                    _, count = conn.recv()
+                except EOFError:
+                    break
+                view = _tensor_view(shm, slots)
+                try:
+                    conn.send(("ok", self._predict(view[:count])))
+                except Exception as e:
+                    conn.send(("error", str(e)))
+                finally:
+                    del view
+        except (EOFError, OSError):
+            pass
+        finally:
+            if shm is not None:
+                shm.close()
+            conn.close()
+
+
+class _Lane:
+    """Satu koneksi ke worker + buffer shared memory untuk ``slots`` tensor."""
+
+    def __init__(self, address, authkey: bytes, slots: int):
+        self.slots = slots
+        self.shm = SharedMemory(create=True, size=slots * TENSOR_BYTES)
+        self.tensors = _tensor_view(self.shm, slots)
+        try:
+            self.conn = Client(address, authkey=authkey)
+            self.conn.send(("attach", self.shm.name, slots, os.getpid()))
+            _, self.model_version = self.conn.recv()
+        except Exception:
+            self.close()
+            raise
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        self.tensors[: len(batch)] = batch
+        self.conn.send(("predict", len(batch)))
+        status, payload = self.conn.recv()
+        if status != "ok":
+            raise RemoteInferenceError(payload)
+        return payload
+
+    def close(self) -> None:
+        conn = getattr(self, "conn", None)
+        if conn is not None:
+            conn.close()
+        del self.tensors
+        self.shm.close()
+        self.shm.unlink()
+
+
+class RemoteBackend(InferenceBackend):
+    """
+    Backend yang meneruskan forward pass ke ``InferenceWorker``.
+
+    Batch yang lebih besar dari ``slots`` dipecah menjadi beberapa kiriman.
+    Koneksi yang putus (worker restart) dibuka ulang sekali secara otomatis.
+    """
+
+    name = "remote"
+
+    def __init__(
+        self,
+        addresses: list[str],
+        authkey: str = INFERENCE_SERVER_AUTHKEY,
+        lanes: int = EXECUTOR_MAX_WORKERS,
+        slots: int = INFERENCE_SERVER_SLOTS,
+    ):
+        """
+        Args:
+            addresses: Alamat worker; tiap API worker memilih satu berdasarkan PID
+            authkey: Kunci autentikasi koneksi
+            lanes: Jumlah koneksi paralel (sebaiknya = INFERENCE_WORKERS)
+            slots: Jumlah tensor per buffer shared memory
+        """
+        if not addresses:
+            raise ValueError("Alamat worker inferensi kosong")
+        self.address = parse_address(addresses[os.getpid() % len(addresses)])
+        self._authkey = _require_authkey(authkey)
+        self.slots = max(1, slots)
+        self._lanes: queue.LifoQueue = queue.LifoQueue()
+        self._all_lanes: list[_Lane] = []
+
+        first = self._open_lane()
+        self.model_version = first.model_version
+        for lane in [first] + [self._open_lane() for _ in range(max(1, lanes) - 1)]:
+            self._lanes.put(lane)
+
+    def _open_lane(self) -> _Lane:
+        lane = _Lane(self.address, self._authkey, self.slots)
+        self._all_lanes.append(lane)
+        return lane
+
+    def _discard(self, lane: _Lane) -> None:
+        self._all_lanes.remove(lane)
+        lane.close()
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        lane = self._lanes.get()
+        try:
+            if lane is None:
+                lane = self._open_lane()
+            outputs = []
+            for start in range(0, len(batch), self.slots):
+                chunk = batch[start : start + self.slots]
+                try:
+                    outputs.append(lane.predict(chunk))
+                except (EOFError, OSError):
+                    # worker di-restart: buka koneksi baru lalu ulangi sekali
+                    self._discard(lane)
+                    lane = None
+                    lane = self._open_lane()
+                    outputs.append(lane.predict(chunk))
+        finally:
+            # None = lane dibuka ulang secara lazy oleh pemanggil berikutnya
+            self._lanes.put(lane)
+        return np.concatenate(outputs)
+
+    def close(self) -> None:
+        """Tutup semua koneksi dan hapus buffer shared memory."""
+        for lane in list(self._all_lanes):
+            self._discard(lane)
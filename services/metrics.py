@@ -0,0 +1,213 @@
+"""
+Metrik in-process sederhana (counter, gauge, histogram) untuk layanan inferensi.
+
+Diekspor sebagai JSON (/predict/metrics) dan format teks Prometheus (/metrics).
+"""
+
+import bisect
+import threading
+from typing import Any
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_suffix(labels: dict[str, str] | None, extra: str = "") -> str:
+    parts = [f'{key}="{_escape_label(value)}"' for key, value in (labels or {}).items()]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _bucket_label(bound: float) -> str:
+    return f'le="{_format_value(bound)}"'
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Counter monoton naik."""
+
+    prometheus_type = "counter"
+
+    def __init__(self, name: str, description: str = "", labels: dict[str, str] | None = None):
+        self.name = name
+        self.description = description
+        self.labels = labels or {}
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"type": "counter", "value": self._value}
+
+    def prometheus_lines(self) -> list[str]:
+        return [f"{self.name}{_label_suffix(self.labels)} {_format_value(self._value)}"]
+
+
+class Gauge:
+    """Nilai yang bisa naik turun (misal kedalaman antrean)."""
+
+    prometheus_type = "gauge"
+
+    def __init__(self, name: str, description: str = "", labels: dict[str, str] | None = None):
+        self.name = name
+        self.description = description
+        self.labels = labels or {}
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"type": "gauge", "value": self._value}
+
+    def prometheus_lines(self) -> list[str]:
+        return [f"{self.name}{_label_suffix(self.labels)} {_format_value(self._value)}"]
+
+
+class Histogram:
+    """Histogram dengan bucket kumulatif (gaya Prometheus)."""
+
+    prometheus_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        buckets: tuple[float, ...],
+        description: str = "",
+        labels: dict[str, str] | None = None,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels or {}
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def cumulative_counts(self) -> list[tuple[float, int]]:
+        """Pasangan (batas atas bucket, jumlah kumulatif), termasuk +Inf."""
+        with self._lock:
+            counts = list(self._counts)
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts, strict=True):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "type": "histogram",
+            "count": self._count,
+            "sum": self._sum,
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in self.cumulative_counts()
+            },
+        }
+
+    def prometheus_lines(self) -> list[str]:
+        lines = [
+            f"{self.name}_bucket{_label_suffix(self.labels, _bucket_label(bound))} {count}"
+            for bound, count in self.cumulative_counts()
+        ]
+        lines.append(f"{self.name}_sum{_label_suffix(self.labels)} {_format_value(self._sum)}")
+        lines.append(f"{self.name}_count{_label_suffix(self.labels)} {self._count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Kumpulan metrik yang bisa diekspor sekaligus."""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name: str, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = factory()
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, description: str = "", labels: dict[str, str] | None = None) -> Counter:
+        return self._get_or_create(
+            name + _label_suffix(labels), lambda: Counter(name, description, labels)
+        )
+
+    def gauge(self, name: str, description: str = "", labels: dict[str, str] | None = None) -> Gauge:
+        return self._get_or_create(
+            name + _label_suffix(labels), lambda: Gauge(name, description, labels)
+        )
+
+    def histogram(
+        self,
+        name: str,
+        buckets: tuple[float, ...],
+        description: str = "",
+        labels: dict[str, str] | None = None,
+    ) -> Histogram:
+        return self._get_or_create(
+            name + _label_suffix(labels), lambda: Histogram(name, buckets, description, labels)
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {name: metric.snapshot() for name, metric in sorted(metrics.items())}
+
+    def to_prometheus(self) -> str:
+        """Semua metrik dalam format teks Prometheus (text/plain; version=0.0.4)."""
+        with self._lock:
+            metrics = [metric for _, metric in sorted(self._metrics.items())]
+
+        lines = []
+        seen = set()
+        for metric in metrics:
+            # HELP/TYPE sekali per nama metrik; varian label mengikutinya
+            if metric.name not in seen:
+                seen.add(metric.name)
+                if metric.description:
+                    lines.append(f"# HELP {metric.name} {metric.description}")
+                lines.append(f"# TYPE {metric.name} {metric.prometheus_type}")
+            lines.extend(metric.prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+
+# registry global untuk seluruh proses
+registry = MetricsRegistry()
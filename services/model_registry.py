@@ -0,0 +1,226 @@
+"""
+Model registry: ganti model tanpa restart dan A/B antara dua versi.
+
+Artefak baru dimuat dan di-warm-up di thread background sementara model lama
+tetap melayani request. Setelah siap, classifier diganti secara atomik (satu
+assignment referensi); request yang sedang berjalan menyelesaikan
+inferensinya dengan model lama.
+
+Dua peran:
+
+- ``primary``: model utama; menggantikan yang lama setelah warm-up
+- ``candidate``: model kedua yang menerima fraksi ``weight`` dari traffic;
+  bisa di-promote menjadi primary atau dilepas
+
+Versi model yang dipakai ikut dikembalikan di response (``model_version``)
+dan disimpan di ``VerificationResult.model_version``.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+from config.inference import BACKEND, INFERENCE_SERVER_ADDRESS, MODEL_DIRECTORY
+
+ROLES = ("primary", "candidate")
+
+
+def _classifier_module():
+    """Import lazy agar modul ini tidak memuat stack ML saat startup."""
+    import services.vegetable_classifier as vegetable_classifier
+
+    return vegetable_classifier
+
+
+def _retire(classifier) -> None:
+    if classifier is None:
+        return
+    batching = sys.modules.get("services.batching")
+    if batching is not None:
+        batching.retire_batcher(classifier)
+    else:
+        classifier.retired = True
+
+
+def _describe(classifier) -> dict | None:
+    if classifier is None:
+        return None
+    return {
+        "model_version": classifier.model_version,
+        "model_path": classifier.model_path,
+        "backend": getattr(classifier.backend, "name", None),
+        "warmed_up": classifier.warmed_up,
+    }
+
+
+class ModelRegistry:
+    """
+    Muat, warm-up, dan pasang model di background.
+
+    Args:
+        model_directory: Folder yang boleh berisi artefak model
+        factory: Pembuat classifier (default VegetableClassifier)
+    """
+
+    def __init__(self, model_directory: str = MODEL_DIRECTORY, factory=None):
+        self.model_directory = Path(model_directory).resolve()
+        self.factory = factory
+        self._lock = threading.Lock()
+        self._job: dict | None = None
+        self._thread: threading.Thread | None = None
+
+    def resolve_path(self, model_path: str) -> str:
+        """
+        Raises:
+            ValueError: Jika path di luar model_directory
+            FileNotFoundError: Jika artefak tidak ada
+        """
+        path = Path(model_path)
+        if not path.is_absolute() and not path.exists():
+            path = self.model_directory / path
+        path = path.resolve()
+        if not path.is_relative_to(self.model_directory):
+            raise ValueError(f"Model harus berada di folder {self.model_directory}")
+        if not path.exists():
+            raise FileNotFoundError(f"Model tidak ditemukan di {path}")
+        return str(path)
+
+    def load(
+        self,
+        model_path: str,
+        role: str = "primary",
+        backend: str = BACKEND,
+        model_version: str | None = None,
+        weight: float = 0.0,
+        background: bool = True,
+    ) -> dict:
+        """
+        Muat artefak baru lalu pasang sebagai primary atau candidate.
+
+        Args:
+            model_path: Path artefak (relatif terhadap model_directory atau cwd)
+            role: primary atau candidate
+            backend: Backend inferensi (keras, tflite-fp16, onnx, ...)
+            model_version: Label versi (default dari nama file + hash)
+            weight: Fraksi traffic untuk candidate (0-1)
+            background: Jalankan di thread terpisah
+
+        Returns:
+            Status job load (lihat status()["job"])
+
+        Raises:
+            ValueError: Role/weight tidak valid atau path di luar folder model
+            FileNotFoundError: Artefak tidak ada
+            RuntimeError: Job load lain masih berjalan, atau model dikelola
+                worker inferensi terpisah
+        """
+        if INFERENCE_SERVER_ADDRESS:
+            raise RuntimeError("Model dikelola worker inferensi terpisah (INFERENCE_SERVER_ADDRESS)")
+        if role not in ROLES:
+            raise ValueError(f"role harus salah satu dari {ROLES}")
+        if not 0.0 <= weight <= 1.0:
+            raise ValueError("weight harus antara 0 dan 1")
+        path = self.resolve_path(model_path)
+
+        with self._lock:
+            if self._job is not None and self._job["status"] == "loading":
+                raise RuntimeError("Model lain sedang dimuat")
+            job = {
+                "status": "loading",
+                "role": role,
+                "model_path": path,
+                "backend": backend,
+                "model_version": None,
+                "error": None,
+                "duration_seconds": None,
+            }
+            self._job = job
+
+        args = (job, path, role, backend, model_version, weight)
+        if background:
+            self._thread = threading.Thread(target=self._load, args=args, name="model-registry-load", daemon=True)
+            self._thread.start()
+        else:
+            self._load(*args)
+        return dict(job)
+
+    def _load(self, job: dict, path: str, role: str, backend: str, model_version: str | None, weight: float) -> None:
+        module = _classifier_module()
+        factory = self.factory or module.VegetableClassifier
+        start = time.perf_counter()
+        try:
+            classifier = factory(model_path=path, backend=backend, model_version=model_version)
+            # warm-up sebelum swap: request pertama ke model baru tidak cold
+            classifier.warmup()
+            if role == "primary":
+                previous = module.swap_classifier(classifier)
+            else:
+                previous = module.set_candidate(classifier, weight)
+            _retire(previous)
+            job.update(status="ready", model_version=classifier.model_version)
+            print(f"[INFO] Model {classifier.model_version} aktif sebagai {role}")
+        except Exception as e:
+            job.update(status="failed", error=str(e))
+            print(f"[WARN] Gagal memuat model {path}: {e}")
+        finally:
+            job["duration_seconds"] = round(time.perf_counter() - start, 3)
+
+    def wait(self, timeout: float | None = None) -> dict | None:
+        """Tunggu job load background selesai (untuk script/test)."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return dict(self._job) if self._job else None
+
+    def set_weight(self, weight: float) -> None:
+        """
+        Raises:
+            ValueError: Jika weight di luar 0-1
+            RuntimeError: Jika tidak ada candidate
+        """
+        if not 0.0 <= weight <= 1.0:
+            raise ValueError("weight harus antara 0 dan 1")
+        module = _classifier_module()
+        if module._candidate is None:
+            raise RuntimeError("Tidak ada model kandidat")
+        module.set_candidate_weight(weight)
+
+    def promote(self) -> None:
+        """
+        Jadikan candidate sebagai primary (primary lama dilepas).
+
+        Raises:
+            RuntimeError: Jika tidak ada candidate
+        """
+        _retire(_classifier_module().promote_candidate())
+
+    def drop_candidate(self) -> None:
+        """Lepas candidate; seluruh traffic kembali ke primary."""
+        _retire(_classifier_module().set_candidate(None))
+
+    def status(self) -> dict:
+        """Model yang aktif, pembagian traffic, dan job load terakhir."""
+        module = sys.modules.get("services.vegetable_classifier")
+        primary = candidate = None
+        weight = 0.0
+        if module is not None:
+            primary, candidate, weight = module._classifier, module._candidate, module._candidate_weight
+        return {
+            "primary": _describe(primary),
+            "candidate": _describe(candidate),
+            "candidate_weight": weight if candidate is not None else 0.0,
+            "job": dict(self._job) if self._job else None,
+        }
+
+
+# global registry instance (lazy loading)
+_registry = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get atau inisialisasi model registry."""
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+    return _registry
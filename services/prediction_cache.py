@@ -0,0 +1,130 @@
+"""
+Cache hasil prediksi berdasarkan hash isi gambar + versi model.
+
+Gambar yang sama persis (re-upload, retry dari aplikasi mobile) langsung
+mendapat hasil dari cache tanpa decode, preprocessing, maupun inferensi.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from config.inference import (
+    PREDICTION_CACHE_MAX_ENTRIES,
+    PREDICTION_CACHE_SQLITE_PATH,
+    PREDICTION_CACHE_TTL,
+)
+from services.metrics import registry
+
+CACHE_HITS = registry.counter("prediction_cache_hits_total", "Prediksi yang dilayani dari cache")
+CACHE_MISSES = registry.counter("prediction_cache_misses_total", "Prediksi yang tidak ada di cache")
+
+
+def content_hash(data: bytes | bytearray | memoryview) -> str:
+    """Hash cepat (BLAKE2b 128-bit) dari isi file."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class PredictionCache:
+    """
+    LRU in-process dengan batas ukuran dan TTL, plus tier SQLite opsional
+    yang bertahan antar restart dan bisa dibagi antar worker di satu mesin.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = PREDICTION_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = PREDICTION_CACHE_TTL,
+        sqlite_path: str | None = PREDICTION_CACHE_SQLITE_PATH,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS prediction_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM prediction_cache WHERE expires_at < ?", (time.time(),))
+            self._db.commit()
+
+    @staticmethod
+    def make_key(data: bytes | bytearray | memoryview, model_version: str) -> str:
+        """Key cache: hash isi gambar + versi model."""
+        return f"{model_version}:{content_hash(data)}"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Ambil hasil prediksi; None jika tidak ada atau sudah kedaluwarsa."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= now:
+                    self._entries.move_to_end(key)
+                    CACHE_HITS.inc()
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM prediction_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] >= now:
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    CACHE_HITS.inc()
+                    return value
+
+        CACHE_MISSES.inc()
+        return None
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        """Simpan hasil prediksi ke semua tier."""
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO prediction_cache (key, value, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, expires_at: float, value: dict[str, Any]) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM prediction_cache")
+                self._db.commit()
+
+
+# global cache instance (lazy loading)
+_cache = None
+
+
+def get_prediction_cache() -> PredictionCache:
+    """Get atau inisialisasi cache prediksi."""
+    global _cache
+    if _cache is None:
+        _cache = PredictionCache()
+    return _cache
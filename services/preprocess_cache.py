@@ -0,0 +1,223 @@
+"""
+Cache hasil preprocessing di disk untuk re-inferensi dengan model baru.
+
+Saat versi model diganti, gambar verifikasi lama di-score ulang; decode +
+preprocessing jauh lebih mahal daripada forward pass. Cache ini menyimpan
+tensor 224 × 224 × 3 hasil preprocessing sebagai float16 (±294 KB per
+gambar) dalam file ``.npy`` per hash isi gambar, dibagi ke subfolder
+berdasarkan dua karakter pertama hash:
+
+    <root>/<versi preprocessing>/ab/abcdef....npy
+
+File dibaca dengan ``np.load(mmap_mode="r")`` sehingga tidak disalin ke
+memori sampai ditulis ke tensor batch. Versi preprocessing (hash versi,
+kode, dan parameter pipeline) menjadi bagian path: perubahan pipeline
+otomatis membuat cache lama tidak terpakai (dan terhapus oleh eviction).
+
+Ukuran total dibatasi ``max_bytes``; jika terlampaui, file dengan mtime
+tertua (mtime diperbarui setiap hit) dihapus sampai 90% dari batas.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from config.inference import PREPROCESS_CACHE_DIR, PREPROCESS_CACHE_MAX_BYTES, REDUCED_DECODE_ENABLED
+from services import preprocessing
+from services.metrics import registry
+from services.prediction_cache import content_hash
+
+CACHE_HITS = registry.counter("preprocess_cache_hits_total", "Tensor preprocessing yang diambil dari cache")
+CACHE_MISSES = registry.counter("preprocess_cache_misses_total", "Tensor preprocessing yang dihitung ulang")
+CACHE_BYTES = registry.gauge("preprocess_cache_bytes", "Ukuran total cache preprocessing di disk")
+
+# setelah eviction, cache diisi sampai fraksi ini dari max_bytes
+EVICTION_LOW_WATERMARK = 0.9
+TENSOR_SHAPE = (preprocessing.IMAGE_SIZE, preprocessing.IMAGE_SIZE, 3)
+
+
+def preprocess_version() -> str:
+    """
+    Hash versi dan parameter pipeline decode + preprocessing.
+
+    Selain PREPROCESS_PIPELINE_VERSION, isi file kode decode dan
+    preprocessing ikut di-hash: perubahan kode yang lupa menaikkan versi
+    tetap tidak menyajikan tensor lama.
+    """
+    from services import image_decode
+
+    params = (
+        preprocessing.PREPROCESS_PIPELINE_VERSION,
+        hashlib.blake2b(Path(preprocessing.__file__).read_bytes(), digest_size=8).hexdigest(),
+        hashlib.blake2b(Path(image_decode.__file__).read_bytes(), digest_size=8).hexdigest(),
+        preprocessing.IMAGE_SIZE,
+        preprocessing.BRIGHTNESS_DELTA,
+        preprocessing.CONTRAST_FACTOR,
+        preprocessing.SATURATION_BOOST,
+        preprocessing.CLAHE_CLIP_LIMIT,
+        preprocessing.CLAHE_TILE_GRID,
+        REDUCED_DECODE_ENABLED,
+    )
+    return hashlib.blake2b(repr(params).encode(), digest_size=4).hexdigest()
+
+
+class PreprocessCache:
+    """
+    Tensor preprocessing float16 di disk, dengan batas ukuran.
+
+    Args:
+        root: Folder cache
+        max_bytes: Batas ukuran total file cache
+    """
+
+    def __init__(self, root: str = PREPROCESS_CACHE_DIR, max_bytes: int = PREPROCESS_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.directory = self.root / preprocess_version()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            # cache hanya optimasi: tanpa folder, setiap get adalah miss
+            print(f"[WARN] Folder cache preprocessing {self.directory} tidak bisa dibuat: {e}")
+        self._lock = threading.Lock()
+        self._size = sum(size for _, _, size in self._entries())
+        CACHE_BYTES.set(self._size)
+
+    @staticmethod
+    def make_key(data: bytes | bytearray | memoryview) -> str:
+        """Key cache: hash isi file gambar (sama dengan cache prediksi)."""
+        return content_hash(data)
+
+    def path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.npy"
+
+    def get(self, key: str) -> np.ndarray | None:
+        """
+        Ambil tensor (224, 224, 3) float16 ter-memory-map; None jika tidak ada.
+        """
+        path = self.path(key)
+        try:
+            tensor = np.load(path, mmap_mode="r")
+            os.utime(path)  # LRU: tandai baru dipakai
+        except (OSError, ValueError):
+            CACHE_MISSES.inc()
+            return None
+        if tensor.shape != TENSOR_SHAPE:
+            CACHE_MISSES.inc()
+            return None
+        CACHE_HITS.inc()
+        return tensor
+
+    def put(self, key: str, tensor: np.ndarray) -> None:
+        """
+        Simpan tensor (ditulis ke file sementara lalu di-rename, atomik).
+
+        Raises:
+            OSError: Jika file tidak bisa ditulis (disk penuh, read-only, ...)
+        """
+        path = self.path(key)
+        if path.exists():
+            return
+        path.parent.mkdir(exist_ok=True)
+        temp_path = path.with_name(f".{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                np.save(f, np.asarray(tensor, dtype=np.float16))
+            size = temp_path.stat().st_size
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            self._size += size
+            over_limit = self._size > self.max_bytes
+        CACHE_BYTES.set(self._size)
+        if over_limit:
+            self.evict()
+
+    def get_or_compute(self, data: bytes | bytearray | memoryview, compute) -> np.ndarray:
+        """
+        Tensor dari cache, atau ``compute(data)`` lalu simpan hasilnya.
+
+        Gagal menulis ke cache (disk penuh, read-only, permission) hanya
+        diberi peringatan; tensor hasil compute tetap dikembalikan.
+
+        Hasil selalu float16, baik hit maupun miss, agar prediksi untuk
+        gambar yang sama tidak bergantung pada status cache.
+
+        Args:
+            data: Isi file gambar
+            compute: Fungsi data → tensor float32 (224, 224, 3)
+
+        Returns:
+            Tensor float16 (224, 224, 3)
+        """
+        key = self.make_key(data)
+        tensor = self.get(key)
+        if tensor is None:
+            tensor = np.asarray(compute(data), dtype=np.float16)
+            try:
+                self.put(key, tensor)
+            except OSError as e:
+                print(f"[WARN] Tensor preprocessing {key} tidak disimpan ke cache: {e}")
+        return tensor
+
+    def _entries(self):
+        """(mtime, path, size) semua file cache, termasuk versi lama."""
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, path, stat.st_size
+
+    def evict(self) -> int:
+        """
+        Hapus file paling lama tidak dipakai sampai ukuran <= 90% batas.
+        File dari versi preprocessing lain selalu dihapus lebih dulu.
+
+        Returns:
+            Jumlah file yang dihapus
+        """
+        with self._lock:
+            current = str(self.directory)
+            entries = sorted(
+                self._entries(), key=lambda entry: (entry[1].startswith(current), entry[0])
+            )
+            size = sum(entry[2] for entry in entries)
+            target = self.max_bytes * EVICTION_LOW_WATERMARK
+            removed = 0
+            for _, path, entry_size in entries:
+                if size <= target:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                size -= entry_size
+                removed += 1
+            self._size = size
+        CACHE_BYTES.set(size)
+        return removed
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+
+# global cache instance (lazy loading)
+_cache = None
+
+
+def get_preprocess_cache() -> PreprocessCache | None:
+    """Get atau inisialisasi cache preprocessing; None jika tidak dikonfigurasi."""
+    global _cache
+    if _cache is None and PREPROCESS_CACHE_DIR:
+        _cache = PreprocessCache()
+    return _cache
@@ -0,0 +1,110 @@
+"""
+Preprocessing gambar sayur berbasis NumPy/OpenCV.
+
+Menghasilkan keluaran yang setara dengan pipeline lama (TensorFlow eager +
+skimage float64) tetapi seluruhnya dihitung dalam float32 menggunakan cv2:
+
+1. Resize ke 224 × 224 dan BGR → RGB
+2. Brightness (+0.1) & contrast (×1.3) digabung dalam satu operasi
+3. CLAHE pada kanal V (HSV) dengan ``cv2.createCLAHE``
+4. Saturation boost (×1.2) pada ruang HSV yang sama, tanpa round-trip RGB
+"""
+
+import threading
+
+import cv2
+import numpy as np
+
+IMAGE_SIZE = 224
+
+# Versi pipeline decode + preprocessing, bagian dari path cache preprocessing
+# (services/preprocess_cache.py). Naikkan setiap kali hasil tensor berubah.
+PREPROCESS_PIPELINE_VERSION = 1
+
+BRIGHTNESS_DELTA = 0.1
+CONTRAST_FACTOR = 1.3
+SATURATION_BOOST = 1.2
+
+# equalize_adapthist (skimage) memakai kernel 1/8 ukuran gambar dan clip
+# limit 0.01 dengan redistribusi iteratif. Pada cv2 (redistribusi satu kali)
+# nilai clipLimit 1.8 memberi hasil paling mendekati untuk gambar 224 × 224.
+CLAHE_CLIP_LIMIT = 1.8
+CLAHE_TILE_GRID = (8, 8)
+
+# cv2.CLAHE tidak aman dipakai bersamaan oleh beberapa thread
+_local = threading.local()
+
+
+def _get_clahe() -> cv2.CLAHE:
+    """Ambil instance CLAHE milik thread saat ini."""
+    clahe = getattr(_local, "clahe", None)
+    if clahe is None:
+        clahe = cv2.createCLAHE(
+            clipLimit=CLAHE_CLIP_LIMIT, tileGridSize=CLAHE_TILE_GRID
+        )
+        _local.clahe = clahe
+    return clahe
+
+
+def _equalize_value(v_channel: np.ndarray) -> np.ndarray:
+    """
+    CLAHE pada kanal V float32 (0-1).
+
+    Seperti ``equalize_adapthist``, input di-stretch ke rentang penuh sebelum
+    dihitung histogramnya dan output di-stretch kembali ke 0-1.
+    """
+    lo, hi = float(v_channel.min()), float(v_channel.max())
+    if hi <= lo:
+        return v_channel
+
+    scale = 255.0 / (hi - lo)
+    v_u8 = cv2.convertScaleAbs(v_channel, alpha=scale, beta=-lo * scale)
+    equalized = _get_clahe().apply(v_u8)
+
+    eq_lo, eq_hi = cv2.minMaxLoc(equalized)[:2]
+    if eq_hi <= eq_lo:
+        return equalized.astype(np.float32) / np.float32(255.0)
+
+    out = equalized.astype(np.float32)
+    out -= np.float32(eq_lo)
+    out *= np.float32(1.0 / (eq_hi - eq_lo))
+    return out
+
+
+def preprocess_image(image: np.ndarray) -> np.ndarray:
+    """
+    Pre-process gambar untuk model (resize, brightness, contrast, CLAHE, saturasi).
+
+    Args:
+        image: Gambar dalam format BGR uint8 (dari cv2.imread / cv2.imdecode)
+
+    Returns:
+        Gambar RGB (224, 224, 3) dalam format float32 (0-1)
+    """
+    # 1. Resize ke 224 × 224 piksel dan BGR → RGB
+    image = cv2.resize(image, (IMAGE_SIZE, IMAGE_SIZE))
+    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    # 2. Normalisasi 0-1 + brightness & contrast dalam satu lintasan.
+    # adjust_contrast memakai mean per kanal setelah brightness, sehingga
+    # ((x + d) - (m + d)) * f + (m + d) = (x - m) * f + m + d
+    img = image.astype(np.float32)
+    img *= np.float32(1.0 / 255.0)
+    mean = img.mean(axis=(0, 1), dtype=np.float32)
+    img -= mean
+    img *= np.float32(CONTRAST_FACTOR)
+    img += mean + np.float32(BRIGHTNESS_DELTA)
+    np.clip(img, 0.0, 1.0, out=img)
+
+    # 3. CLAHE pada kanal V (HSV float32: H 0-360, S dan V 0-1)
+    hsv = cv2.cvtColor(img, cv2.COLOR_RGB2HSV)
+    hsv[:, :, 2] = _equalize_value(np.ascontiguousarray(hsv[:, :, 2]))
+
+    # 4. Saturation boost langsung di HSV yang sama
+    saturation = hsv[:, :, 1]
+    saturation *= np.float32(SATURATION_BOOST)
+    np.minimum(saturation, 1.0, out=saturation)
+
+    img = cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
+    np.clip(img, 0.0, 1.0, out=img)
+    return img
@@ -0,0 +1,95 @@
+"""
+Profiler sampling (cProfile) untuk sebagian kecil request inferensi.
+
+Rate bisa diubah saat runtime lewat ``PUT /predict/profile`` tanpa restart;
+0 = mati (default, tanpa overhead selain satu perbandingan). Hasil semua
+request yang di-sample digabung dan bisa dibaca lewat ``GET /predict/profile``.
+
+Hanya satu request yang di-profile pada satu waktu: request lain yang
+kebetulan terpilih saat profiler sedang dipakai dilewati.
+"""
+
+import cProfile
+import io
+import pstats
+import random
+import threading
+from contextlib import contextmanager
+
+from config.inference import PROFILE_SAMPLE_RATE
+
+SORT_KEYS = ("cumulative", "tottime", "calls")
+
+
+class SamplingProfiler:
+    """cProfile untuk fraksi ``rate`` dari pemanggilan ``maybe_profile``."""
+
+    def __init__(self, rate: float = PROFILE_SAMPLE_RATE):
+        self.rate = 0.0
+        self.set_rate(rate)
+        self.samples = 0
+        self._stats: pstats.Stats | None = None
+        self._active = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Raises:
+            ValueError: Jika rate di luar 0-1
+        """
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("Sample rate profiler harus antara 0 dan 1")
+        self.rate = rate
+
+    @contextmanager
+    def maybe_profile(self):
+        """Profile blok kode jika request ini terpilih; yield True jika di-profile."""
+        if self.rate <= 0.0 or random.random() >= self.rate or not self._active.acquire(blocking=False):
+            yield False
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                yield True
+            finally:
+                profiler.disable()
+            with self._stats_lock:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profiler)
+                else:
+                    self._stats.add(profiler)
+                self.samples += 1
+        finally:
+            self._active.release()
+
+    def report(self, limit: int = 30, sort: str = "cumulative") -> str:
+        """Ringkasan pstats gabungan (fungsi teratas menurut ``sort``)."""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort harus salah satu dari {SORT_KEYS}")
+        with self._stats_lock:
+            if self._stats is None:
+                return "Belum ada request yang di-profile.\n"
+            output = io.StringIO()
+            self._stats.stream = output
+            self._stats.sort_stats(sort).print_stats(limit)
+        return f"{self.samples} request di-profile\n" + output.getvalue()
+
+    def reset(self) -> None:
+        """Buang hasil profile yang sudah terkumpul."""
+        with self._stats_lock:
+            self._stats = None
+            self.samples = 0
+
+
+# global profiler instance (lazy loading)
+_profiler = None
+
+
+def get_profiler() -> SamplingProfiler:
+    """Get atau inisialisasi profiler sampling."""
+    global _profiler
+    if _profiler is None:
+        _profiler = SamplingProfiler()
+    return _profiler
@@ -0,0 +1,271 @@
+"""
+Re-scoring massal gambar produk dan riwayat verifikasi setelah model diganti.
+
+Alur per chunk (``chunk_size`` baris, urut id):
+
+1. Baris diambil dari database dengan keyset pagination (``id > last_id``),
+   jadi job bisa dilanjutkan dari checkpoint tanpa OFFSET yang makin lambat
+2. Decode + preprocessing di process pool (tensor dikirim balik sebagai
+   float16); chunk berikutnya sudah diproses selagi chunk ini diinferensi
+3. Inferensi satu batch besar (backend memecah sesuai bucket)
+4. Update ``verification_results`` (result, is_valid_for_marketplace,
+   model_version) dan ``MarketplaceProduct.status`` dalam satu transaksi
+   per chunk, lalu checkpoint ditulis
+
+Produk aktif yang gambarnya sekarang diprediksi "Tidak Utuh" diubah menjadi
+``inactive``; produk yang sudah tidak aktif/habis tidak pernah diaktifkan
+kembali secara otomatis.
+
+Hanya baris yang gambarnya ada di uploads/ yang bisa di-score ulang;
+``VerificationResult.image`` dari /verify-vegetable berisi nama file dari
+client (gambarnya tidak disimpan), baris seperti itu dihitung ``missing``.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sqlalchemy import update
+
+from app.models.marketplace_product import MarketplaceProduct
+from app.models.verification_result import VerificationResult
+from config.database import SessionLocal
+from config.uploads import UPLOADS_DIRECTORY
+
+TARGETS = ("products", "verifications")
+MODELS = {"products": MarketplaceProduct, "verifications": VerificationResult}
+FLAGGED_STATUS = "inactive"
+
+
+def preprocess_file(path: str) -> np.ndarray | str:
+    """
+    Decode + preprocessing satu file (dijalankan di process pool).
+
+    Returns:
+        Tensor float16 (224, 224, 3), atau pesan error
+    """
+    from services.image_decode import decode_image
+    from services.preprocess_cache import get_preprocess_cache
+    from services.preprocessing import preprocess_image
+
+    def compute(data) -> np.ndarray:
+        image = decode_image(data)
+        if image is None:
+            raise ValueError("bukan gambar yang valid")
+        return preprocess_image(image)
+
+    try:
+        data = np.fromfile(path, dtype=np.uint8)
+        cache = get_preprocess_cache()
+        tensor = cache.get_or_compute(data, compute) if cache is not None else compute(data)
+        return np.asarray(tensor, dtype=np.float16)
+    except Exception as e:
+        return str(e)
+
+
+class Checkpoint:
+    """
+    Progres job di file JSON (ditulis atomik setelah setiap chunk).
+
+    Checkpoint dari versi model lain diabaikan: model baru = mulai dari awal.
+    """
+
+    def __init__(self, path: str | None, model_version: str, restart: bool = False):
+        self.path = Path(path) if path else None
+        self.state: dict[str, Any] = {"model_version": model_version, "targets": {}}
+        if self.path is not None and self.path.exists() and not restart:
+            saved = json.loads(self.path.read_text())
+            if saved.get("model_version") == model_version:
+                self.state = saved
+
+    def target(self, name: str) -> dict[str, Any]:
+        return self.state["targets"].setdefault(
+            name, {"last_id": 0, "done": False, "scored": 0, "failed": 0, "missing": 0, "flagged": 0}
+        )
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        temp_path.write_text(json.dumps(self.state, indent=2))
+        os.replace(temp_path, self.path)
+
+
+class RescoringJob:
+    """
+    Args:
+        classifier: VegetableClassifier (model versi baru)
+        session_factory: Pembuat session database
+        uploads_directory: Folder uploads/
+        chunk_size: Baris per chunk (satu transaksi + satu checkpoint)
+        workers: Proses untuk decode + preprocessing (0 = di proses ini)
+        checkpoint: Checkpoint untuk resume (None = tidak disimpan)
+        dry_run: Hitung prediksi tanpa menulis ke database
+    """
+
+    def __init__(
+        self,
+        classifier,
+        session_factory=SessionLocal,
+        uploads_directory: Path = UPLOADS_DIRECTORY,
+        chunk_size: int = 256,
+        workers: int = 4,
+        checkpoint: Checkpoint | None = None,
+        dry_run: bool = False,
+    ):
+        self.classifier = classifier
+        self.session_factory = session_factory
+        self.uploads_directory = Path(uploads_directory)
+        self.chunk_size = max(1, chunk_size)
+        self.workers = workers
+        self.checkpoint = checkpoint or Checkpoint(None, classifier.model_version)
+        self.dry_run = dry_run
+
+    def _image_path(self, image: str | None) -> str | None:
+        if not image:
+            return None
+        path = (self.uploads_directory / image).resolve()
+        if not path.is_relative_to(self.uploads_directory.resolve()) or not path.is_file():
+            return None
+        return str(path)
+
+    def _fetch(self, target: str, after_id: int) -> list[tuple[int, str | None, Any]]:
+        """(id, path gambar, verification_id/None) untuk chunk berikutnya."""
+        model = MODELS[target]
+        link = model.verification_id if target == "products" else model.id
+        with self.session_factory() as db:
+            rows = (
+                db.query(model.id, model.image, link)
+                .filter(model.id > after_id)
+                .order_by(model.id)
+                .limit(self.chunk_size)
+                .all()
+            )
+        return [(row[0], self._image_path(row[1]), row[2]) for row in rows]
+
+    def _count(self, target: str, after_id: int) -> int:
+        model = MODELS[target]
+        with self.session_factory() as db:
+            return db.query(model).filter(model.id > after_id).count()
+
+    def _write(self, target: str, rows: list, results: list[dict]) -> int:
+        """Update satu chunk dalam satu transaksi; kembalikan produk yang di-flag."""
+        version = self.classifier.model_version
+        verifications = []
+        flag_ids = []
+        for (row_id, _, verification_id), result in zip(rows, results, strict=True):
+            if verification_id is not None:
+                verifications.append({
+                    "id": verification_id,
+                    "result": json.dumps({
+                        "prediction": result["prediction"],
+                        "confidence": round(float(result["confidence"]), 4),
+                    }),
+                    "is_valid_for_marketplace": result["prediction"] == "Utuh",
+                    "model_version": version,
+                })
+            if target == "products" and result["prediction"] != "Utuh":
+                flag_ids.append(row_id)
+
+        if self.dry_run:
+            return len(flag_ids)
+        with self.session_factory() as db:
+            if verifications:
+                db.execute(update(VerificationResult), verifications)
+            flagged = 0
+            if flag_ids:
+                flagged = db.execute(
+                    update(MarketplaceProduct)
+                    .where(MarketplaceProduct.id.in_(flag_ids), MarketplaceProduct.status == "active")
+                    .values(status=FLAGGED_STATUS)
+                ).rowcount
+            db.commit()
+        return flagged
+
+    def _infer(self, tensors: list) -> list[dict | str]:
+        """Satu forward pass untuk semua tensor yang berhasil di-preprocess."""
+        indices = [i for i, tensor in enumerate(tensors) if not isinstance(tensor, str)]
+        results: list[dict | str] = list(tensors)
+        if indices:
+            batch = np.stack([tensors[i] for i in indices]).astype(np.float32)
+            probabilities = self.classifier.predict_tensor(batch)
+            for index, probs in zip(indices, probabilities, strict=True):
+                results[index] = self.classifier.format_result(probs)
+        return results
+
+    def run(self, target: str, progress=print) -> dict[str, Any]:
+        """
+        Score ulang semua baris ``target`` (products atau verifications).
+
+        Returns:
+            Statistik target (scored, failed, missing, flagged, last_id)
+
+        Raises:
+            ValueError: Jika target tidak dikenal
+        """
+        if target not in TARGETS:
+            raise ValueError(f"target harus salah satu dari {TARGETS}")
+        state = self.checkpoint.target(target)
+        if state["done"]:
+            progress(f"[{target}] sudah selesai untuk model {self.classifier.model_version}")
+            return state
+
+        total = self._count(target, state["last_id"])
+        processed = 0
+        start = time.perf_counter()
+
+        pool = None
+        if self.workers > 0:
+            # spawn: proses anak tidak mewarisi runtime TensorFlow proses ini
+            pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        preprocess = pool.map if pool is not None else map
+
+        def submit(rows):
+            paths = [path for _, path, _ in rows if path is not None]
+            return rows, preprocess(preprocess_file, paths)
+
+        try:
+            pending = submit(self._fetch(target, state["last_id"]))
+            while pending[0]:
+                rows, tensors = pending
+                # chunk berikutnya di-preprocess selagi chunk ini diinferensi
+                pending = submit(self._fetch(target, rows[-1][0]))
+                tensors = iter(list(tensors))
+
+                scored_rows = [row for row in rows if row[1] is not None]
+                results = self._infer([next(tensors) for _ in scored_rows])
+                succeeded = [
+                    (row, result)
+                    for row, result in zip(scored_rows, results, strict=True)
+                    if isinstance(result, dict)
+                ]
+
+                flagged = self._write(target, [row for row, _ in succeeded], [result for _, result in succeeded])
+                state["last_id"] = rows[-1][0]
+                state["scored"] += len(succeeded)
+                state["failed"] += len(scored_rows) - len(succeeded)
+                state["missing"] += len(rows) - len(scored_rows)
+                state["flagged"] += flagged
+                self.checkpoint.save()
+
+                processed += len(rows)
+                elapsed = time.perf_counter() - start
+                rate = processed / elapsed if elapsed else 0.0
+                eta = (total - processed) / rate if rate else 0.0
+                progress(
+                    f"[{target}] {processed}/{total} baris, {rate:.1f} gambar/s, "
+                    f"ETA {eta:.0f}s (gagal {state['failed']}, tanpa gambar {state['missing']}, "
+                    f"di-flag {state['flagged']})"
+                )
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        state["done"] = True
+        self.checkpoint.save()
+        return state
@@ -0,0 +1,216 @@
+"""
+Penyajian file statis dengan cache HTTP yang benar.
+
+``StaticFiles`` bawaan memberi ETag dari mtime + ukuran dan tanpa
+Cache-Control, sehingga gambar produk terus di-download ulang. Lapisan ini:
+
+- ETag kuat dari isi file (SHA-256; untuk file content-addressed diambil
+  langsung dari namanya, tanpa membaca file)
+- ``Cache-Control: immutable`` untuk file content-addressed (uploads/cas/),
+  ``no-cache`` / ``max-age`` untuk yang lain (lihat config/static.py)
+- 304 untuk If-None-Match / If-Modified-Since; Range ditangani FileResponse
+- Varian ``.br`` / ``.gz`` hasil ``python -m scripts.precompress_static``
+  untuk CSS/JS/HTML jika client mengirim Accept-Encoding yang cocok
+"""
+
+import hashlib
+import mimetypes
+import os
+import re
+import stat
+from email.utils import parsedate
+from functools import lru_cache
+from pathlib import Path
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+
+from config.static import STATIC_IMMUTABLE_MAX_AGE, STATIC_MAX_AGE, STATIC_PRECOMPRESSED
+
+IMMUTABLE_CACHE_CONTROL = f"public, max-age={STATIC_IMMUTABLE_MAX_AGE}, immutable"
+DEFAULT_CACHE_CONTROL = f"public, max-age={STATIC_MAX_AGE}" if STATIC_MAX_AGE > 0 else "no-cache"
+
+# urutan preferensi encoding → ekstensi file varian
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+PRECOMPRESSIBLE_SUFFIXES = {".css", ".js", ".html", ".svg"}
+
+_DIGEST_NAME = re.compile(r"^[0-9a-f]{64}$")
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@lru_cache(maxsize=4096)
+def _content_digest(path: str, mtime_ns: int, size: int) -> str:
+    # mtime/ukuran ikut menjadi key agar file yang berubah di-hash ulang
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def strong_etag(full_path: str, stat_result: os.stat_result) -> str:
+    """
+    ETag kuat berbasis isi file.
+
+    File yang namanya sudah berupa SHA-256 (store content-addressed) tidak
+    dibaca. Untuk file lain hash pertama membaca seluruh file; panggil dari
+    threadpool.
+    """
+    stem = Path(full_path).name.split(".", 1)[0]
+    if _DIGEST_NAME.match(stem):
+        return f'"{stem}"'
+    return f'"{_content_digest(str(full_path), stat_result.st_mtime_ns, stat_result.st_size)[:32]}"'
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        name, _, quality = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                if float(quality) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _precompressed_variant(full_path: str, stat_result: os.stat_result, accept_encoding: str):
+    accepted = _accepted_encodings(accept_encoding)
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        if encoding not in accepted:
+            continue
+        try:
+            variant_stat = os.stat(full_path + suffix)
+        except OSError:
+            continue
+        # varian yang lebih tua dari aslinya sudah basi
+        if variant_stat.st_mtime_ns >= stat_result.st_mtime_ns:
+            return encoding, full_path + suffix, variant_stat
+    return None
+
+
+def _is_not_modified(etag: str, last_modified: str | None, request_headers: Headers) -> bool:
+    if if_none_match := request_headers.get("if-none-match"):
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = parsedate(request_headers.get("if-modified-since", ""))
+    modified = parsedate(last_modified or "")
+    return if_modified_since is not None and modified is not None and if_modified_since >= modified
+
+
+def file_response(
+    full_path: str,
+    stat_result: os.stat_result,
+    request_headers: Headers,
+    cache_control: str = DEFAULT_CACHE_CONTROL,
+    precompressed: bool = STATIC_PRECOMPRESSED,
+    status_code: int = 200,
+) -> Response:
+    """
+    Response untuk satu file: ETag kuat, Cache-Control, 304, varian terkompresi.
+
+    Args:
+        full_path: Path file di disk
+        stat_result: Hasil os.stat file
+        request_headers: Header request (Accept-Encoding, If-None-Match, Range)
+        cache_control: Nilai header Cache-Control
+        precompressed: Cari varian .br/.gz di samping file
+        status_code: Status untuk response penuh
+
+    Returns:
+        FileResponse, atau NotModifiedResponse (304)
+    """
+    full_path = str(full_path)
+    etag = strong_etag(full_path, stat_result)
+    headers = {"cache-control": cache_control, "etag": etag}
+    media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    serve_path, serve_stat = full_path, stat_result
+
+    if precompressed and Path(full_path).suffix.lower() in PRECOMPRESSIBLE_SUFFIXES:
+        headers["vary"] = "Accept-Encoding"
+        # Range selalu dilayani dari file asli agar byte offset konsisten
+        variant = None
+        if "range" not in request_headers:
+            variant = _precompressed_variant(full_path, stat_result, request_headers.get("accept-encoding", ""))
+        if variant is not None:
+            encoding, serve_path, serve_stat = variant
+            headers["content-encoding"] = encoding
+            # representasi berbeda wajib punya ETag kuat yang berbeda
+            headers["etag"] = f'{etag[:-1]}-{encoding}"'
+
+    response = FileResponse(
+        serve_path, status_code=status_code, headers=headers, media_type=media_type, stat_result=serve_stat
+    )
+    if _is_not_modified(response.headers["etag"], response.headers.get("last-modified"), request_headers):
+        return NotModifiedResponse(response.headers)
+    return response
+
+
+async def static_file_response(request: Request, path: str, precompressed: bool = STATIC_PRECOMPRESSED) -> Response:
+    """
+    Pengganti ``FileResponse(path)`` untuk halaman di route biasa (/, /vq).
+
+    stat dan hash isi file dijalankan di threadpool.
+    """
+
+    def lookup():
+        stat_result = os.stat(path)
+        strong_etag(path, stat_result)  # isi cache hash di luar event loop
+        return stat_result
+
+    stat_result = await run_in_threadpool(lookup)
+    return file_response(path, stat_result, request.headers, precompressed=precompressed)
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles dengan ETag kuat, Cache-Control, dan varian terkompresi.
+
+    Args:
+        immutable_prefixes: Path relatif (misal "cas/") yang isinya tidak
+            pernah berubah dan mendapat ``Cache-Control: immutable``
+        precompressed: Sajikan varian .br/.gz jika ada
+        Argumen lain diteruskan ke StaticFiles
+    """
+
+    def __init__(
+        self,
+        *args,
+        immutable_prefixes: tuple[str, ...] = (),
+        precompressed: bool = STATIC_PRECOMPRESSED,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.immutable_prefixes = immutable_prefixes
+        self.precompressed = precompressed
+
+    def lookup_path(self, path: str):
+        # dipanggil StaticFiles dari threadpool: hash isi file dihitung di sini
+        full_path, stat_result = super().lookup_path(path)
+        if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+            strong_etag(full_path, stat_result)
+        return full_path, stat_result
+
+    def cache_control(self, full_path: str) -> str:
+        relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        if relative.startswith(self.immutable_prefixes):
+            return IMMUTABLE_CACHE_CONTROL
+        return DEFAULT_CACHE_CONTROL
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        return file_response(
+            full_path,
+            stat_result,
+            Headers(scope=scope),
+            cache_control=self.cache_control(str(full_path)),
+            precompressed=self.precompressed,
+            status_code=status_code,
+        )
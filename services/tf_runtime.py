@@ -0,0 +1,192 @@
+"""
+Konfigurasi runtime TensorFlow yang harus diterapkan sebelum TensorFlow
+di-import: jumlah thread intra-op/inter-op, oneDNN, allocator memori, dan
+pinning CPU per worker.
+
+Tanpa ini setiap worker uvicorn membuat satu thread per core; dengan N worker
+di satu mesin jumlah thread komputasi menjadi N × core dan throughput turun.
+
+Dipanggil otomatis oleh services/inference_backends.py (satu-satunya jalur
+aplikasi yang meng-import TensorFlow), sehingga cukup diatur lewat env
+(INFERENCE_TF_*, INFERENCE_ALLOCATOR, INFERENCE_MALLOC_ARENA_MAX,
+INFERENCE_CPU_AFFINITY). Modul ini tidak meng-import numpy/TensorFlow.
+"""
+
+import ctypes
+import os
+import sys
+import tempfile
+
+from config.inference import (
+    CPU_AFFINITY,
+    MALLOC_ARENA_MAX,
+    TF_ALLOCATOR,
+    TF_INTER_OP_THREADS,
+    TF_INTRA_OP_THREADS,
+    TF_ONEDNN,
+)
+
+ALLOCATORS = ("system", "tcmalloc", "jemalloc")
+# mallopt(3): M_ARENA_MAX
+_M_ARENA_MAX = -8
+
+_applied: dict | None = None
+# fd lock slot CPU dipegang selama proses hidup (dilepas otomatis saat exit)
+_affinity_lock = None
+
+
+def parse_cpu_list(value: str) -> list[int]:
+    """
+    Ubah daftar core seperti "0-3,8" menjadi [0, 1, 2, 3, 8].
+
+    Raises:
+        ValueError: Jika format tidak valid
+    """
+    cpus: list[int] = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = (int(x) for x in part.split("-", 1))
+            if last < first:
+                raise ValueError(f"Rentang core tidak valid: {part}")
+            cpus.extend(range(first, last + 1))
+        else:
+            cpus.append(int(part))
+    if not cpus:
+        raise ValueError(f"Daftar core kosong: {value!r}")
+    return sorted(set(cpus))
+
+
+def _claim_cpu_block(available: list[int], block_size: int) -> list[int] | None:
+    """
+    Klaim blok core pertama yang belum dipakai worker lain di mesin ini.
+
+    Setiap blok diwakili file lock di folder temp; lock dipegang sampai proses
+    berhenti, jadi worker yang di-restart mendapat blok yang kosong.
+    """
+    global _affinity_lock
+    import fcntl
+
+    block_size = max(1, min(block_size, len(available)))
+    for slot in range(len(available) // block_size):
+        lock_path = os.path.join(tempfile.gettempdir(), f"inference-cpu-slot-{slot}.lock")
+        handle = open(lock_path, "w")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            continue
+        _affinity_lock = handle
+        return available[slot * block_size : (slot + 1) * block_size]
+    return None
+
+
+def _apply_affinity(setting: str, block_size: int) -> list[int] | None:
+    if not setting or not hasattr(os, "sched_setaffinity"):
+        return None
+    available = sorted(os.sched_getaffinity(0))
+    if setting == "auto":
+        cpus = _claim_cpu_block(available, block_size)
+        if cpus is None:
+            print("[WARN] Semua blok CPU sudah diklaim worker lain; affinity tidak diubah")
+            return None
+    else:
+        cpus = parse_cpu_list(setting)
+    os.sched_setaffinity(0, cpus)
+    return cpus
+
+
+def _preloaded(library: str) -> bool:
+    """Cek apakah shared library (mis. tcmalloc) sudah dimuat proses ini."""
+    try:
+        with open("/proc/self/maps") as maps:
+            return any(library in line for line in maps)
+    except OSError:
+        return library in os.environ.get("LD_PRELOAD", "")
+
+
+def _apply_allocator(allocator: str, arena_max: int) -> str:
+    if allocator not in ALLOCATORS:
+        raise ValueError(f"INFERENCE_ALLOCATOR harus salah satu dari {ALLOCATORS}")
+    if allocator != "system":
+        if not _preloaded(f"lib{allocator}"):
+            print(
+                f"[WARN] INFERENCE_ALLOCATOR={allocator} tetapi lib{allocator} tidak dimuat; "
+                f"jalankan dengan LD_PRELOAD=/path/ke/lib{allocator}.so"
+            )
+            return "system"
+        return allocator
+    if arena_max > 0:
+        try:
+            ctypes.CDLL(None).mallopt(_M_ARENA_MAX, arena_max)
+        except (OSError, AttributeError):
+            pass  # bukan glibc
+    return allocator
+
+
+def configure_runtime(
+    intra_op_threads: int = TF_INTRA_OP_THREADS,
+    inter_op_threads: int = TF_INTER_OP_THREADS,
+    onednn: str | None = TF_ONEDNN,
+    allocator: str = TF_ALLOCATOR,
+    malloc_arena_max: int = MALLOC_ARENA_MAX,
+    cpu_affinity: str = CPU_AFFINITY,
+) -> dict:
+    """
+    Terapkan konfigurasi runtime (sekali per proses).
+
+    Variabel env TF_* yang sudah di-set manual tidak ditimpa. Jika TensorFlow
+    sudah di-import, pengaturan thread dan oneDNN tidak lagi berlaku
+    (diberi peringatan).
+
+    Args:
+        intra_op_threads: Thread untuk paralelisme di dalam satu op
+        inter_op_threads: Thread untuk menjalankan op independen bersamaan
+        onednn: "true"/"false" untuk TF_ENABLE_ONEDNN_OPTS, None = default
+        allocator: system, tcmalloc, atau jemalloc
+        malloc_arena_max: Batas arena glibc (0 = default)
+        cpu_affinity: "", "auto", atau daftar core ("0-3,8")
+
+    Returns:
+        Konfigurasi yang diterapkan
+    """
+    global _applied
+    if _applied is not None:
+        return _applied
+
+    if "tensorflow" in sys.modules:
+        print("[WARN] TensorFlow sudah di-import; konfigurasi thread/oneDNN mungkin tidak berlaku")
+
+    cpus = _apply_affinity(cpu_affinity, intra_op_threads)
+    if cpus is not None:
+        # thread lebih banyak dari core yang di-pin hanya menambah context switch
+        intra_op_threads = min(intra_op_threads, len(cpus))
+
+    os.environ.setdefault("TF_NUM_INTRAOP_THREADS", str(intra_op_threads))
+    os.environ.setdefault("TF_NUM_INTEROP_THREADS", str(inter_op_threads))
+    if onednn is not None:
+        os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "1" if onednn == "true" else "0")
+
+    _applied = {
+        "intra_op_threads": int(os.environ["TF_NUM_INTRAOP_THREADS"]),
+        "inter_op_threads": int(os.environ["TF_NUM_INTEROP_THREADS"]),
+        "onednn": os.environ.get("TF_ENABLE_ONEDNN_OPTS"),
+        "allocator": _apply_allocator(allocator, malloc_arena_max),
+        "cpu_affinity": cpus,
+    }
+    return _applied
+
+
+def configure_tensorflow(tf) -> None:
+    """
+    Set thread TensorFlow lewat tf.config setelah import (sebelum op
+    pertama); melengkapi env yang dibaca saat runtime diinisialisasi.
+    """
+    settings = configure_runtime()
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(settings["intra_op_threads"])
+        tf.config.threading.set_inter_op_parallelism_threads(settings["inter_op_threads"])
+    except RuntimeError:
+        pass  # runtime sudah diinisialisasi (model lain sudah dimuat)
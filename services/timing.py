@@ -0,0 +1,117 @@
+"""
+Timing per tahap request inferensi (baca upload, decode, preprocess, model).
+
+Setiap tahap dibungkus ``with stage("decode"):``. Durasinya dicatat ke
+histogram Prometheus ``inference_stage_seconds{stage=...}`` dan, jika sedang
+di dalam request HTTP, ke header ``Server-Timing`` response tersebut
+(terlihat langsung di tab Network DevTools browser).
+
+Timing request dibawa lewat contextvar, sehingga ikut terbawa ke thread
+executor inferensi (lihat InferenceExecutor.run) tanpa mengubah signature
+fungsi.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from config.inference import SERVER_TIMING_ENABLED
+from services.metrics import registry
+
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class RequestTimings:
+    """Akumulasi durasi per tahap untuk satu request (urutan tahap dipertahankan)."""
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        # batch: tahap yang sama terjadi berkali-kali, durasinya dijumlahkan
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def server_timing(self, total: float | None = None) -> str:
+        """Nilai header Server-Timing (durasi dalam ms)."""
+        with self._lock:
+            stages = list(self.stages.items())
+        if total is not None:
+            stages.append(("total", total))
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in stages)
+
+
+_current: contextvars.ContextVar[RequestTimings | None] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def current_timings() -> RequestTimings | None:
+    """Timing request yang sedang berjalan, atau None di luar request."""
+    return _current.get()
+
+
+def _histogram(name: str):
+    return registry.histogram(
+        "inference_stage_seconds",
+        STAGE_BUCKETS,
+        "Durasi tiap tahap inferensi (upload_read, decode, preprocess, inference, ...)",
+        labels={"stage": name},
+    )
+
+
+def record(name: str, seconds: float) -> None:
+    """Catat durasi satu tahap ke histogram dan ke request saat ini."""
+    _histogram(name).observe(seconds)
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def stage(name: str):
+    """Ukur durasi blok kode sebagai tahap ``name``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware: siapkan RequestTimings per request dan tambahkan header
+    ``Server-Timing`` jika ada tahap yang tercatat.
+
+    Response streaming (NDJSON batch) mengirim header sebelum inferensi
+    selesai; tahap yang terjadi setelahnya hanya masuk ke histogram.
+    """
+
+    def __init__(self, app, enabled: bool = SERVER_TIMING_ENABLED):
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if self.enabled and message["type"] == "http.response.start" and timings.stages:
+                header = timings.server_timing(total=time.perf_counter() - start)
+                message = {
+                    **message,
+                    "headers": list(message.get("headers", [])) + [(b"server-timing", header.encode())],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,64 @@
+"""
+Tolak upload yang terlalu besar sebelum body-nya dibaca.
+
+Starlette mem-parsing multipart (dan men-spool file ke disk) sebelum
+endpoint dipanggil. Middleware ini melihat header Content-Length lebih dulu
+dan langsung menjawab 413, jadi upload 500MB tidak pernah diterima. Request
+tanpa Content-Length (chunked) tetap dibatasi oleh
+``PredictionController.read_upload``.
+"""
+
+import json
+
+# ruang untuk boundary dan header multipart di luar isi file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware: batas Content-Length per path.
+
+    Args:
+        app: Aplikasi ASGI
+        limits: Mapping path (persis) → ukuran file maksimal dalam bytes
+    """
+
+    def __init__(self, app, limits: dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] in ("POST", "PUT"):
+            limit = self.limits.get(scope["path"])
+            if limit is not None:
+                content_length = _content_length(scope)
+                if content_length is not None and content_length > limit + MULTIPART_OVERHEAD:
+                    await _reject(send, limit)
+                    return
+        await self.app(scope, receive, send)
+
+
+def _content_length(scope) -> int | None:
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+async def _reject(send, limit: int) -> None:
+    body = json.dumps(
+        {"detail": f"Ukuran file terlalu besar. Maksimal {limit // (1024 * 1024)}MB."}
+    ).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"connection", b"close"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
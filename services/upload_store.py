@@ -0,0 +1,201 @@
+"""
+Penyimpanan upload berbasis isi (content-addressed) dengan deduplikasi.
+
+Nama file = SHA-256 dari isinya, di-shard ke subfolder agar satu folder
+tidak berisi ribuan file: ``cas/ab/cd/abcd…ef.jpg`` (relatif terhadap
+uploads/). Gambar yang sama persis hanya disimpan sekali, dan karena isi
+sebuah nama tidak pernah berubah, file bisa di-cache selamanya oleh client.
+
+File ditulis ke folder sementara sambil di-hash per chunk (di threadpool,
+bukan di event loop), di-fsync sesuai UPLOAD_FSYNC, lalu di-rename secara
+atomik ke nama akhirnya. Jumlah referensi dihitung dari kolom
+``MarketplaceProduct.image``; file yang tidak direferensikan dibersihkan
+oleh ``python -m scripts.gc_uploads``.
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config.uploads import UPLOAD_FSYNC, UPLOAD_FSYNC_POLICIES, UPLOAD_GC_GRACE_HOURS, UPLOADS_DIRECTORY
+
+CAS_DIRNAME = "cas"
+TEMP_DIRNAME = ".tmp"
+CHUNK_SIZE = 1024 * 1024
+FSYNC_POLICIES = UPLOAD_FSYNC_POLICIES
+
+
+def content_path(digest: str, suffix: str) -> str:
+    """Path relatif (terhadap uploads/) untuk hash isi tertentu."""
+    return f"{CAS_DIRNAME}/{digest[:2]}/{digest[2:4]}/{digest}{suffix.lower()}"
+
+
+def is_content_addressed(image_name: str | None) -> bool:
+    """Apakah nama gambar berasal dari store ini (bukan nama uuid lama)."""
+    return bool(image_name) and image_name.startswith(f"{CAS_DIRNAME}/")
+
+
+def _fsync_directory(directory: Path) -> None:
+    # agar entri hasil rename ikut tersimpan jika server mati
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class UploadStore:
+    """Store upload content-addressed di atas satu folder."""
+
+    def __init__(self, root: Path = UPLOADS_DIRECTORY, fsync: str = UPLOAD_FSYNC):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"UPLOAD_FSYNC harus salah satu dari {FSYNC_POLICIES}, bukan {fsync!r}")
+        self.root = Path(root)
+        self.fsync = fsync
+
+    def _temp_file(self):
+        temp_directory = self.root / TEMP_DIRNAME
+        temp_directory.mkdir(parents=True, exist_ok=True)
+        # folder sementara di filesystem yang sama agar rename tetap atomik
+        return tempfile.NamedTemporaryFile(dir=temp_directory, delete=False)
+
+    def _commit(self, temp_name: str, digest: str, suffix: str) -> tuple[str, bool]:
+        name = content_path(digest, suffix)
+        destination = self.root / name
+        try:
+            # dedup: perbarui mtime agar GC (collect_garbage) menganggapnya
+            # upload baru selama masa tenggang, meski file lama tanpa referensi
+            os.utime(destination)
+        except FileNotFoundError:
+            pass
+        else:
+            os.unlink(temp_name)
+            return name, False
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temp_name, destination)
+        if self.fsync == "full":
+            _fsync_directory(destination.parent)
+        return name, True
+
+    def save_stream(self, source: BinaryIO, suffix: str) -> tuple[str, bool]:
+        """
+        Salin file-like object ke store per chunk sambil menghitung hash-nya.
+
+        Blocking (I/O disk); dari kode async panggil lewat save_upload.
+
+        Args:
+            source: File sumber, dibaca dari posisi saat ini sampai habis
+            suffix: Ekstensi file (misal ".jpg")
+
+        Returns:
+            (path relatif terhadap uploads/, True jika file baru / False jika
+            isi yang sama sudah tersimpan)
+        """
+        digest = hashlib.sha256()
+        temp = self._temp_file()
+        try:
+            with temp:
+                while chunk := source.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    temp.write(chunk)
+                if self.fsync != "none":
+                    temp.flush()
+                    os.fsync(temp.fileno())
+            return self._commit(temp.name, digest.hexdigest(), suffix)
+        except BaseException:
+            if os.path.exists(temp.name):
+                os.unlink(temp.name)
+            raise
+
+    async def save_upload(self, file: UploadFile, suffix: str) -> tuple[str, bool]:
+        """
+        Simpan file upload tanpa memblokir event loop.
+
+        Seluruh salinan (baca spool upload, hash, tulis, fsync, rename)
+        berjalan di threadpool; di volume jaringan satu write/fsync bisa
+        makan puluhan ms.
+
+        Args:
+            file: File upload
+            suffix: Ekstensi file (misal ".jpg")
+
+        Returns:
+            Sama dengan save_stream
+        """
+        await file.seek(0)
+        return await run_in_threadpool(self.save_stream, file.file, suffix)
+
+    def save_bytes(self, data: bytes, suffix: str) -> tuple[str, bool]:
+        """Sama dengan save_stream, untuk isi yang sudah ada di memori."""
+        return self.save_stream(io.BytesIO(data), suffix)
+
+    def stored_files(self) -> list[str]:
+        """Semua file di store (path relatif terhadap uploads/)."""
+        cas_root = self.root / CAS_DIRNAME
+        if not cas_root.exists():
+            return []
+        return sorted(
+            path.relative_to(self.root).as_posix() for path in cas_root.glob("*/*/*") if path.is_file()
+        )
+
+    @staticmethod
+    def reference_counts(db: Session) -> Counter:
+        """Jumlah produk yang memakai setiap gambar (MarketplaceProduct.image)."""
+        from app.models.marketplace_product import MarketplaceProduct
+
+        rows = (
+            db.query(MarketplaceProduct.image, func.count(MarketplaceProduct.id))
+            .filter(MarketplaceProduct.image.isnot(None))
+            .group_by(MarketplaceProduct.image)
+            .all()
+        )
+        return Counter({image: count for image, count in rows})
+
+    def collect_garbage(self, db: Session, grace_seconds: float = UPLOAD_GC_GRACE_HOURS * 3600, dry_run: bool = False) -> list[str]:
+        """
+        Hapus file store yang tidak direferensikan produk mana pun, beserta
+        turunannya (thumbnail).
+
+        Args:
+            db: Session database
+            grace_seconds: File yang lebih baru dari ini tidak dihapus (baru
+                di-upload, produknya belum dibuat)
+            dry_run: Hanya laporkan, jangan hapus
+
+        Returns:
+            Daftar file yang (akan) dihapus
+        """
+        from services.image_derivatives import derivative_directory
+
+        references = self.reference_counts(db)
+        cutoff = time.time() - grace_seconds
+        orphans = [
+            name for name in self.stored_files()
+            if references[name] == 0 and (self.root / name).stat().st_mtime < cutoff
+        ]
+
+        if not dry_run:
+            for name in orphans:
+                (self.root / name).unlink(missing_ok=True)
+                shutil.rmtree(derivative_directory(name, self.root), ignore_errors=True)
+            self._remove_stale_temp_files(cutoff)
+        return orphans
+
+    def _remove_stale_temp_files(self, cutoff: float) -> None:
+        temp_directory = self.root / TEMP_DIRNAME
+        if temp_directory.exists():
+            for path in temp_directory.iterdir():
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
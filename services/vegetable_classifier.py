@@ -1,31 +1,62 @@
 """
-Layanan klasifikasi sayur menggunakan TFLite model.
+Layanan klasifikasi sayur menggunakan model MobileNetV2 (Keras atau TFLite).
 """
 
+import hashlib
 import os
+import random
+import threading
 from typing import Any
 import numpy as np
-import cv2
-import tensorflow as tf
 from pathlib import Path
 
+from config.inference import BACKEND, INFERENCE_SERVER_ADDRESS, MAX_BATCH_SIZE, MODEL_PATH, MODEL_VERSION
+from services.image_decode import decode_image, read_image
+from services.inference_backends import create_backend
+from services.preprocess_cache import get_preprocess_cache
+from services.preprocessing import IMAGE_SIZE, preprocess_image
+from services.timing import stage
+
+
+def artifact_digest(model_path: str) -> str | None:
+    """8 hex pertama SHA-256 file model, atau None jika bukan file."""
+    if not os.path.isfile(model_path):
+        return None
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()[:8]
+
 
 class VegetableClassifier:
     """Layanan untuk klasifikasi keutuhan sayur (Utuh/Tidak Utuh)."""
 
-    def __init__(self, model_path: str = "models/model_mobilenetv2_classifier.keras"):
+    def __init__(
+        self,
+        model_path: str = MODEL_PATH,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        backend: str = BACKEND,
+        model_version: str | None = MODEL_VERSION,
+    ):
         """
-        Inisialisasi classifier dengan Keras model.
+        Inisialisasi classifier dengan backend inferensi yang dipilih.
 
         Args:
             model_path: Path ke file Keras model (.keras)
+            max_batch_size: Jumlah gambar maksimal per forward pass
+            backend: keras, tflite-fp16, atau tflite-int8
+            model_version: Label versi; default dari nama file, backend, dan
+                hash isi artefak (file berbeda dengan nama sama tetap beda)
         """
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(f"Model tidak ditemukan di {model_path}")
-
         self.model_path = model_path
-        # Load keras model
-        self.model = tf.keras.models.load_model(model_path)
+        self.max_batch_size = max(1, max_batch_size)
+        self.backend = create_backend(backend, model_path)
+        if model_version is None:
+            digest = artifact_digest(model_path)
+            model_version = f"{Path(model_path).stem}-{self.backend.name}" + (f"-{digest}" if digest else "")
+        self.model_version = model_version
+        self.warmed_up = False
 
         # class labels
         self.class_labels = ["Utuh", "Tidak Utuh"]
@@ -40,50 +71,91 @@ class VegetableClassifier:
         Returns:
             Gambar yang sudah di-preprocess dalam format float32 (0-1)
         """
-        # 1. Resize ke 224 × 224 piksel
-        image = cv2.resize(image, (224, 224))
+        with stage("preprocess"):
+            return preprocess_image(image)
+
+    def warmup(self) -> None:
+        """
+        Jalankan preprocessing dan satu forward pass dummy 224 × 224 agar
+        graph tracing / alokasi tensor (dan kompilasi XLA per bucket batch)
+        terjadi sebelum request pertama.
+        """
+        dummy = np.zeros((IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.uint8)
+        self.predict_tensor(np.expand_dims(self.preprocess_image(dummy), axis=0))
+        # backend keras + XLA: kompilasi setiap bucket batch di sini
+        backend_warmup = getattr(self.backend, "warmup", None)
+        if backend_warmup is not None:
+            backend_warmup()
+        self.warmed_up = True
 
-        # 2. BGR → RGB conversion
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    def load_image(self, image_path: str) -> np.ndarray:
+        """
+        Baca gambar dari disk dalam format BGR (JPEG besar di-decode pada
+        skala yang lebih kecil).
 
-        # 3. Normalisasi awal 0-1
-        img = image.astype(np.float32) / 255.0
+        Raises:
+            ValueError: Jika gambar tidak bisa dibaca
+        """
+        with stage("decode"):
+            image = read_image(image_path)
+        if image is None:
+            raise ValueError(f"Tidak bisa membaca gambar dari {image_path}")
+        return image
 
-        # 4. Brightness & Contrast Adjustment
-        img_tf = tf.constant(img)
-        brightness_delta = 0.1
-        img_tf = tf.image.adjust_brightness(img_tf, brightness_delta)
-        contrast_factor = 1.3
-        img_tf = tf.image.adjust_contrast(img_tf, contrast_factor)
-        img = img_tf.numpy()
-        img = np.clip(img, 0, 1)
+    def decode_image(self, data: bytes | bytearray | memoryview) -> np.ndarray:
+        """
+        Decode gambar langsung dari memori (tanpa file sementara). JPEG besar
+        di-decode pada skala yang lebih kecil (lihat services/image_decode.py).
+
+        Args:
+            data: Isi file gambar (bytes atau buffer apa pun); tidak disalin
 
-        # 5. Histogram Equalization pada Kanal V (HSV)
-        from skimage.color import rgb2hsv, hsv2rgb
-        from skimage import exposure
+        Returns:
+            Gambar dalam format BGR
 
-        img_hsv = rgb2hsv(img)
-        v_channel = img_hsv[:, :, 2]
-        v_channel_eq = exposure.equalize_adapthist(v_channel)
-        img_hsv[:, :, 2] = v_channel_eq
-        img = hsv2rgb(img_hsv)
+        Raises:
+            ValueError: Jika data bukan gambar yang valid
+        """
+        with stage("decode"):
+            image = decode_image(data)
+        if image is None:
+            raise ValueError("Tidak bisa membaca gambar dari file yang diunggah")
+        return image
 
-        # 6. Saturation Enhancement
-        img_hsv_final = rgb2hsv(img)
-        saturation_boost = 1.2
-        img_hsv_final[:, :, 1] = np.clip(
-            img_hsv_final[:, :, 1] * saturation_boost, 0, 1
-        )
-        img = hsv2rgb(img_hsv_final)
+    def format_result(self, probabilities: np.ndarray) -> dict[str, Any]:
+        """Ubah output softmax (2,) menjadi dictionary hasil prediksi."""
+        predicted_class_idx = int(np.argmax(probabilities))
+        confidence = float(probabilities[predicted_class_idx])
 
-        return np.clip(img, 0, 1).astype(np.float32)
+        return {
+            "prediction": self.class_labels[predicted_class_idx],
+            "confidence": confidence,
+            "class_probabilities": {
+                "utuh": float(probabilities[0]),
+                "tidak_utuh": float(probabilities[1]),
+            },
+            "model_version": self.model_version,
+        }
 
-    def predict(self, image_path: str) -> dict[str, Any]:
+    def predict_tensor(self, batch: np.ndarray) -> np.ndarray:
         """
-        Prediksi keutuhan sayur dari gambar.
+        Satu forward pass model untuk batch yang sudah di-preprocess.
 
         Args:
-            image_path: Path ke file gambar
+            batch: Array float32 (N, 224, 224, 3)
+
+        Returns:
+            Array probabilitas (N, 2)
+        """
+        with stage("inference"):
+            return self.backend.predict(batch)
+
+    def predict_image(self, image: np.ndarray) -> dict[str, Any]:
+        """
+        Prediksi keutuhan sayur dari gambar yang sudah di-decode.
+
+        Args:
+            image: Gambar dalam format BGR
 
         Returns:
             Dictionary berisi:
@@ -91,60 +163,226 @@ class VegetableClassifier:
             - confidence: Confidence score (0-1)
             - class_probabilities: Probabilitas untuk setiap kelas
         """
-        # load dan preprocess gambar
-        image = cv2.imread(image_path)
-        if image is None:
-            raise ValueError(f"Tidak bisa membaca gambar dari {image_path}")
-
         processed_image = self.preprocess_image(image)
 
         # Add batch dimension: (224, 224, 3) → (1, 224, 224, 3)
         input_data = np.expand_dims(processed_image, axis=0)
 
-        # Run prediction using Keras model
-        predictions = self.model.predict(input_data, verbose=0)
-        
-        # Parse results
-        probabilities = predictions[0]  # (2,) array
-        predicted_class_idx = np.argmax(probabilities)
-        confidence = float(probabilities[predicted_class_idx])
+        probabilities = self.predict_tensor(input_data)[0]
+        return self.format_result(probabilities)
 
-        return {
-            "prediction": self.class_labels[predicted_class_idx],
-            "confidence": confidence,
-            "class_probabilities": {
-                "utuh": float(probabilities[0]),
-                "tidak_utuh": float(probabilities[1]),
-            },
-        }
+    def predict_bytes(self, data: bytes | bytearray | memoryview) -> dict[str, Any]:
+        """
+        Prediksi keutuhan sayur dari isi file gambar di memori.
 
-    def predict_batch(self, image_paths: list) -> list:
+        Args:
+            data: Isi file gambar
+
+        Returns:
+            Dictionary hasil prediksi (lihat predict_image)
+        """
+        return self.predict_image(self.decode_image(data))
+
+    def predict(self, image_path: str) -> dict[str, Any]:
+        """
+        Prediksi keutuhan sayur dari gambar.
+
+        Args:
+            image_path: Path ke file gambar
+
+        Returns:
+            Dictionary hasil prediksi (lihat predict_image)
+        """
+        return self.predict_image(self.load_image(image_path))
+
+    def predict_batch(self, image_paths: list, max_batch_size: int | None = None) -> list:
         """
         Prediksi batch gambar sekaligus.
 
+        Gambar di-decode dan di-preprocess satu per satu, lalu ditumpuk menjadi
+        satu tensor (N, 224, 224, 3) sehingga model hanya dijalankan sekali per
+        chunk ``max_batch_size``. Gambar yang gagal dibaca tidak menggagalkan
+        gambar lain dalam batch. Jika PREPROCESS_CACHE_DIR diisi, tensor
+        hasil preprocessing diambil dari / disimpan ke cache di disk.
+
         Args:
             image_paths: List of paths ke gambar
+            max_batch_size: Override ukuran chunk (default: self.max_batch_size)
+
+        Returns:
+            List of prediction results (urutan sama dengan image_paths)
+        """
+        return self._predict_many(image_paths, self.load_image, max_batch_size)
+
+    def predict_batch_bytes(self, contents: list, max_batch_size: int | None = None) -> list:
+        """
+        Sama dengan predict_batch, tetapi untuk isi file gambar di memori.
+
+        Args:
+            contents: List isi file gambar (bytes)
+            max_batch_size: Override ukuran chunk (default: self.max_batch_size)
 
         Returns:
-            List of prediction results
+            List of prediction results (urutan sama dengan contents)
+        """
+        return self._predict_many(contents, self.decode_image, max_batch_size)
+
+    def _preprocess_source(self, source, load, cache) -> np.ndarray:
         """
-        results = []
-        for image_path in image_paths:
+        Tensor preprocessing untuk satu path/isi file, lewat cache
+        preprocessing jika dikonfigurasi (PREPROCESS_CACHE_DIR).
+        """
+        if cache is None:
+            return self.preprocess_image(load(source))
+        if isinstance(source, str):
+            try:
+                source = np.fromfile(source, dtype=np.uint8)
+            except OSError:
+                raise ValueError(f"Tidak bisa membaca gambar dari {source}")
+        return cache.get_or_compute(source, lambda data: self.preprocess_image(self.decode_image(data)))
+
+    def _predict_many(self, sources: list, load, max_batch_size: int | None) -> list:
+        chunk_size = max(1, max_batch_size or self.max_batch_size)
+        cache = get_preprocess_cache()
+        results: list = [None] * len(sources)
+
+        for start in range(0, len(sources), chunk_size):
+            chunk = sources[start : start + chunk_size]
+            batch = np.empty((len(chunk), IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.float32)
+            indices = []
+
+            for offset, source in enumerate(chunk):
+                try:
+                    batch[len(indices)] = self._preprocess_source(source, load, cache)
+                    indices.append(start + offset)
+                except Exception as e:
+                    results[start + offset] = {"status": "error", "message": str(e)}
+
+            if not indices:
+                continue
+
             try:
-                result = self.predict(image_path)
-                results.append({"status": "success", **result})
+                probabilities = self.predict_tensor(batch[: len(indices)])
             except Exception as e:
-                results.append({"status": "error", "message": str(e)})
+                for index in indices:
+                    results[index] = {"status": "error", "message": str(e)}
+                continue
+
+            for index, probs in zip(indices, probabilities, strict=True):
+                results[index] = {"status": "success", **self.format_result(probs)}
+
         return results
 
 
+class RemoteClassifier(VegetableClassifier):
+    """
+    Classifier tanpa model lokal: decode dan preprocessing tetap di proses
+    ini, forward pass dijalankan worker inferensi terpisah lewat shared memory
+    (lihat services/inference_worker.py).
+    """
+
+    def __init__(
+        self,
+        addresses: list[str] = INFERENCE_SERVER_ADDRESS,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        **backend_options,
+    ):
+        """
+        Args:
+            addresses: Alamat worker inferensi (host:port atau path unix socket)
+            max_batch_size: Jumlah gambar maksimal per forward pass
+            **backend_options: Diteruskan ke RemoteBackend (authkey, lanes, slots)
+        """
+        from services.inference_worker import RemoteBackend
+
+        self.model_path = None
+        self.max_batch_size = max(1, max_batch_size)
+        self.backend = RemoteBackend(addresses, **backend_options)
+        self.model_version = self.backend.model_version
+        self.warmed_up = False
+
+        # class labels
+        self.class_labels = ["Utuh", "Tidak Utuh"]
+
+
 # global classifier instance (lazy loading)
 _classifier = None
+_classifier_lock = threading.Lock()
 
+# A/B: kandidat dan fraksi traffic-nya (diatur lewat services/model_registry.py)
+_candidate = None
+_candidate_weight = 0.0
 
-def get_classifier() -> VegetableClassifier:
-    """Get atau inisialisasi classifier instance."""
+
+def get_primary_classifier() -> VegetableClassifier:
+    """Get atau inisialisasi classifier utama."""
     global _classifier
     if _classifier is None:
-        _classifier = VegetableClassifier()
+        # lock: warm-up saat startup dan request pertama bisa bersamaan
+        with _classifier_lock:
+            if _classifier is None:
+                if INFERENCE_SERVER_ADDRESS:
+                    _classifier = RemoteClassifier()
+                else:
+                    _classifier = VegetableClassifier()
     return _classifier
+
+
+def get_classifier() -> VegetableClassifier:
+    """
+    Classifier untuk satu request: kandidat dengan peluang _candidate_weight,
+    selain itu classifier utama.
+    """
+    candidate = _candidate
+    if candidate is not None and random.random() < _candidate_weight:
+        return candidate
+    return get_primary_classifier()
+
+
+def swap_classifier(classifier: VegetableClassifier) -> VegetableClassifier | None:
+    """Ganti classifier utama secara atomik; kembalikan classifier lama."""
+    global _classifier
+    with _classifier_lock:
+        previous, _classifier = _classifier, classifier
+    return previous
+
+
+def set_candidate(classifier: VegetableClassifier | None, weight: float = 0.0) -> VegetableClassifier | None:
+    """Pasang (atau lepas, jika None) kandidat A/B; kembalikan kandidat lama."""
+    global _candidate, _candidate_weight
+    with _classifier_lock:
+        previous = _candidate
+        _candidate = classifier
+        _candidate_weight = weight if classifier is not None else 0.0
+    return previous
+
+
+def set_candidate_weight(weight: float) -> None:
+    """Ubah fraksi traffic kandidat (0-1)."""
+    global _candidate_weight
+    with _classifier_lock:
+        _candidate_weight = weight if _candidate is not None else 0.0
+
+
+def promote_candidate() -> VegetableClassifier | None:
+    """
+    Jadikan kandidat classifier utama.
+
+    Returns:
+        Classifier utama lama
+
+    Raises:
+        RuntimeError: Jika tidak ada kandidat
+    """
+    global _classifier, _candidate, _candidate_weight
+    with _classifier_lock:
+        if _candidate is None:
+            raise RuntimeError("Tidak ada model kandidat")
+        previous = _classifier
+        _classifier, _candidate, _candidate_weight = _candidate, None, 0.0
+    return previous
+
+
+def is_classifier_loaded() -> bool:
+    """Apakah classifier global sudah dimuat dan di-warm-up."""
+    return _classifier is not None and _classifier.warmed_up
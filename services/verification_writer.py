@@ -0,0 +1,203 @@
+"""
+Write-behind untuk hasil verifikasi sayur (tabel verification_results).
+
+/marketplace/verify-vegetable tidak menunggu commit database: hasil
+verifikasi dimasukkan ke antrean dan thread writer menyimpannya dengan
+satu batch INSERT setiap ``flush_interval_ms`` atau setiap ``max_batch``
+baris. Client menerima ``verification_key`` dan bisa mengambil
+``verification_id`` lewat lookup setelah baris tersimpan.
+"""
+
+import queue
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import insert
+
+from app.models.verification_result import VerificationResult
+from config.database import SessionLocal
+from config.inference import VERIFICATION_FLUSH_INTERVAL_MS, VERIFICATION_FLUSH_MAX_ROWS
+from services.metrics import registry
+
+_STOP = object()
+
+PENDING_ROWS = registry.gauge(
+    "verification_write_pending", "Hasil verifikasi yang belum tersimpan ke database"
+)
+FLUSHED_ROWS = registry.counter(
+    "verification_write_rows_total", "Hasil verifikasi yang tersimpan lewat write-behind"
+)
+FAILED_ROWS = registry.counter(
+    "verification_write_failed_total", "Hasil verifikasi yang gagal disimpan"
+)
+
+
+class VerificationWriter:
+    """
+    Antrean write-behind untuk VerificationResult.
+
+    ``submit`` tidak pernah menyentuh database. ``flush`` menyimpan semua
+    yang sudah mengantre secara sinkron (dipakai saat lookup dan shutdown).
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        flush_interval_ms: float = VERIFICATION_FLUSH_INTERVAL_MS,
+        max_batch: int = VERIFICATION_FLUSH_MAX_ROWS,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = max(0.0, flush_interval_ms) / 1000.0
+        self.max_batch = max(1, max_batch)
+        self._queue: queue.Queue = queue.Queue()
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._pending_lock = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Jalankan thread writer (idempotent)."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="verification-writer", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Hentikan writer setelah semua antrean tersimpan (graceful shutdown)."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+        self.flush()
+
+    def submit(self, request_key: str, row: dict[str, Any]) -> None:
+        """
+        Masukkan satu hasil verifikasi ke antrean.
+
+        Args:
+            request_key: Key unik yang dikembalikan ke client
+            row: Kolom VerificationResult (resident_id, image, result, ...)
+        """
+        self.start()
+        row = {**row, "request_key": request_key}
+        with self._pending_lock:
+            self._pending[request_key] = row
+            PENDING_ROWS.set(len(self._pending))
+        self._queue.put(row)
+
+    def is_pending(self, request_key: str) -> bool:
+        """Apakah hasil verifikasi masih di antrean (belum tersimpan)."""
+        with self._pending_lock:
+            return request_key in self._pending
+
+    def flush(self, timeout: float = 5.0) -> int:
+        """
+        Simpan semua yang sudah mengantre sekarang juga, lalu tunggu batch
+        yang sedang dikumpulkan thread writer ikut tersimpan.
+
+        Returns:
+            Jumlah baris yang tersimpan oleh pemanggilan ini
+        """
+        with self._pending_lock:
+            waiting_for = set(self._pending)
+
+        rows = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # biarkan thread writer tetap melihat sinyal berhenti
+                self._queue.put(_STOP)
+                break
+            rows.append(item)
+        written = self._write(rows)
+
+        with self._pending_lock:
+            self._pending_lock.wait_for(
+                lambda: waiting_for.isdisjoint(self._pending), timeout=timeout
+            )
+        return written
+
+    def _write(self, rows: list[dict[str, Any]]) -> int:
+        if not rows:
+            return 0
+        with self._flush_lock:
+            try:
+                written = self._insert(rows)
+            except Exception as e:
+                print(f"[WARN] Batch hasil verifikasi gagal disimpan, coba per baris: {e}")
+                written = 0
+                for row in rows:
+                    try:
+                        written += self._insert([row])
+                    except Exception as row_error:
+                        FAILED_ROWS.inc()
+                        print(f"[WARN] Hasil verifikasi {row['request_key']} dibuang: {row_error}")
+
+            with self._pending_lock:
+                for row in rows:
+                    self._pending.pop(row["request_key"], None)
+                PENDING_ROWS.set(len(self._pending))
+                self._pending_lock.notify_all()
+        FLUSHED_ROWS.inc(written)
+        return written
+
+    def _insert(self, rows: list[dict[str, Any]]) -> int:
+        db = self.session_factory()
+        try:
+            db.execute(insert(VerificationResult), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return len(rows)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+
+            rows = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(rows) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                rows.append(item)
+
+            self._write(rows)
+
+
+# global writer instance (lazy loading)
+_writer = None
+
+
+def get_verification_writer() -> VerificationWriter:
+    """Get atau inisialisasi writer hasil verifikasi."""
+    global _writer
+    if _writer is None:
+        _writer = VerificationWriter()
+    return _writer
+
+
+def shutdown_verification_writer(timeout: float | None = 10) -> None:
+    """Drain antrean saat aplikasi berhenti (tanpa membuat writer baru)."""
+    if _writer is not None:
+        _writer.stop(timeout)
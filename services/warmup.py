@@ -0,0 +1,82 @@
+"""
+Warm-up model saat startup dan status readiness untuk /health/ready.
+"""
+
+import sys
+import threading
+import time
+
+from config.inference import INFERENCE_ENABLED, WARMUP_ENABLED
+
+_state = {"status": "idle", "error": None, "duration_seconds": None}
+_thread: threading.Thread | None = None
+
+
+def get_classifier():
+    """Import lazy agar modul ini tidak memuat stack ML saat startup."""
+    from services.vegetable_classifier import get_classifier
+
+    return get_classifier()
+
+
+def is_classifier_loaded() -> bool:
+    """Cek classifier global tanpa memicu import stack ML."""
+    module = sys.modules.get("services.vegetable_classifier")
+    return module is not None and module.is_classifier_loaded()
+
+
+def _run_warmup() -> None:
+    start = time.perf_counter()
+    try:
+        classifier = get_classifier()
+        if not classifier.warmed_up:
+            classifier.warmup()
+        _state["status"] = "ready"
+    except Exception as e:
+        _state["status"] = "failed"
+        _state["error"] = str(e)
+        print(f"[WARN] Warm-up model gagal: {e}")
+    finally:
+        _state["duration_seconds"] = round(time.perf_counter() - start, 3)
+
+
+def start_warmup(background: bool = True) -> None:
+    """
+    Muat model dan jalankan forward pass dummy.
+
+    Args:
+        background: Jalankan di thread terpisah agar /health/live tetap
+            bisa menjawab selama model dimuat
+    """
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+
+    _state.update(status="loading", error=None, duration_seconds=None)
+    if background:
+        _thread = threading.Thread(target=_run_warmup, name="model-warmup", daemon=True)
+        _thread.start()
+    else:
+        _run_warmup()
+
+
+def readiness() -> dict:
+    """
+    Status readiness layanan inferensi.
+
+    Jika warm-up tidak diaktifkan (INFERENCE_WARMUP=false), model dimuat
+    secara lazy pada request pertama dan layanan selalu dianggap siap.
+    Worker tanpa inferensi (INFERENCE_ENABLED=false) tidak pernah menjalankan
+    warm-up dan juga selalu siap.
+    """
+    if not INFERENCE_ENABLED:
+        return {"ready": True, "model": "disabled"}
+    if not WARMUP_ENABLED:
+        return {"ready": True, "model": "ready" if is_classifier_loaded() else "lazy"}
+
+    return {
+        "ready": _state["status"] == "ready",
+        "model": _state["status"],
+        "error": _state["error"],
+        "warmup_seconds": _state["duration_seconds"],
+    }
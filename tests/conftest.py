@@ -88,3 +88,18 @@ def test_admin_user(db: Session):
     db.commit()
     db.refresh(user)
     return user
+
+
+@pytest.fixture(scope="session")
+def tiny_model_path(tmp_path_factory) -> str:
+    """Keras model kecil dengan input/output sama seperti MobileNetV2 classifier"""
+    tf = pytest.importorskip("tensorflow")
+
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(224, 224, 3)),
+        tf.keras.layers.GlobalAveragePooling2D(),
+        tf.keras.layers.Dense(2, activation="softmax"),
+    ])
+    model_path = tmp_path_factory.mktemp("models") / "tiny_classifier.keras"
+    model.save(model_path)
+    return str(model_path)
@@ -0,0 +1,107 @@
+"""
+Tests untuk micro-batching inferensi (services/batching.py)
+"""
+import threading
+
+import numpy as np
+import pytest
+
+from services.batching import BATCH_SIZE, MicroBatcher
+
+
+class FakeClassifier:
+    """Classifier palsu: probabilitas 'utuh' = nilai piksel pertama tensor"""
+
+    def __init__(self, fail: bool = False):
+        self.batch_sizes = []
+        self.fail = fail
+
+    def predict_tensor(self, batch):
+        self.batch_sizes.append(len(batch))
+        if self.fail:
+            raise RuntimeError("model error")
+        first = batch[:, 0, 0, 0]
+        return np.stack([first, 1 - first], axis=1)
+
+
+def make_tensor(value: float) -> np.ndarray:
+    return np.full((224, 224, 3), value, dtype=np.float32)
+
+
+def test_flushes_when_batch_is_full():
+    classifier = FakeClassifier()
+    batcher = MicroBatcher(classifier, max_batch=4, max_wait_ms=5000)
+    try:
+        futures = [batcher.submit(make_tensor(i / 10)) for i in range(4)]
+        results = [f.result(timeout=2) for f in futures]
+    finally:
+        batcher.stop(timeout=2)
+
+    assert classifier.batch_sizes == [4]
+    # setiap pemanggil menerima hasilnya sendiri
+    for i, probs in enumerate(results):
+        assert probs[0] == pytest.approx(i / 10)
+
+
+def test_flushes_partial_batch_after_deadline():
+    classifier = FakeClassifier()
+    batcher = MicroBatcher(classifier, max_batch=8, max_wait_ms=20)
+    count_before = BATCH_SIZE.count
+    try:
+        probs = batcher.submit(make_tensor(0.7)).result(timeout=2)
+    finally:
+        batcher.stop(timeout=2)
+
+    assert classifier.batch_sizes == [1]
+    assert probs[0] == pytest.approx(0.7)
+    assert BATCH_SIZE.count == count_before + 1
+
+
+def test_concurrent_callers_are_coalesced():
+    classifier = FakeClassifier()
+    batcher = MicroBatcher(classifier, max_batch=16, max_wait_ms=200)
+    results = {}
+
+    def worker(i):
+        results[i] = batcher.submit(make_tensor(i / 20)).result(timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        batcher.stop(timeout=2)
+
+    assert sum(classifier.batch_sizes) == 16
+    assert len(classifier.batch_sizes) < 16
+    for i, probs in results.items():
+        assert probs[0] == pytest.approx(i / 20)
+
+
+def test_model_error_propagates_to_every_caller():
+    batcher = MicroBatcher(FakeClassifier(fail=True), max_batch=2, max_wait_ms=5000)
+    try:
+        futures = [batcher.submit(make_tensor(0.1)) for _ in range(2)]
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result(timeout=2)
+    finally:
+        batcher.stop(timeout=2)
+
+
+def test_stopped_batcher_runs_late_submits_without_new_thread():
+    from services.batching import get_batcher, retire_batcher
+
+    classifier = FakeClassifier()
+    batcher = get_batcher(classifier)
+    batcher.submit(make_tensor(0.2)).result(timeout=2)
+
+    retire_batcher(classifier, timeout=2)
+    # request yang memegang batcher lama sebelum swap
+    probs = batcher.submit(make_tensor(0.6)).result(timeout=2)
+
+    assert probs[0] == pytest.approx(0.6)
+    assert batcher._thread is None
+    assert get_batcher(classifier) is classifier
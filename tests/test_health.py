@@ -0,0 +1,91 @@
+"""
+Tests untuk warm-up model dan endpoint /health
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import routes.health as health_router
+import services.warmup as warmup
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(health_router.router)
+    return TestClient(app)
+
+
+class FakeClassifier:
+    def __init__(self):
+        self.warmed_up = False
+
+    def warmup(self):
+        self.warmed_up = True
+
+
+def test_live_always_ok(client):
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_ready_without_warmup_is_lazy(client, monkeypatch):
+    monkeypatch.setattr(warmup, "WARMUP_ENABLED", False)
+
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+
+
+def test_ready_when_inference_disabled_ignores_warmup(client, monkeypatch):
+    # worker CRUD saja: lifespan tidak pernah memulai warm-up
+    monkeypatch.setattr(warmup, "INFERENCE_ENABLED", False)
+    monkeypatch.setattr(warmup, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(warmup, "_state", dict(warmup._state, status="idle"))
+
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json() == {"ready": True, "model": "disabled"}
+
+
+def test_ready_is_503_until_model_is_warm(client, monkeypatch):
+    fake = FakeClassifier()
+    monkeypatch.setattr(warmup, "INFERENCE_ENABLED", True)
+    monkeypatch.setattr(warmup, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(warmup, "get_classifier", lambda: fake)
+    monkeypatch.setattr(warmup, "_state", dict(warmup._state, status="loading"))
+
+    assert client.get("/health/ready").status_code == 503
+
+    warmup.start_warmup(background=False)
+
+    response = client.get("/health/ready")
+    assert fake.warmed_up is True
+    assert response.status_code == 200
+    assert response.json()["model"] == "ready"
+
+
+def test_ready_reports_failed_warmup(client, monkeypatch):
+    def broken():
+        raise FileNotFoundError("Model tidak ditemukan")
+
+    monkeypatch.setattr(warmup, "INFERENCE_ENABLED", True)
+    monkeypatch.setattr(warmup, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(warmup, "get_classifier", broken)
+    monkeypatch.setattr(warmup, "_state", dict(warmup._state))
+    warmup.start_warmup(background=False)
+
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["model"] == "failed"
+    assert "Model tidak ditemukan" in response.json()["error"]
+
+
+def test_classifier_warmup_runs_forward_pass(tiny_model_path):
+    from services.vegetable_classifier import VegetableClassifier
+
+    classifier = VegetableClassifier(model_path=tiny_model_path)
+    assert classifier.warmed_up is False
+    classifier.warmup()
+    assert classifier.warmed_up is True
@@ -0,0 +1,68 @@
+"""
+Tests untuk decode JPEG dengan downscaling (services/image_decode.py)
+"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+# modul ini meng-import cv2: harus setelah importorskip
+from services.image_decode import decode_image, jpeg_size, read_image, reduced_decode_flag  # noqa: E402
+from services.preprocessing import preprocess_image  # noqa: E402
+
+SAMPLE_IMAGE = sorted((Path(__file__).parent.parent / "uploads").glob("*.png"))[0]
+
+
+def camera_jpeg(width: int = 4000, height: int = 3000, progressive: int = 0) -> bytes:
+    """Foto besar sintetis: gambar contoh di-upscale lalu di-encode JPEG"""
+    image = cv2.resize(cv2.imread(str(SAMPLE_IMAGE)), (width, height), interpolation=cv2.INTER_CUBIC)
+    flags = [cv2.IMWRITE_JPEG_QUALITY, 90, cv2.IMWRITE_JPEG_PROGRESSIVE, progressive]
+    ok, encoded = cv2.imencode(".jpg", image, flags)
+    assert ok
+    return encoded.tobytes()
+
+
+@pytest.mark.parametrize("progressive", [0, 1])
+def test_jpeg_size_reads_header(progressive):
+    data = camera_jpeg(640, 480, progressive=progressive)
+    assert jpeg_size(data) == (640, 480)
+
+
+def test_jpeg_size_rejects_other_formats():
+    ok, png = cv2.imencode(".png", np.zeros((8, 8, 3), dtype=np.uint8))
+    assert jpeg_size(png.tobytes()) is None
+    assert jpeg_size(b"\xff\xd8\xff") is None
+
+
+@pytest.mark.parametrize("size,flag", [
+    ((4000, 3000), cv2.IMREAD_REDUCED_COLOR_8),
+    ((1920, 1080), cv2.IMREAD_REDUCED_COLOR_4),
+    ((1000, 800), cv2.IMREAD_REDUCED_COLOR_2),
+    ((300, 300), cv2.IMREAD_COLOR),
+])
+def test_reduced_flag_keeps_short_side_above_target(size, flag):
+    assert reduced_decode_flag(*size) == flag
+
+
+def test_large_jpeg_decoded_at_reduced_scale_with_parity():
+    data = camera_jpeg()
+
+    reduced = decode_image(data)
+    full = decode_image(data, reduced=False)
+
+    assert full.shape == (3000, 4000, 3)
+    assert reduced.shape == (375, 500, 3)
+
+    diff = np.abs(preprocess_image(full) - preprocess_image(reduced))
+    assert diff.mean() < 0.01
+    assert np.percentile(diff, 99) < 0.08
+
+
+def test_read_image_from_disk(tmp_path):
+    path = tmp_path / "foto.jpg"
+    path.write_bytes(camera_jpeg(2000, 1500))
+
+    assert read_image(str(path)).shape == (375, 500, 3)
+    assert read_image(str(tmp_path / "tidak-ada.jpg")) is None
@@ -0,0 +1,127 @@
+"""
+Tests untuk thumbnail dan turunan gambar produk (services/image_derivatives.py)
+"""
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# cv2 hanya di-import lazy di dalam generate_derivatives
+from services.image_derivatives import derivative_urls, generate_derivatives
+
+cv2 = pytest.importorskip("cv2")
+
+SAMPLE_IMAGE = sorted((Path(__file__).parent.parent / "uploads").glob("*.png"))[0]
+
+
+def write_photo(directory: Path, name: str, width: int, height: int) -> bytes:
+    image = cv2.resize(cv2.imread(str(SAMPLE_IMAGE)), (width, height))
+    ok, encoded = cv2.imencode(".jpg", image)
+    (directory / name).write_bytes(encoded.tobytes())
+    return encoded.tobytes()
+
+
+def test_generates_thumbnails_and_model_copy(tmp_path):
+    write_photo(tmp_path, "foto.jpg", 2000, 1500)
+
+    assert derivative_urls("foto.jpg", tmp_path, widths=[320, 640]) is None
+    urls = generate_derivatives("foto.jpg", tmp_path, widths=[320, 640])
+
+    assert urls == derivative_urls("foto.jpg", tmp_path, widths=[320, 640])
+    assert urls["thumbnails"]["320"]["webp"] == "derivatives/foto.jpg/w320.webp"
+
+    thumbnail = cv2.imread(str(tmp_path / urls["thumbnails"]["320"]["webp"]))
+    assert thumbnail.shape[:2] == (240, 320)
+    assert cv2.imread(str(tmp_path / urls["thumbnails"]["640"]["jpeg"])).shape[1] == 640
+    assert cv2.imread(str(tmp_path / urls["model"])).shape[:2] == (224, 224)
+    assert (tmp_path / urls["thumbnails"]["320"]["webp"]).stat().st_size < (tmp_path / "foto.jpg").stat().st_size
+
+
+def test_small_image_is_not_upscaled(tmp_path):
+    write_photo(tmp_path, "kecil.jpg", 200, 150)
+
+    urls = generate_derivatives("kecil.jpg", tmp_path, widths=[320])
+    assert cv2.imread(str(tmp_path / urls["thumbnails"]["320"]["jpeg"])).shape[:2] == (150, 200)
+
+
+def test_upload_schedules_derivatives(tmp_path, monkeypatch):
+    import routes.marketplace as marketplace_router
+    from app.controllers.dependencies import get_current_user
+
+    monkeypatch.setattr(marketplace_router, "UPLOAD_DIR", tmp_path)
+    app = FastAPI()
+    app.include_router(marketplace_router.router)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(resident_id=1, role="warga")
+
+    data = write_photo(tmp_path, "asli.jpg", 1200, 900)
+    response = TestClient(app).post(
+        "/marketplace/upload-image", files={"file": ("sayur.jpg", data, "image/jpeg")}
+    )
+    assert response.status_code == 200
+
+    image_name = response.json()["image_url"]
+    product = SimpleNamespace(
+        id=1, name="Bayam", description="", price=1000, stock=1, image=image_name,
+        status="active", created_at=None, resident=None, resident_id=1, verification_id=None,
+    )
+    formatted = marketplace_router.format_product(product)
+    assert formatted["thumbnailPath"] == f"derivatives/{image_name}/w320.webp"
+    assert (tmp_path / formatted["thumbnailPath"]).exists()
+    assert formatted["modelImagePath"].endswith("model224.png")
+
+
+def test_concurrent_generation_for_same_image(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    write_photo(tmp_path, "foto.jpg", 1200, 900)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: generate_derivatives("foto.jpg", tmp_path, widths=[320]), range(4)))
+
+    assert all(urls == results[0] for urls in results)
+    directory = tmp_path / "derivatives" / "foto.jpg"
+    assert sorted(path.name for path in directory.iterdir()) == ["model224.png", "w320.jpg", "w320.webp"]
+
+
+def test_failed_encode_does_not_mark_derivatives_complete(tmp_path, monkeypatch):
+    write_photo(tmp_path, "foto.jpg", 800, 600)
+    real_imencode = cv2.imencode
+
+    def imencode(ext, image, params=()):
+        if ext == ".webp":
+            return False, None
+        return real_imencode(ext, image, params)
+
+    monkeypatch.setattr(cv2, "imencode", imencode)
+
+    assert generate_derivatives("foto.jpg", tmp_path, widths=[320]) is None
+    assert derivative_urls("foto.jpg", tmp_path, widths=[320]) is None
+
+
+def test_readiness_is_memoized(tmp_path, monkeypatch):
+    import services.image_derivatives as image_derivatives
+
+    write_photo(tmp_path, "foto.jpg", 800, 600)
+    generate_derivatives("foto.jpg", tmp_path, widths=[])
+
+    def fail_exists(self):
+        pytest.fail("exists() dipanggil untuk turunan yang sudah diketahui lengkap")
+
+    monkeypatch.setattr(image_derivatives.Path, "exists", fail_exists)
+    urls = derivative_urls("foto.jpg", tmp_path, widths=[])
+    assert urls["thumbnails"] == {}
+
+    monkeypatch.undo()
+    monkeypatch.setattr("routes.marketplace.UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr("routes.marketplace.derivative_urls", lambda name, directory: urls)
+    from routes.marketplace import format_product
+
+    product = SimpleNamespace(
+        id=1, name="Bayam", description="", price=1000, stock=1, image="foto.jpg",
+        status="active", created_at=None, resident=None, resident_id=1, verification_id=None,
+    )
+    formatted = format_product(product)
+    assert formatted["thumbnailPath"] is None
+    assert formatted["modelImagePath"] == "derivatives/foto.jpg/model224.png"
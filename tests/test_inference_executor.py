@@ -0,0 +1,104 @@
+"""
+Tests untuk executor inferensi: backpressure 503 dan event loop tidak terblokir
+"""
+import asyncio
+import threading
+import time
+from io import BytesIO
+
+import httpx
+import pytest
+from PIL import Image
+
+from services.inference_executor import ExecutorSaturated, InferenceExecutor
+
+
+def png_bytes() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (64, 64), color=(0, 200, 0)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_executor_rejects_when_full():
+    executor = InferenceExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run(release.wait))
+        second = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturated):
+            await executor.run(release.wait)
+        release.set()
+        await asyncio.gather(first, second)
+        # slot dikembalikan setelah job selesai
+        assert executor.in_flight == 0
+        assert await executor.run(lambda: "ok") == "ok"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+
+@pytest.fixture
+def slow_prediction(monkeypatch):
+    """Ganti prediksi dengan fungsi blocking 0.5 detik dan executor baru"""
+    import services.inference_executor as inference_executor
+    from app.controllers.prediction import PredictionController
+
+    def fake_predict(file_contents, filename):
+        time.sleep(0.5)
+        return {"message": "Analisis gambar berhasil", "data": {"prediction": "Utuh"}}
+
+    executor = InferenceExecutor(max_workers=2, max_queue=2)
+    monkeypatch.setattr(PredictionController, "predict", staticmethod(fake_predict))
+    monkeypatch.setattr(inference_executor, "_executor", executor)
+    yield
+    executor.shutdown()
+
+
+def test_predict_route_does_not_block_event_loop(slow_prediction):
+    from main import app
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            files = {"file": ("sayur.png", png_bytes(), "image/png")}
+            predictions = [
+                asyncio.ensure_future(client.post("/predict/", files=files))
+                for _ in range(4)
+            ]
+            await asyncio.sleep(0.05)
+
+            start = time.perf_counter()
+            me = await client.get("/auth/me")
+            me_latency = time.perf_counter() - start
+
+            responses = await asyncio.gather(*predictions)
+            return me, me_latency, responses
+
+    me, me_latency, responses = asyncio.run(scenario())
+
+    assert me.status_code == 401
+    assert me_latency < 0.3
+    assert [r.status_code for r in responses] == [200] * 4
+
+
+def test_predict_route_returns_503_when_saturated(slow_prediction):
+    from main import app
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            files = {"file": ("sayur.png", png_bytes(), "image/png")}
+            return await asyncio.gather(
+                *[client.post("/predict/", files=files) for _ in range(6)]
+            )
+
+    responses = asyncio.run(scenario())
+    rejected = [r for r in responses if r.status_code == 503]
+
+    # kapasitas 2 berjalan + 2 mengantre → 2 request ditolak
+    assert len(rejected) == 2
+    assert all(r.headers["Retry-After"] == "1" for r in rejected)
@@ -0,0 +1,72 @@
+"""
+Tests untuk worker inferensi terpisah (services/inference_worker.py)
+"""
+import threading
+
+import numpy as np
+import pytest
+
+from services.inference_worker import InferenceWorker, RemoteBackend, RemoteInferenceError
+
+AUTHKEY = "test-authkey"
+
+
+class FakeClassifier:
+    """Probabilitas 'utuh' = nilai piksel pertama tensor"""
+
+    model_version = "fake-v1"
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_tensor(self, batch):
+        self.batch_sizes.append(len(batch))
+        first = batch[:, 0, 0, 0]
+        if np.any(first < 0):
+            raise ValueError("tensor tidak valid")
+        return np.stack([first, 1 - first], axis=1)
+
+
+@pytest.fixture
+def worker(tmp_path):
+    worker = InferenceWorker(
+        str(tmp_path / "inference.sock"), authkey=AUTHKEY, classifier=FakeClassifier(), micro_batch=False
+    )
+    thread = threading.Thread(target=worker.serve_forever, daemon=True)
+    thread.start()
+    yield worker
+    worker.close()
+
+
+def make_batch(values) -> np.ndarray:
+    batch = np.zeros((len(values), 224, 224, 3), dtype=np.float32)
+    batch[:, 0, 0, 0] = values
+    return batch
+
+
+def test_remote_backend_round_trip_in_chunks(worker):
+    backend = RemoteBackend([worker.address], authkey=AUTHKEY, lanes=2, slots=4)
+    try:
+        values = np.linspace(0, 1, 10, dtype=np.float32)
+        probabilities = backend.predict(make_batch(values))
+    finally:
+        backend.close()
+
+    assert backend.model_version == "fake-v1"
+    np.testing.assert_allclose(probabilities[:, 0], values)
+    assert worker.classifier.batch_sizes == [4, 4, 2]
+
+
+def test_remote_error_keeps_connection_usable(worker):
+    backend = RemoteBackend([worker.address], authkey=AUTHKEY, lanes=1, slots=4)
+    try:
+        with pytest.raises(RemoteInferenceError, match="tensor tidak valid"):
+            backend.predict(make_batch([-1.0]))
+        assert backend.predict(make_batch([0.25]))[0, 0] == pytest.approx(0.25)
+    finally:
+        backend.close()
+
+
+def test_remote_backend_requires_authkey(worker):
+    with pytest.raises(ValueError):
+        RemoteBackend([worker.address], authkey="")
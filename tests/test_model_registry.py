@@ -0,0 +1,98 @@
+"""
+Tests untuk model registry (hot swap, A/B split, versi model di hasil)
+"""
+import shutil
+
+import numpy as np
+import pytest
+
+from services.model_registry import ModelRegistry
+
+
+@pytest.fixture
+def model_directory(tiny_model_path, tmp_path):
+    shutil.copy(tiny_model_path, tmp_path / "v1.keras")
+    shutil.copy(tiny_model_path, tmp_path / "v2.keras")
+    return tmp_path
+
+
+@pytest.fixture
+def classifier_module(monkeypatch):
+    import services.vegetable_classifier as vegetable_classifier
+
+    monkeypatch.setattr(vegetable_classifier, "_classifier", None)
+    monkeypatch.setattr(vegetable_classifier, "_candidate", None)
+    monkeypatch.setattr(vegetable_classifier, "_candidate_weight", 0.0)
+    return vegetable_classifier
+
+
+def test_load_swaps_primary_after_warmup(model_directory, classifier_module):
+    registry = ModelRegistry(model_directory)
+    registry.load("v1.keras", model_version="v1", background=False)
+    first = classifier_module.get_classifier()
+    assert first.model_version == "v1" and first.warmed_up
+
+    job = registry.load("v2.keras", model_version="v2")
+    assert job["status"] == "loading"
+    assert registry.wait(timeout=60)["status"] == "ready"
+
+    assert classifier_module.get_classifier().model_version == "v2"
+    assert first.retired is True
+    assert registry.status()["primary"]["model_version"] == "v2"
+
+    result = classifier_module.get_classifier().predict_image(np.zeros((64, 64, 3), dtype=np.uint8))
+    assert result["model_version"] == "v2"
+
+
+def test_candidate_split_and_promote(model_directory, classifier_module):
+    registry = ModelRegistry(model_directory)
+    registry.load("v1.keras", model_version="v1", background=False)
+    registry.load("v2.keras", role="candidate", model_version="v2", weight=1.0, background=False)
+
+    assert classifier_module.get_classifier().model_version == "v2"
+    registry.set_weight(0.0)
+    assert classifier_module.get_classifier().model_version == "v1"
+    assert registry.status()["candidate"]["model_version"] == "v2"
+
+    registry.promote()
+    status = registry.status()
+    assert status["primary"]["model_version"] == "v2"
+    assert status["candidate"] is None
+    with pytest.raises(RuntimeError):
+        registry.promote()
+    with pytest.raises(RuntimeError):
+        registry.set_weight(0.5)
+
+
+def test_load_rejects_paths_outside_model_directory(model_directory, tiny_model_path, tmp_path_factory):
+    registry = ModelRegistry(model_directory)
+    outside = tmp_path_factory.mktemp("outside") / "evil.keras"
+    shutil.copy(tiny_model_path, outside)
+
+    with pytest.raises(ValueError):
+        registry.load(str(outside), background=False)
+    with pytest.raises(ValueError):
+        registry.load("../outside/evil.keras", background=False)
+    with pytest.raises(FileNotFoundError):
+        registry.load("missing.keras", background=False)
+    with pytest.raises(ValueError):
+        registry.load("v1.keras", role="shadow", background=False)
+
+
+def test_failed_load_keeps_current_model(model_directory, classifier_module):
+    registry = ModelRegistry(model_directory)
+    registry.load("v1.keras", model_version="v1", background=False)
+    (model_directory / "broken.keras").write_bytes(b"bukan model")
+
+    job = registry.load("broken.keras", background=False)
+    assert job["status"] == "failed" and job["error"]
+    assert classifier_module.get_classifier().model_version == "v1"
+
+
+def test_model_endpoints_require_admin():
+    from fastapi.testclient import TestClient
+    from main import app
+
+    client = TestClient(app)
+    assert client.get("/predict/models").status_code in (401, 403)
+    assert client.post("/predict/models/load", json={"model_path": "v2.keras"}).status_code in (401, 403)
@@ -15,3 +15,144 @@ def test_predict_endpoint_placeholder():
     """
     # TODO: Implement prediction tests
     pass
+
+
+@pytest.fixture
+def classifier(tiny_model_path):
+    from services.vegetable_classifier import VegetableClassifier
+
+    return VegetableClassifier(model_path=tiny_model_path, max_batch_size=4)
+
+
+@pytest.fixture
+def image_paths(tmp_path):
+    paths = []
+    for i in range(6):
+        path = tmp_path / f"sample_{i}.png"
+        Image.new("RGB", (320, 240), color=(40 * i, 120, 60)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+def test_predict_single_image(classifier, image_paths):
+    result = classifier.predict(image_paths[0])
+
+    assert result["prediction"] in ("Utuh", "Tidak Utuh")
+    assert 0.0 <= result["confidence"] <= 1.0
+    probs = result["class_probabilities"]
+    assert probs["utuh"] + probs["tidak_utuh"] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_predict_batch_matches_single(classifier, image_paths):
+    results = classifier.predict_batch(image_paths)
+
+    assert len(results) == len(image_paths)
+    for path, result in zip(image_paths, results, strict=True):
+        assert result["status"] == "success"
+        single = classifier.predict(path)
+        assert result["prediction"] == single["prediction"]
+        assert result["confidence"] == pytest.approx(single["confidence"], abs=1e-5)
+
+
+def test_predict_batch_single_forward_pass_per_chunk(classifier, image_paths, monkeypatch):
+    batch_sizes = []
+    original = classifier.predict_tensor
+
+    def spy(batch):
+        batch_sizes.append(len(batch))
+        return original(batch)
+
+    monkeypatch.setattr(classifier, "predict_tensor", spy)
+    classifier.predict_batch(image_paths)
+
+    # 6 gambar dengan max_batch_size=4 → dua forward pass
+    assert batch_sizes == [4, 2]
+
+
+def test_predict_batch_isolates_unreadable_file(classifier, image_paths, tmp_path):
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"bukan gambar")
+    paths = [image_paths[0], str(broken), image_paths[1]]
+
+    results = classifier.predict_batch(paths)
+
+    assert [r["status"] for r in results] == ["success", "error", "success"]
+    assert "Tidak bisa membaca gambar" in results[1]["message"]
+
+
+def test_predict_bytes_matches_path_api(classifier, image_paths):
+    with open(image_paths[2], "rb") as f:
+        data = f.read()
+
+    from_bytes = classifier.predict_bytes(data)
+    from_path = classifier.predict(image_paths[2])
+
+    assert from_bytes["prediction"] == from_path["prediction"]
+    assert from_bytes["confidence"] == pytest.approx(from_path["confidence"])
+
+
+def test_predict_bytes_rejects_invalid_data(classifier):
+    with pytest.raises(ValueError):
+        classifier.predict_bytes(b"bukan gambar")
+    with pytest.raises(ValueError):
+        classifier.predict_bytes(b"")
+
+
+@pytest.mark.parametrize("variant", ["fp16", "int8"])
+def test_tflite_backend_matches_keras(tiny_model_path, image_paths, variant):
+    from scripts.export_tflite import export_tflite
+    from services.vegetable_classifier import VegetableClassifier
+
+    export_tflite(tiny_model_path, variant)
+    keras_classifier = VegetableClassifier(model_path=tiny_model_path)
+    tflite_classifier = VegetableClassifier(
+        model_path=tiny_model_path, backend=f"tflite-{variant}"
+    )
+
+    for path in image_paths:
+        expected = keras_classifier.predict(path)
+        actual = tflite_classifier.predict(path)
+        assert actual["confidence"] == pytest.approx(expected["confidence"], abs=0.02)
+
+
+def test_unknown_backend_is_rejected(tiny_model_path):
+    from services.vegetable_classifier import VegetableClassifier
+
+    with pytest.raises(ValueError):
+        VegetableClassifier(model_path=tiny_model_path, backend="caffe")
+
+
+def test_onnx_backend_matches_keras(tiny_model_path, image_paths):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("tf2onnx")
+    from scripts.export_onnx import export_onnx
+    from services.vegetable_classifier import VegetableClassifier
+
+    export_onnx(tiny_model_path)
+    keras_classifier = VegetableClassifier(model_path=tiny_model_path)
+    onnx_classifier = VegetableClassifier(model_path=tiny_model_path, backend="onnx")
+
+    for path in image_paths:
+        expected = keras_classifier.predict(path)
+        actual = onnx_classifier.predict(path)
+        assert actual["confidence"] == pytest.approx(expected["confidence"], abs=1e-4)
+
+
+@pytest.mark.parametrize("xla", [False, True])
+def test_keras_serving_function_pads_to_buckets(tiny_model_path, xla):
+    import numpy as np
+    from services.inference_backends import KerasBackend
+
+    backend = KerasBackend(tiny_model_path, buckets=[1, 2, 4], xla=xla)
+    backend.warmup()
+    batch = np.random.default_rng(0).random((7, 224, 224, 3), dtype=np.float32)
+
+    outputs = backend.predict(batch)
+    expected = backend.model.predict(batch, verbose=0)
+
+    assert backend.bucket_size(3) == 4 and backend.bucket_size(9) == 4
+    assert outputs.shape == (7, 2)
+    np.testing.assert_allclose(outputs, expected, atol=1e-5)
+    np.testing.assert_allclose(backend.predict(batch[:1]), expected[:1], atol=1e-5)
+    # input_signature tetap: satu trace untuk semua ukuran batch
+    assert backend._serve.experimental_get_tracing_count() == 1
@@ -0,0 +1,88 @@
+"""
+Tests untuk cache prediksi berbasis hash isi gambar
+"""
+import time
+
+from services.prediction_cache import CACHE_HITS, CACHE_MISSES, PredictionCache
+
+RESULT = {
+    "prediction": "Utuh",
+    "confidence": 0.9,
+    "class_probabilities": {"utuh": 0.9, "tidak_utuh": 0.1},
+}
+
+
+def test_key_depends_on_content_and_model_version():
+    key = PredictionCache.make_key(b"gambar", "v1")
+
+    assert key == PredictionCache.make_key(bytearray(b"gambar"), "v1")
+    assert key != PredictionCache.make_key(b"gambar lain", "v1")
+    assert key != PredictionCache.make_key(b"gambar", "v2")
+
+
+def test_hit_and_miss_counters():
+    cache = PredictionCache(max_entries=4, ttl_seconds=60, sqlite_path=None)
+    hits, misses = CACHE_HITS.value, CACHE_MISSES.value
+
+    assert cache.get("a") is None
+    cache.set("a", RESULT)
+    assert cache.get("a") == RESULT
+
+    assert CACHE_HITS.value == hits + 1
+    assert CACHE_MISSES.value == misses + 1
+
+
+def test_lru_eviction():
+    cache = PredictionCache(max_entries=2, ttl_seconds=60, sqlite_path=None)
+    cache.set("a", RESULT)
+    cache.set("b", RESULT)
+    cache.get("a")  # a jadi paling baru dipakai
+    cache.set("c", RESULT)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == RESULT
+    assert cache.get("c") == RESULT
+
+
+def test_ttl_expiry():
+    cache = PredictionCache(max_entries=4, ttl_seconds=0.05, sqlite_path=None)
+    cache.set("a", RESULT)
+    time.sleep(0.1)
+
+    assert cache.get("a") is None
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    db_path = str(tmp_path / "predictions.sqlite3")
+    PredictionCache(max_entries=4, ttl_seconds=60, sqlite_path=db_path).set("a", RESULT)
+
+    restarted = PredictionCache(max_entries=4, ttl_seconds=60, sqlite_path=db_path)
+    assert restarted.get("a") == RESULT
+
+
+def test_controller_skips_inference_on_cache_hit(monkeypatch):
+    import app.controllers.prediction as prediction_controller
+    import services.prediction_cache as prediction_cache
+    import services.vegetable_classifier as vegetable_classifier
+
+    class FakeClassifier:
+        model_version = "fake-v1"
+        calls = 0
+
+        def predict_bytes(self, data):
+            FakeClassifier.calls += 1
+            return RESULT
+
+    monkeypatch.setattr(vegetable_classifier, "get_classifier", lambda: FakeClassifier())
+    monkeypatch.setattr(prediction_controller, "PREDICTION_CACHE_ENABLED", True)
+    monkeypatch.setattr(prediction_controller, "MICRO_BATCH_ENABLED", False)
+    monkeypatch.setattr(
+        prediction_cache, "_cache", PredictionCache(max_entries=4, ttl_seconds=60, sqlite_path=None)
+    )
+
+    first = prediction_controller.PredictionController.predict(b"foto", "a.png")
+    second = prediction_controller.PredictionController.predict(b"foto", "b.png")
+
+    assert first == second
+    assert FakeClassifier.calls == 1
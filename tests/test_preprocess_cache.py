@@ -0,0 +1,127 @@
+"""
+Tests untuk cache preprocessing di disk (float16 .npy, eviction, CLI warm)
+"""
+import os
+import time
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from services.preprocess_cache import PreprocessCache
+
+
+def png_bytes(color) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (320, 240), color=color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def tensor(seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).random((224, 224, 3), dtype=np.float32)
+
+
+def test_put_and_get_memory_mapped_float16(tmp_path):
+    cache = PreprocessCache(tmp_path, max_bytes=10 * 1024 ** 2)
+    original = tensor(0)
+    cache.put("ab" * 16, original)
+
+    cached = cache.get("ab" * 16)
+    assert isinstance(cached, np.memmap) and cached.dtype == np.float16
+    np.testing.assert_allclose(cached, original, atol=1e-3)
+    assert cache.path("ab" * 16).parent.name == "ab"
+    assert cache.get("cd" * 16) is None
+    assert cache.size_bytes == os.path.getsize(cache.path("ab" * 16))
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    entry_size = 224 * 224 * 3 * 2 + 128
+    cache = PreprocessCache(tmp_path, max_bytes=int(entry_size * 3.5))
+    keys = [f"{i:02d}" * 16 for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, tensor(i))
+        os.utime(cache.path(key), (time.time() - 100 + i, time.time() - 100 + i))
+
+    cache.get(keys[0])  # dipakai lagi: tidak dievict
+    cache.put("99" * 16, tensor(9))
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.size_bytes <= cache.max_bytes * 0.9
+
+
+def test_classifier_batch_reuses_cached_tensors(tiny_model_path, tmp_path, monkeypatch):
+    import services.vegetable_classifier as vegetable_classifier
+
+    classifier = vegetable_classifier.VegetableClassifier(model_path=tiny_model_path)
+    contents = [png_bytes((40 * i, 120, 60)) for i in range(3)]
+    expected = classifier.predict_batch_bytes(contents)
+
+    cache = PreprocessCache(tmp_path)
+    monkeypatch.setattr(vegetable_classifier, "get_preprocess_cache", lambda: cache)
+    classifier.predict_batch_bytes(contents)
+
+    # percobaan kedua: hanya gambar baru yang di-decode
+    decoded = []
+
+    def decode_image(data):
+        decoded.append(bytes(data))
+        raise ValueError("bukan gambar")
+
+    monkeypatch.setattr(classifier, "decode_image", decode_image)
+    cached = classifier.predict_batch_bytes(contents + [b"bukan gambar"])
+    assert decoded == [b"bukan gambar"]
+
+    for actual, reference in zip(cached[:3], expected, strict=True):
+        assert actual["confidence"] == pytest.approx(reference["confidence"], abs=1e-3)
+    assert cached[3]["status"] == "error"
+
+
+def test_warm_script_populates_cache(tmp_path):
+    from scripts.warm_preprocess_cache import upload_images, warm
+
+    uploads = tmp_path / "uploads"
+    uploads.mkdir()
+    (uploads / "a.png").write_bytes(png_bytes((200, 10, 10)))
+    (uploads / "rusak.jpg").write_bytes(b"bukan gambar")
+    cache = PreprocessCache(tmp_path / "cache")
+
+    statuses = [warm(cache, path) for path in upload_images(uploads)]
+    assert sorted(statuses) == ["created", "failed"]
+    assert warm(cache, uploads / "a.png") == "cached"
+
+
+def test_failed_cache_write_does_not_fail_prediction(tmp_path, monkeypatch):
+    cache = PreprocessCache(tmp_path)
+
+    def disk_full(file, array):
+        file.write(b"sebagian")
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr("services.preprocess_cache.np.save", disk_full)
+    result = cache.get_or_compute(b"gambar", lambda data: tensor(1))
+
+    assert result.shape == (224, 224, 3)
+    assert cache.get(cache.make_key(b"gambar")) is None
+    # file sementara dibersihkan
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()]
+
+
+def test_miss_and_hit_return_same_float16_tensor(tmp_path):
+    cache = PreprocessCache(tmp_path)
+
+    miss = cache.get_or_compute(b"gambar", lambda data: tensor(2))
+    hit = cache.get_or_compute(b"gambar", lambda data: pytest.fail("tensor harus dari cache"))
+
+    assert miss.dtype == hit.dtype == np.float16
+    np.testing.assert_array_equal(miss, hit)
+
+
+def test_version_changes_with_pipeline_version(monkeypatch):
+    from services import preprocessing
+    from services.preprocess_cache import preprocess_version
+
+    before = preprocess_version()
+    monkeypatch.setattr(preprocessing, "PREPROCESS_PIPELINE_VERSION", preprocessing.PREPROCESS_PIPELINE_VERSION + 1)
+    assert preprocess_version() != before
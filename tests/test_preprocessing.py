@@ -0,0 +1,73 @@
+"""
+Tests paritas preprocessing NumPy/OpenCV terhadap pipeline lama (TF + skimage)
+"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+# modul ini meng-import cv2: harus setelah importorskip
+from services.preprocessing import IMAGE_SIZE, preprocess_image  # noqa: E402
+
+UPLOADS_DIR = Path(__file__).parent.parent / "uploads"
+SAMPLE_IMAGES = sorted(UPLOADS_DIR.glob("*.png"))
+
+
+def reference_preprocess(image: np.ndarray) -> np.ndarray:
+    """Pipeline preprocessing lama, disalin apa adanya sebagai acuan."""
+    tf = pytest.importorskip("tensorflow")
+    from skimage.color import rgb2hsv, hsv2rgb
+    from skimage import exposure
+
+    image = cv2.resize(image, (224, 224))
+    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    img = image.astype(np.float32) / 255.0
+
+    img_tf = tf.constant(img)
+    img_tf = tf.image.adjust_brightness(img_tf, 0.1)
+    img_tf = tf.image.adjust_contrast(img_tf, 1.3)
+    img = img_tf.numpy()
+    img = np.clip(img, 0, 1)
+
+    img_hsv = rgb2hsv(img)
+    img_hsv[:, :, 2] = exposure.equalize_adapthist(img_hsv[:, :, 2])
+    img = hsv2rgb(img_hsv)
+
+    img_hsv_final = rgb2hsv(img)
+    img_hsv_final[:, :, 1] = np.clip(img_hsv_final[:, :, 1] * 1.2, 0, 1)
+    img = hsv2rgb(img_hsv_final)
+
+    return np.clip(img, 0, 1).astype(np.float32)
+
+
+def test_preprocess_output_contract():
+    image = np.random.default_rng(0).integers(0, 256, (300, 400, 3), dtype=np.uint8)
+    result = preprocess_image(image)
+
+    assert result.shape == (IMAGE_SIZE, IMAGE_SIZE, 3)
+    assert result.dtype == np.float32
+    assert result.min() >= 0.0
+    assert result.max() <= 1.0
+
+
+def test_preprocess_uniform_image():
+    """Gambar satu warna tidak boleh menghasilkan NaN (pembagian nol)"""
+    image = np.full((100, 100, 3), 128, dtype=np.uint8)
+    result = preprocess_image(image)
+    assert np.isfinite(result).all()
+
+
+@pytest.mark.parametrize("image_path", SAMPLE_IMAGES, ids=lambda p: p.name[:8])
+def test_preprocess_parity_with_reference(image_path):
+    image = cv2.imread(str(image_path))
+    assert image is not None
+
+    expected = reference_preprocess(image)
+    actual = preprocess_image(image)
+
+    diff = np.abs(expected - actual)
+    # Perbedaan tersisa berasal dari implementasi CLAHE (cv2 vs skimage)
+    assert diff.mean() < 0.015
+    assert np.percentile(diff, 99) < 0.08
@@ -0,0 +1,123 @@
+"""
+Tests untuk job re-scoring massal (services/rescoring.py)
+"""
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.marketplace_product import MarketplaceProduct
+from app.models.verification_result import VerificationResult
+from config.database import Base
+from services.rescoring import Checkpoint, RescoringJob
+
+
+class BrightnessClassifier:
+    """Gambar terang = Utuh, gelap = Tidak Utuh (tanpa model)."""
+
+    model_version = "brightness-v2"
+
+    def predict_tensor(self, batch: np.ndarray) -> np.ndarray:
+        utuh = (batch.mean(axis=(1, 2, 3)) > 0.5).astype(np.float32)
+        return np.stack([utuh, 1 - utuh], axis=1)
+
+    def format_result(self, probabilities: np.ndarray) -> dict:
+        label = "Utuh" if probabilities[0] > 0.5 else "Tidak Utuh"
+        return {"prediction": label, "confidence": float(probabilities.max()), "model_version": self.model_version}
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def uploads(tmp_path, session_factory):
+    directory = tmp_path / "uploads"
+    directory.mkdir()
+    with session_factory() as db:
+        for i in range(5):
+            bright = i % 2 == 0
+            name = f"produk_{i}.png"
+            Image.new("RGB", (64, 64), color=(250, 250, 250) if bright else (5, 5, 5)).save(directory / name)
+            verification = VerificationResult(resident_id=1, image=name, result="{}", model_version="v1")
+            db.add(verification)
+            db.flush()
+            db.add(MarketplaceProduct(
+                resident_id=1, verification_id=verification.id, name=f"Sayur {i}", image=name, status="active"
+            ))
+        db.add(MarketplaceProduct(resident_id=1, name="Tanpa gambar", image="hilang.jpg", status="active"))
+        db.add(MarketplaceProduct(resident_id=1, name="Rusak", image="rusak.jpg", status="sold_out"))
+        db.commit()
+    (directory / "rusak.jpg").write_bytes(b"bukan gambar")
+    return directory
+
+
+def test_rescore_products_updates_verifications_and_status(session_factory, uploads, tmp_path):
+    job = RescoringJob(
+        BrightnessClassifier(), session_factory, uploads, chunk_size=3, workers=0,
+        checkpoint=Checkpoint(tmp_path / "checkpoint.json", "brightness-v2"),
+    )
+    stats = job.run("products", progress=lambda line: None)
+
+    assert (stats["scored"], stats["failed"], stats["missing"], stats["flagged"]) == (5, 1, 1, 2)
+    with session_factory() as db:
+        statuses = {p.name: p.status for p in db.query(MarketplaceProduct)}
+        verifications = db.query(VerificationResult).order_by(VerificationResult.id).all()
+    assert statuses["Sayur 0"] == "active" and statuses["Sayur 1"] == "inactive"
+    assert statuses["Tanpa gambar"] == "active" and statuses["Rusak"] == "sold_out"
+    assert [v.model_version for v in verifications] == ["brightness-v2"] * 5
+    assert json.loads(verifications[1].result)["prediction"] == "Tidak Utuh"
+    assert verifications[1].is_valid_for_marketplace is False
+
+    # checkpoint: target selesai, job kedua tidak mengulang apa pun
+    saved = json.loads((tmp_path / "checkpoint.json").read_text())
+    assert saved["targets"]["products"]["done"] is True
+    again = RescoringJob(
+        BrightnessClassifier(), session_factory, uploads, workers=0,
+        checkpoint=Checkpoint(tmp_path / "checkpoint.json", "brightness-v2"),
+    )
+    assert again.run("products", progress=lambda line: None)["scored"] == 5
+
+
+def test_rescore_resumes_after_interruption(session_factory, uploads, tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.json"
+
+    def interrupt(line):
+        raise KeyboardInterrupt
+
+    job = RescoringJob(
+        BrightnessClassifier(), session_factory, uploads, chunk_size=2, workers=0,
+        checkpoint=Checkpoint(checkpoint_path, "brightness-v2"),
+    )
+    with pytest.raises(KeyboardInterrupt):
+        job.run("verifications", progress=interrupt)
+    assert json.loads(checkpoint_path.read_text())["targets"]["verifications"]["last_id"] == 2
+
+    resumed = RescoringJob(
+        BrightnessClassifier(), session_factory, uploads, chunk_size=2, workers=0,
+        checkpoint=Checkpoint(checkpoint_path, "brightness-v2"),
+    )
+    stats = resumed.run("verifications", progress=lambda line: None)
+    assert stats["scored"] == 5 and stats["done"] is True
+
+    # versi model lain: checkpoint diabaikan
+    assert Checkpoint(checkpoint_path, "brightness-v3").target("verifications")["last_id"] == 0
+
+
+def test_rescore_with_process_pool_and_dry_run(session_factory, uploads):
+    job = RescoringJob(BrightnessClassifier(), session_factory, uploads, chunk_size=4, workers=1, dry_run=True)
+    stats = job.run("products", progress=lambda line: None)
+
+    assert (stats["scored"], stats["failed"], stats["flagged"]) == (5, 1, 2)
+    with session_factory() as db:
+        assert {p.status for p in db.query(MarketplaceProduct)} == {"active", "sold_out"}
+        assert {v.model_version for v in db.query(VerificationResult)} == {"v1"}
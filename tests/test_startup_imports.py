@@ -0,0 +1,47 @@
+"""
+Tests bahwa startup API tidak memuat stack ML (TensorFlow, cv2, numpy)
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIRECTORY = Path(__file__).parent.parent
+ML_MODULES = ("tensorflow", "keras", "cv2", "numpy", "skimage")
+
+
+def run_after_import_main(expression: str, **env_overrides) -> list[str]:
+    """Import main di proses baru lalu kembalikan hasil ``expression`` (list str)."""
+    code = f"import main, sys; print('RESULT:' + ','.join({expression}))"
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT_DIRECTORY,
+        env=dict(os.environ, CI="true", **env_overrides),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    marker = next(
+        line for line in completed.stdout.splitlines() if line.startswith("RESULT:")
+    )
+    return [item for item in marker[len("RESULT:"):].split(",") if item]
+
+
+@pytest.mark.parametrize("inference_enabled", ["true", "false"])
+def test_import_main_does_not_load_ml_stack(inference_enabled):
+    loaded = run_after_import_main(
+        f"m for m in {ML_MODULES!r} if m in sys.modules",
+        INFERENCE_ENABLED=inference_enabled,
+    )
+    assert loaded == []
+
+
+def test_crud_only_worker_has_no_prediction_routes():
+    routes = run_after_import_main(
+        "r.path for r in main.app.routes", INFERENCE_ENABLED="false"
+    )
+
+    assert "/predict/" not in routes
+    assert "/auth/me" in routes
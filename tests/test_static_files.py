@@ -0,0 +1,86 @@
+"""
+Tests untuk penyajian file statis dengan cache HTTP (services/static_files.py)
+"""
+import gzip
+import hashlib
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services.static_files import CachedStaticFiles, IMMUTABLE_CACHE_CONTROL
+from services.upload_store import UploadStore
+
+
+def make_client(directory, **kwargs) -> TestClient:
+    app = FastAPI()
+    app.mount("/static", CachedStaticFiles(directory=directory, **kwargs), name="static")
+    return TestClient(app)
+
+
+def test_content_addressed_file_is_immutable(tmp_path):
+    data = os.urandom(4096)
+    name, _ = UploadStore(tmp_path).save_bytes(data, ".jpg")
+    (tmp_path / "lama.jpg").write_bytes(data)
+    client = make_client(tmp_path, immutable_prefixes=("cas/",))
+
+    response = client.get(f"/static/{name}")
+    assert response.content == data
+    assert response.headers["etag"] == f'"{hashlib.sha256(data).hexdigest()}"'
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    legacy = client.get("/static/lama.jpg")
+    assert legacy.headers["cache-control"] == "no-cache"
+    # ETag kuat dari isi, sama untuk isi yang sama
+    assert legacy.headers["etag"] == f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+def test_conditional_get_and_range(tmp_path):
+    (tmp_path / "foto.png").write_bytes(b"0123456789")
+    client = make_client(tmp_path)
+    etag = client.get("/static/foto.png").headers["etag"]
+
+    not_modified = client.get("/static/foto.png", headers={"If-None-Match": f'W/{etag}, "lain"'})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    assert client.get("/static/foto.png", headers={"If-None-Match": '"lain"'}).status_code == 200
+
+    partial = client.get("/static/foto.png", headers={"Range": "bytes=2-5"})
+    assert partial.status_code == 206
+    assert partial.content == b"2345"
+
+
+def test_precompressed_variant_is_negotiated(tmp_path):
+    css = b"body { color: green; }\n" * 100
+    (tmp_path / "app.css").write_bytes(css)
+    (tmp_path / "app.css.gz").write_bytes(gzip.compress(css))
+    client = make_client(tmp_path)
+
+    compressed = client.get("/static/app.css", headers={"Accept-Encoding": "br;q=0, gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.headers["content-type"].startswith("text/css")
+    assert compressed.content == css  # didekompresi httpx
+
+    identity = client.get("/static/app.css", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] != compressed.headers["etag"]
+
+    # varian yang lebih tua dari aslinya tidak dipakai
+    old = os.stat(tmp_path / "app.css").st_mtime - 60
+    os.utime(tmp_path / "app.css.gz", (old, old))
+    stale = client.get("/static/app.css", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in stale.headers
+
+
+def test_index_page_revalidates_with_etag():
+    from main import app
+
+    client = TestClient(app)
+    page = client.get("/")
+    assert page.status_code == 200
+    assert page.headers["cache-control"] == "no-cache"
+
+    assert client.get("/", headers={"If-None-Match": page.headers["etag"]}).status_code == 304
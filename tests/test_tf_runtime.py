@@ -0,0 +1,62 @@
+"""
+Tests untuk konfigurasi runtime TensorFlow (thread, oneDNN, allocator, affinity)
+"""
+import os
+
+import pytest
+
+import services.tf_runtime as tf_runtime
+
+
+@pytest.fixture(autouse=True)
+def fresh_runtime(monkeypatch):
+    monkeypatch.setattr(tf_runtime, "_applied", None)
+    for name in ("TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS", "TF_ENABLE_ONEDNN_OPTS"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_parse_cpu_list():
+    assert tf_runtime.parse_cpu_list("0-3,8, 2") == [0, 1, 2, 3, 8]
+    with pytest.raises(ValueError):
+        tf_runtime.parse_cpu_list("3-1")
+    with pytest.raises(ValueError):
+        tf_runtime.parse_cpu_list(" , ")
+
+
+def test_configure_runtime_sets_env_once(monkeypatch):
+    applied = tf_runtime.configure_runtime(intra_op_threads=3, inter_op_threads=2, onednn="false")
+    assert applied["intra_op_threads"] == 3 and applied["inter_op_threads"] == 2
+    assert os.environ["TF_NUM_INTRAOP_THREADS"] == "3"
+    assert os.environ["TF_ENABLE_ONEDNN_OPTS"] == "0"
+
+    # sekali per proses: panggilan berikutnya tidak mengubah apa pun
+    assert tf_runtime.configure_runtime(intra_op_threads=8) is applied
+    assert os.environ["TF_NUM_INTRAOP_THREADS"] == "3"
+
+
+def test_configure_runtime_keeps_explicit_env(monkeypatch):
+    monkeypatch.setenv("TF_NUM_INTRAOP_THREADS", "5")
+    applied = tf_runtime.configure_runtime(intra_op_threads=2, onednn=None)
+    assert applied["intra_op_threads"] == 5
+    assert "TF_ENABLE_ONEDNN_OPTS" not in os.environ
+
+
+def test_missing_preloaded_allocator_falls_back_to_system():
+    assert tf_runtime.configure_runtime(allocator="jemalloc")["allocator"] == "system"
+    with pytest.raises(ValueError):
+        tf_runtime._apply_allocator("hoard", 0)
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="sched_setaffinity hanya di Linux")
+def test_affinity_caps_threads_to_pinned_cores(monkeypatch, tmp_path):
+    original = os.sched_getaffinity(0)
+    monkeypatch.setattr(tf_runtime.tempfile, "gettempdir", lambda: str(tmp_path))
+    monkeypatch.setattr(tf_runtime, "_affinity_lock", None)
+    try:
+        applied = tf_runtime.configure_runtime(intra_op_threads=64, cpu_affinity="auto")
+        assert applied["cpu_affinity"] == sorted(original)
+        assert applied["intra_op_threads"] == len(original)
+    finally:
+        os.sched_setaffinity(0, original)
+        if tf_runtime._affinity_lock is not None:
+            tf_runtime._affinity_lock.close()
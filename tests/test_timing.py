@@ -0,0 +1,82 @@
+"""
+Tests untuk timing per tahap, Server-Timing, /metrics, dan profiler sampling
+"""
+from io import BytesIO
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from services.profiler import SamplingProfiler
+
+
+def png_bytes() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (320, 240), color=(60, 140, 40)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def client(tiny_model_path, monkeypatch):
+    import app.controllers.prediction as prediction_controller
+    import services.vegetable_classifier as vegetable_classifier
+    from main import app
+
+    monkeypatch.setattr(
+        vegetable_classifier, "_classifier", vegetable_classifier.VegetableClassifier(model_path=tiny_model_path)
+    )
+    monkeypatch.setattr(prediction_controller, "PREDICTION_CACHE_ENABLED", False)
+    return TestClient(app)
+
+
+def test_predict_reports_server_timing_and_histograms(client):
+    response = client.post("/predict/", files={"file": ("sayur.png", png_bytes(), "image/png")})
+    assert response.status_code == 200
+
+    stages = {
+        entry.split(";")[0].strip(): float(entry.split("dur=")[1])
+        for entry in response.headers["server-timing"].split(",")
+    }
+    assert {"upload_read", "queue_wait", "decode", "preprocess", "inference", "total"} <= set(stages)
+    assert stages["total"] >= stages["inference"] > 0
+
+    # endpoint tanpa inferensi tidak mendapat header
+    assert "server-timing" not in client.get("/health/live").headers
+
+    metrics = client.get("/metrics")
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert "# TYPE inference_stage_seconds histogram" in metrics.text
+    assert 'inference_stage_seconds_count{stage="decode"}' in metrics.text
+    assert 'inference_stage_seconds_bucket{stage="inference",le="+Inf"}' in metrics.text
+
+
+def test_profile_endpoints_require_admin(client):
+    assert client.put("/predict/profile", params={"rate": 0.5}).status_code in (401, 403)
+
+
+def profiled_work():
+    return sum(i * i for i in range(10_000))
+
+
+def test_sampling_profiler_collects_only_when_enabled():
+    profiler = SamplingProfiler(rate=0.0)
+    with profiler.maybe_profile() as active:
+        profiled_work()
+    assert active is False
+    assert profiler.samples == 0
+
+    profiler.set_rate(1.0)
+    for _ in range(2):
+        with profiler.maybe_profile() as active:
+            profiled_work()
+        assert active is True
+
+    report = profiler.report(limit=10, sort="tottime")
+    assert report.startswith("2 request di-profile")
+    assert "profiled_work" in report or "genexpr" in report
+
+    profiler.reset()
+    assert profiler.samples == 0
+
+    with pytest.raises(ValueError):
+        profiler.set_rate(1.5)
@@ -0,0 +1,112 @@
+"""
+Tests untuk pembacaan upload streaming: batas ukuran, magic bytes, memori
+"""
+import asyncio
+import tempfile
+import tracemalloc
+from io import BytesIO
+
+import pytest
+from fastapi import FastAPI, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.controllers.prediction import PredictionController
+from services.upload_limit import UploadLimitMiddleware
+
+MB = 1024 * 1024
+
+
+def png_bytes() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (64, 64), color=(0, 200, 0)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def make_upload(header: bytes, total_size: int, known_size: bool = True) -> UploadFile:
+    """UploadFile seperti buatan Starlette: di-spool ke disk jika > 1MB"""
+    spooled = tempfile.SpooledTemporaryFile(max_size=MB)
+    spooled.write(header)
+    filler = b"\0" * MB
+    remaining = total_size - len(header)
+    while remaining > 0:
+        remaining -= spooled.write(filler[: min(MB, remaining)])
+    spooled.seek(0)
+    return UploadFile(spooled, size=total_size if known_size else None, filename="sayur.png")
+
+
+def read_with_peak(upload: UploadFile, **kwargs):
+    """Jalankan read_upload; kembalikan (hasil atau exception, peak memori)"""
+    tracemalloc.start()
+    try:
+        result = asyncio.run(PredictionController.read_upload(upload, **kwargs))
+    except HTTPException as e:
+        result = e
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, peak
+
+
+def test_valid_image_is_returned_as_single_buffer():
+    data = png_bytes()
+    upload = UploadFile(BytesIO(data), size=len(data), filename="sayur.png")
+
+    contents = asyncio.run(PredictionController.read_upload(upload))
+    assert isinstance(contents, bytearray)
+    assert contents == data
+
+
+def test_oversized_upload_with_known_size_is_not_read():
+    upload = make_upload(b"\x89PNG\r\n\x1a\n", 50 * MB)
+
+    result, peak = read_with_peak(upload, max_size=10 * MB)
+    assert isinstance(result, HTTPException) and result.status_code == 413
+    assert peak < MB
+
+
+def test_oversized_upload_without_size_aborts_early():
+    upload = make_upload(b"\x89PNG\r\n\x1a\n", 50 * MB, known_size=False)
+
+    result, peak = read_with_peak(upload, max_size=10 * MB)
+    assert isinstance(result, HTTPException) and result.status_code == 413
+    # hanya sampai batas 10MB yang pernah dibaca, bukan 50MB
+    assert peak < 25 * MB
+    assert upload.file.tell() <= 11 * MB
+
+
+def test_malformed_upload_rejected_after_first_chunk():
+    upload = make_upload(b"<html>bukan gambar</html>", 8 * MB)
+
+    result, peak = read_with_peak(upload, max_size=10 * MB)
+    assert isinstance(result, HTTPException) and result.status_code == 400
+    assert peak < 2 * MB
+
+
+@pytest.mark.parametrize("header,expected", [
+    (b"\xff\xd8\xff\xe0", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"BM6\x00", "image/bmp"),
+    (b"GIF89a", None),
+])
+def test_detect_image_type(header, expected):
+    assert PredictionController.detect_image_type(header + b"\0" * 8) == expected
+
+
+def test_middleware_rejects_by_content_length():
+    calls = []
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(file: UploadFile):
+        calls.append(file.filename)
+        return {"ok": True}
+
+    app.add_middleware(UploadLimitMiddleware, limits={"/upload": 1024})
+    client = TestClient(app)
+
+    response = client.post("/upload", files={"file": ("a.png", b"\0" * (200 * 1024), "image/png")})
+    assert response.status_code == 413
+    assert calls == []
+
+    assert client.post("/upload", files={"file": ("a.png", b"\0" * 512, "image/png")}).status_code == 200
@@ -0,0 +1,123 @@
+"""
+Tests untuk store upload content-addressed (services/upload_store.py)
+"""
+import asyncio
+import hashlib
+import io
+import os
+import threading
+import time
+
+import pytest
+from fastapi import UploadFile
+
+from app.models.marketplace_product import MarketplaceProduct
+from services.upload_store import UploadStore, content_path
+
+
+def save(store: UploadStore, data: bytes, suffix: str = ".jpg", upload_file=None) -> tuple[str, bool]:
+    upload = UploadFile(upload_file or io.BytesIO(data), filename=f"foto{suffix}")
+    return asyncio.run(store.save_upload(upload, suffix))
+
+
+def make_old(path) -> None:
+    old = time.time() - 7 * 24 * 3600
+    os.utime(path, (old, old))
+
+
+def test_identical_uploads_are_stored_once(tmp_path):
+    store = UploadStore(tmp_path)
+    data = os.urandom(3 * 1024 * 1024 + 17)  # lebih dari satu chunk
+
+    first, created = save(store, data)
+    second, created_again = save(store, data)
+
+    digest = hashlib.sha256(data).hexdigest()
+    assert first == second == f"cas/{digest[:2]}/{digest[2:4]}/{digest}.jpg"
+    assert (created, created_again) == (True, False)
+    assert (tmp_path / first).read_bytes() == data
+    assert store.stored_files() == [first]
+    assert list((tmp_path / ".tmp").iterdir()) == []
+
+
+def test_different_content_gets_different_names(tmp_path):
+    store = UploadStore(tmp_path)
+
+    a, _ = save(store, b"gambar a")
+    b, _ = store.save_bytes(b"gambar b", ".png")
+
+    assert a != b
+    assert b == content_path(hashlib.sha256(b"gambar b").hexdigest(), ".png")
+    assert store.stored_files() == sorted([a, b])
+
+
+def test_garbage_collection_keeps_referenced_and_recent_files(tmp_path, db):
+    store = UploadStore(tmp_path)
+    referenced, _ = store.save_bytes(b"dipakai dua produk", ".jpg")
+    orphan, _ = store.save_bytes(b"tidak dipakai", ".jpg")
+    recent, _ = store.save_bytes(b"baru di-upload", ".jpg")
+    for name in (referenced, orphan):
+        make_old(tmp_path / name)
+    (tmp_path / "derivatives" / orphan).mkdir(parents=True)
+    (tmp_path / "derivatives" / orphan / "w320.webp").write_bytes(b"thumb")
+
+    db.add_all([MarketplaceProduct(resident_id=1, name=f"Sayur {i}", image=referenced) for i in range(2)])
+    db.flush()
+    assert UploadStore.reference_counts(db)[referenced] == 2
+
+    assert store.collect_garbage(db, dry_run=True) == [orphan]
+    assert (tmp_path / orphan).exists()
+
+    assert store.collect_garbage(db) == [orphan]
+    assert not (tmp_path / orphan).exists()
+    assert not (tmp_path / "derivatives" / orphan).exists()
+    assert store.stored_files() == sorted([referenced, recent])
+
+
+def test_save_upload_copies_off_the_event_loop(tmp_path):
+    store = UploadStore(tmp_path, fsync="full")
+    threads = []
+
+    class RecordingFile(io.BytesIO):
+        def read(self, size=-1):
+            threads.append(threading.get_ident())
+            return super().read(size)
+
+    name, created = save(store, b"isi gambar", upload_file=RecordingFile(b"isi gambar"))
+
+    assert created and (tmp_path / name).read_bytes() == b"isi gambar"
+    assert threads and threading.get_ident() not in threads
+
+
+def test_unknown_fsync_policy_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        UploadStore(tmp_path, fsync="kadang")
+
+
+def test_unknown_fsync_env_fails_at_startup():
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    completed = subprocess.run(
+        [sys.executable, "-c", "import config.uploads"],
+        cwd=Path(__file__).parent.parent,
+        env=dict(os.environ, UPLOAD_FSYNC="kadang"),
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode != 0
+    assert "UPLOAD_FSYNC" in completed.stderr
+
+
+def test_reuploading_an_old_orphan_protects_it_from_gc(tmp_path, db):
+    store = UploadStore(tmp_path)
+    name, _ = store.save_bytes(b"foto lama tanpa produk", ".jpg")
+    make_old(tmp_path / name)
+
+    # upload ulang byte yang sama sebelum create_product
+    again, created = store.save_bytes(b"foto lama tanpa produk", ".jpg")
+
+    assert (again, created) == (name, False)
+    assert store.collect_garbage(db) == []
+    assert (tmp_path / name).exists()
@@ -0,0 +1,145 @@
+"""
+Tests untuk write-behind hasil verifikasi (services/verification_writer.py)
+"""
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.verification_result import VerificationResult
+from config.database import Base
+from services.verification_writer import VerificationWriter
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def make_row(resident_id: int = 1) -> dict:
+    return {"resident_id": resident_id, "image": "sayur.jpg", "result": "Utuh", "is_valid_for_marketplace": True}
+
+
+def saved_keys(session_factory) -> set[str]:
+    with session_factory() as db:
+        return {row.request_key for row in db.query(VerificationResult).all()}
+
+
+def test_rows_are_batched_after_interval(session_factory):
+    writer = VerificationWriter(session_factory, flush_interval_ms=100, max_batch=100)
+    try:
+        for i in range(3):
+            writer.submit(f"key-{i}", make_row())
+        assert writer.is_pending("key-0")
+
+        deadline = time.monotonic() + 2
+        while writer.is_pending("key-2") and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        writer.stop(timeout=2)
+
+    assert saved_keys(session_factory) == {"key-0", "key-1", "key-2"}
+
+
+def test_stop_drains_queue(session_factory):
+    writer = VerificationWriter(session_factory, flush_interval_ms=60_000, max_batch=1000)
+    for i in range(5):
+        writer.submit(f"key-{i}", make_row())
+
+    writer.stop(timeout=2)
+
+    assert len(saved_keys(session_factory)) == 5
+    assert not writer.is_pending("key-4")
+
+
+def test_flush_makes_row_visible_for_lookup(session_factory):
+    from app.controllers.marketplace import MarketplaceController
+
+    writer = VerificationWriter(session_factory, flush_interval_ms=60_000, max_batch=1000)
+    try:
+        writer.submit("abc", make_row(resident_id=7))
+        assert writer.flush() == 1
+        with session_factory() as db:
+            verification = MarketplaceController.get_verification_by_key(db, "abc")
+            assert verification is not None
+            assert verification.resident_id == 7
+    finally:
+        writer.stop(timeout=2)
+
+
+def test_bad_row_does_not_drop_batch(session_factory):
+    writer = VerificationWriter(session_factory, flush_interval_ms=60_000, max_batch=1000)
+    writer.submit("ok", make_row())
+    writer.submit("bad", {"resident_id": None})  # resident_id NOT NULL
+    writer.stop(timeout=2)
+
+    assert saved_keys(session_factory) == {"ok"}
+
+
+def test_lookup_waits_for_row_from_another_worker(tmp_path, monkeypatch):
+    import asyncio
+    import threading
+
+    from routes import marketplace
+
+    # file database: worker lain memakai koneksi sendiri
+    engine = create_engine(f"sqlite:///{tmp_path / 'verify.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(marketplace, "VERIFICATION_LOOKUP_WAIT_MS", 2000)
+    def other_worker_flush():
+        with session_factory() as db:
+            db.add(VerificationResult(request_key="abc", **make_row(resident_id=7)))
+            db.commit()
+
+    # worker lain menyimpan baris setelah request ini mulai mencari
+    timer = threading.Timer(0.2, other_worker_flush)
+    timer.start()
+    try:
+        with session_factory() as db:
+            verification = asyncio.run(marketplace.find_verification(db, "abc"))
+            assert verification is not None
+            assert verification.resident_id == 7
+
+            monkeypatch.setattr(marketplace, "VERIFICATION_LOOKUP_WAIT_MS", 100)
+            assert asyncio.run(marketplace.find_verification(db, "missing")) is None
+    finally:
+        timer.join()
+
+
+def test_raw_verification_id_is_not_linked_to_product(tmp_path):
+    from types import SimpleNamespace
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.controllers.dependencies import get_current_user, get_db
+    from routes import marketplace
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'produk.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    # hasil verifikasi milik warga lain
+    other = VerificationResult(request_key="lain", **make_row(resident_id=8))
+    db.add(other)
+    db.commit()
+
+    app = FastAPI()
+    app.include_router(marketplace.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(resident_id=7, role="warga")
+
+    response = TestClient(app).post(
+        "/marketplace/products",
+        json={"name": "Bayam", "description": "", "price": 5000, "verification_id": other.id},
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["verificationResultId"] is None
+    db.close()
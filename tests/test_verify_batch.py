@@ -0,0 +1,141 @@
+"""
+Tests untuk verifikasi batch /marketplace/verify-vegetable/batch (NDJSON)
+"""
+import json
+import zipfile
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from PIL import Image
+
+import routes.marketplace as marketplace_router
+from app.controllers.dependencies import get_current_user
+from app.controllers.prediction import PredictionController
+
+
+def png_bytes(color=(0, 200, 0)) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (64, 64), color=color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def zip_bytes(members: dict[str, bytes]) -> bytes:
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def client(monkeypatch, tiny_model_path):
+    import app.controllers.prediction as prediction_controller
+    import services.vegetable_classifier as vegetable_classifier
+
+    classifier = vegetable_classifier.VegetableClassifier(model_path=tiny_model_path, max_batch_size=2)
+    monkeypatch.setattr(vegetable_classifier, "get_classifier", lambda: classifier)
+    monkeypatch.setattr(prediction_controller, "PREDICTION_CACHE_ENABLED", False)
+
+    app = FastAPI()
+    app.include_router(marketplace_router.router)
+    # resident_id None: hasil tidak disimpan ke verification_results
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(resident_id=None, role="warga")
+    return TestClient(app)
+
+
+def test_batch_streams_one_line_per_image(client):
+    files = [
+        ("files", ("a.png", png_bytes(), "image/png")),
+        ("files", ("rusak.png", b"bukan gambar", "image/png")),
+        ("files", ("panen.zip", zip_bytes({"b.png": png_bytes(), "catatan.txt": b"x", "c.png": png_bytes()}), "application/zip")),
+    ]
+    response = client.post("/marketplace/verify-vegetable/batch", files=files)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [line["index"] for line in lines] == [0, 1, 2, 3]
+    assert [line["filename"] for line in lines] == ["a.png", "rusak.png", "b.png", "c.png"]
+    assert [line["status"] for line in lines] == ["success", "error", "success", "success"]
+    assert 0 <= lines[0]["confidence"] <= 1
+
+
+def test_batch_rejects_too_many_files(client, monkeypatch):
+    monkeypatch.setattr(marketplace_router, "VERIFY_BATCH_MAX_FILES", 1)
+    files = [("files", (f"{i}.png", png_bytes(), "image/png")) for i in range(2)]
+
+    response = client.post("/marketplace/verify-vegetable/batch", files=files)
+    assert response.status_code == 413
+
+
+def test_batch_rejects_total_size_over_limit(client, monkeypatch):
+    image = png_bytes()
+    monkeypatch.setattr(marketplace_router, "VERIFY_BATCH_MAX_BYTES", len(image) * 2 - 1)
+    files = [("files", (f"{i}.png", image, "image/png")) for i in range(2)]
+
+    response = client.post("/marketplace/verify-vegetable/batch", files=files)
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("Total ukuran gambar terlalu besar")
+
+
+def test_zip_contents_count_towards_limits():
+    archive = zip_bytes({f"{i}.png": png_bytes() for i in range(3)})
+
+    with pytest.raises(HTTPException) as exc:
+        PredictionController.expand_uploads([("panen.zip", archive)], max_files=2)
+    assert exc.value.status_code == 413
+
+    with pytest.raises(HTTPException) as exc:
+        PredictionController.expand_uploads([("panen.zip", archive)], max_bytes=len(png_bytes()) * 2)
+    assert exc.value.status_code == 413
+
+
+def test_corrupt_zip_member_is_reported_per_image(client):
+    image = png_bytes()
+    archive = bytearray(zip_bytes({"rusak.png": image, "baik.png": image}))
+    # ubah satu byte data member pertama (disimpan tanpa kompresi): CRC tidak cocok
+    offset = archive.index(image) + len(image) // 2
+    archive[offset] ^= 0xFF
+
+    images = PredictionController.expand_uploads([("panen.zip", bytes(archive))])
+    assert [name for name, _ in images] == ["rusak.png", "baik.png"]
+    assert isinstance(images[0][1], str) and images[1][1] == image
+
+    response = client.post(
+        "/marketplace/verify-vegetable/batch",
+        files=[("files", ("panen.zip", bytes(archive), "application/zip"))],
+    )
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["status"] for line in lines] == ["error", "success"]
+    assert "rusak" in lines[0]["message"]
+
+
+def test_batch_returns_503_when_model_cannot_load(client, monkeypatch):
+    import services.vegetable_classifier as vegetable_classifier
+
+    def broken():
+        raise OSError("model tidak ditemukan")
+
+    monkeypatch.setattr(vegetable_classifier, "get_classifier", broken)
+    response = client.post(
+        "/marketplace/verify-vegetable/batch", files=[("files", ("a.png", png_bytes(), "image/png"))]
+    )
+    assert response.status_code == 503
+
+
+def test_failure_mid_stream_ends_with_error_line(client, monkeypatch):
+    def broken(images):
+        raise RuntimeError("inferensi gagal")
+
+    monkeypatch.setattr(PredictionController, "predict_batch", staticmethod(broken))
+    response = client.post(
+        "/marketplace/verify-vegetable/batch", files=[("files", ("a.png", png_bytes(), "image/png"))]
+    )
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert "inferensi gagal" in lines[-1]["error"]